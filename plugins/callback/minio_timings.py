@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: Josh Williams <jdubz@dubzland.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = """
+---
+name: minio_timings
+type: aggregate
+short_description: Reports where the Minio modules of a play spent their time
+description:
+  - Collects the C(timings) returned by the modules of this collection when
+    O(dubzland.minio.minio_bucket#module:auth.timings) is enabled, and prints a report
+    once the play completes.
+  - For each host and module, the time Ansible spent on the tasks is split into the
+    time spent inside the module, and the part of it spent waiting on requests to the
+    Minio instance. Time outside the module is transport and Ansible overhead, time
+    inside the module but not waiting on requests is module overhead.
+  - The API calls with the highest total request time are then listed per host and
+    module, along with their request, error and retry counts, bytes received and
+    latency percentiles.
+author:
+  - Josh Williams (@t3hpr1m3)
+requirements:
+  - enable in configuration
+options:
+  top:
+    description: Number of API calls listed in the hot spot report.
+    type: int
+    default: 20
+    env:
+      - name: ANSIBLE_MINIO_TIMINGS_TOP
+    ini:
+      - section: callback_minio_timings
+        key: top
+  output_file:
+    description: Also write the aggregated report to this file, as JSON.
+    type: path
+    env:
+      - name: ANSIBLE_MINIO_TIMINGS_OUTPUT_FILE
+    ini:
+      - section: callback_minio_timings
+        key: output_file
+notes:
+  - Requests issued in parallel overlap, so the request time of a module may exceed
+    the time spent inside it.
+  - Percentiles are computed from the individual requests returned by each module,
+    which are limited to the first 1000 of each task.
+"""
+
+EXAMPLES = """
+# ansible.cfg
+# [defaults]
+# callbacks_enabled = dubzland.minio.minio_timings
+#
+# playbook.yml
+- name: Profile the Minio tasks of a play
+  hosts: minio
+  vars:
+    minio_auth:
+      url: http://minio-server:9000
+      access_key: myuser
+      secret_key: supersekret
+      timings: true
+  tasks:
+    - name: Create the application buckets
+      dubzland.minio.minio_bucket:
+        buckets: "{{ app_buckets }}"
+        auth: "{{ minio_auth }}"
+      delegate_to: localhost
+"""
+
+import json
+import time
+
+from ansible.module_utils.common.text.converters import to_text
+from ansible.plugins.callback import CallbackBase
+
+from ansible_collections.dubzland.minio.plugins.module_utils.stats import (
+    latency_summary,
+)
+
+
+class CallbackModule(CallbackBase):
+    CALLBACK_VERSION = 2.0
+    CALLBACK_TYPE = "aggregate"
+    CALLBACK_NAME = "dubzland.minio.minio_timings"
+    CALLBACK_NEEDS_ENABLED = True
+
+    def __init__(self, *args, **kwargs):
+        super(CallbackModule, self).__init__(*args, **kwargs)
+        self._started = {}
+        self._modules = {}
+        self._apis = {}
+
+    def v2_runner_on_start(self, host, task):
+        self._started[(host.get_name(), task._uuid)] = time.monotonic()
+
+    def v2_runner_on_ok(self, result):
+        self._record(result)
+
+    def v2_runner_on_failed(self, result, ignore_errors=False):
+        self._record(result)
+
+    def v2_runner_on_skipped(self, result):
+        self._start_time(result)
+
+    def v2_runner_on_unreachable(self, result):
+        self._start_time(result)
+
+    def _start_time(self, result):
+        """Forget and return when the task of result started on its host."""
+        return self._started.pop((result._host.get_name(), result._task._uuid), None)
+
+    def _record(self, result):
+        host = result._host.get_name()
+        started = self._start_time(result)
+
+        # Loops return the result of each item under results
+        timings = [
+            item["timings"]
+            for item in [result._result] + list(result._result.get("results") or [])
+            if isinstance(item, dict) and isinstance(item.get("timings"), dict)
+        ]
+        if not timings:
+            return
+
+        module = result._task.action.split(".")[-1]
+        totals = self._modules.setdefault(
+            (host, module), dict(tasks=0, wall_ms=0.0, module_ms=0.0, request_ms=0.0)
+        )
+        totals["tasks"] += 1
+        if started is not None:
+            totals["wall_ms"] += (time.monotonic() - started) * 1000
+
+        for entry in timings:
+            totals["module_ms"] += entry.get("elapsed_ms", 0)
+            totals["request_ms"] += entry.get("request_ms", 0)
+
+            for name, api in (entry.get("apis") or {}).items():
+                totals_api = self._apis.setdefault(
+                    (host, module, name),
+                    dict(
+                        calls=0,
+                        requests=0,
+                        errors=0,
+                        retries=0,
+                        bytes=0,
+                        total_ms=0.0,
+                        latencies=[],
+                    ),
+                )
+                for key in ("calls", "requests", "errors", "retries", "bytes"):
+                    totals_api[key] += api.get(key, 0)
+                totals_api["total_ms"] += api.get("total_ms", 0)
+
+            for request in entry.get("requests") or []:
+                key = (host, module, request.get("api"))
+                if key in self._apis:
+                    self._apis[key]["latencies"].append(request["latency_ms"] / 1000.0)
+
+    def report(self):
+        modules = [
+            dict(
+                host=host,
+                module=module,
+                tasks=totals["tasks"],
+                wall_ms=round(totals["wall_ms"], 3),
+                module_ms=round(totals["module_ms"], 3),
+                request_ms=round(totals["request_ms"], 3),
+            )
+            for (host, module), totals in sorted(self._modules.items())
+        ]
+
+        apis = [
+            dict(
+                host=host,
+                module=module,
+                api=name,
+                calls=api["calls"],
+                requests=api["requests"],
+                errors=api["errors"],
+                retries=api["retries"],
+                bytes=api["bytes"],
+                total_ms=round(api["total_ms"], 3),
+                latency_ms=latency_summary(api["latencies"]),
+            )
+            for (host, module, name), api in self._apis.items()
+        ]
+        apis.sort(key=lambda api: api["total_ms"], reverse=True)
+
+        return dict(modules=modules, apis=apis)
+
+    def v2_playbook_on_stats(self, stats):
+        if not self._modules:
+            return
+
+        report = self.report()
+
+        self._display.banner("MINIO TIMINGS")
+        self._display.display(
+            "%-24s %-18s %6s %12s %12s %12s"
+            % ("host", "module", "tasks", "wall ms", "module ms", "request ms")
+        )
+        for entry in report["modules"]:
+            self._display.display(
+                "%-24s %-18s %6d %12.1f %12.1f %12.1f"
+                % (
+                    entry["host"],
+                    entry["module"],
+                    entry["tasks"],
+                    entry["wall_ms"],
+                    entry["module_ms"],
+                    entry["request_ms"],
+                )
+            )
+
+        self._display.display("")
+        self._display.display(
+            "%-24s %-18s %-26s %7s %8s %6s %7s %12s %12s %9s %9s"
+            % (
+                "host",
+                "module",
+                "api",
+                "calls",
+                "requests",
+                "errors",
+                "retries",
+                "bytes",
+                "total ms",
+                "p50 ms",
+                "p99 ms",
+            )
+        )
+        for entry in report["apis"][: self.get_option("top")]:
+            latency = entry["latency_ms"]
+            self._display.display(
+                "%-24s %-18s %-26s %7d %8d %6d %7d %12d %12.1f %9s %9s"
+                % (
+                    entry["host"],
+                    entry["module"],
+                    entry["api"],
+                    entry["calls"],
+                    entry["requests"],
+                    entry["errors"],
+                    entry["retries"],
+                    entry["bytes"],
+                    entry["total_ms"],
+                    latency.get("p50", "-"),
+                    latency.get("p99", "-"),
+                )
+            )
+
+        output_file = self.get_option("output_file")
+        if output_file:
+            try:
+                with open(output_file, "w") as f:
+                    json.dump(report, f, indent=2, sort_keys=True)
+            except (IOError, OSError) as e:
+                self._display.warning(
+                    "Unable to write the Minio timings to %s: %s"
+                    % (output_file, to_text(e))
+                )
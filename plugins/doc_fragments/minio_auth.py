@@ -29,4 +29,102 @@ options:
           type: str
           required: true
           description: Minio Server URL.
+      region:
+          type: str
+          required: false
+          description:
+            - Region of the Minio instance.
+            - When set, the client skips the bucket location lookup it would otherwise
+              perform before bucket operations.
+      validate_certs:
+          type: bool
+          required: false
+          default: true
+          description: When set to V(false), SSL certificates will not be validated.
+      ca_cert:
+          type: path
+          required: false
+          description:
+            - CA bundle used to validate the Minio server certificate.
+            - Defaults to E(SSL_CERT_FILE), or the C(certifi) bundle when unset.
+      connect_timeout:
+          type: float
+          required: false
+          default: 10
+          description: Seconds to wait for a connection to the Minio instance to be established.
+      read_timeout:
+          type: float
+          required: false
+          default: 300
+          description: Seconds to wait for the Minio instance to send a response.
+      max_pool_size:
+          type: int
+          required: false
+          default: 10
+          description: Maximum number of connections kept open to the Minio instance.
+      keepalive:
+          type: bool
+          required: false
+          default: true
+          description: Enables TCP keep-alive on connections to the Minio instance.
+      timings:
+          type: bool
+          required: false
+          default: false
+          description:
+            - Records the latency, status, retry count and response size of every request
+              made to the Minio instance, and returns them as C(timings) in the module result.
+            - C(timings.apis) aggregates the requests by client method, C(timings.requests)
+              lists the first 1000 individually, and C(timings.elapsed_ms) is the time since
+              the first client was created, so the module overhead can be told apart from
+              time spent waiting on the server.
+            - Enable the P(dubzland.minio.minio_timings#callback) callback to collect them
+              into a report at the end of the play.
+            - Requests are attributed to the client method running on the thread which
+              makes them. Requests made from threads started by minio-py itself, such as
+              the parallel part uploads of M(dubzland.minio.minio_object), are not
+              recorded individually, although the duration of the upload call is.
+      retries:
+          type: int
+          required: false
+          default: 5
+          description:
+            - Maximum number of times a failed request is retried.
+            - Throttled responses (C(429), and C(503) such as C(SlowDown) or
+              C(XMinioServerNotInitialized)) and connections which could not be
+              established are retried for every request. Other server errors and broken
+              connections are only retried for idempotent methods.
+      retry_backoff:
+          type: float
+          required: false
+          default: 0.2
+          description:
+            - Base delay in seconds between retries.
+            - The delay before retry N is drawn at random between 0 and
+              O(auth.retry_backoff) * 2^N seconds, unless the server sends a
+              C(Retry-After) header.
+      retry_max_backoff:
+          type: float
+          required: false
+          default: 20
+          description: Longest delay in seconds between retries, including delays requested with C(Retry-After).
+      circuit_breaker_threshold:
+          type: int
+          required: false
+          default: 10
+          description:
+            - Number of consecutive failed requests to an endpoint after which no further
+              requests are sent to it for O(auth.circuit_breaker_cooldown) seconds. Requests
+              made in the meantime fail immediately.
+            - The count is shared by every task and thread in the same process, such as the
+              workers of bulk operations.
+            - Set to V(0) to disable the circuit breaker.
+      circuit_breaker_cooldown:
+          type: float
+          required: false
+          default: 10
+          description:
+            - Seconds the circuit breaker stays open before a single request is let through
+              to probe the endpoint.
+            - The breaker closes when the probe succeeds, and opens again when it fails.
 """
@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: Josh Williams <jdubz@dubzland.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+class ModuleDocFragment(object):
+    DOCUMENTATION = """
+options: {}
+notes:
+  - When the C(minio_controller_execution) variable is V(true) and the task uses a
+    local connection (for example when it is delegated to C(localhost)), the module
+    runs inside the controller process, with the Python of the controller instead
+    of C(ansible_python_interpreter). Ansible runs every task in a separate worker
+    process, so connections are only reused between the items of a loop. When the
+    controller cannot import C(minio), the module is executed as a regular module.
+"""
@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: Josh Williams <jdubz@dubzland.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import itertools
+import re
+
+from ansible.errors import AnsibleFilterError
+from ansible.module_utils.six import string_types
+
+# Number of drives Minio accepts in a single erasure set
+ERASURE_SET_SIZES = range(2, 17)
+
+_ELLIPSES = re.compile(r"\{(\d+)\.\.\.(\d+)\}")
+_NUMBERS = re.compile(r"(\d+)")
+
+
+def _range(start, end):
+    if int(start) > int(end):
+        raise AnsibleFilterError(
+            "Invalid range {%s...%s}: the start is greater than the end" % (start, end)
+        )
+
+    # Zero padded ranges ({01...16}) keep the width of their end
+    width = len(end) if len(start) > 1 and start.startswith("0") else 0
+    return ["%0*d" % (width, n) for n in range(int(start), int(end) + 1)]
+
+
+def minio_expand(pattern):
+    """Expand the ellipses of pattern into the endpoints they stand for, as the
+    Minio server does."""
+    if not isinstance(pattern, string_types):
+        raise AnsibleFilterError(
+            "minio_expand expects a string, got %s" % type(pattern).__name__
+        )
+
+    parts = _ELLIPSES.split(pattern)
+    literals = parts[0::3]
+    ranges = [_range(start, end) for start, end in zip(parts[1::3], parts[2::3])]
+    return [
+        "".join(literal + value for literal, value in zip(literals, values + ("",)))
+        for values in itertools.product(*ranges)
+    ]
+
+
+def _compress(values, what):
+    if len(values) == 1:
+        return values[0]
+
+    invalid = AnsibleFilterError(
+        "The %s %s cannot be written in Minio expansion notation, they must only "
+        "differ by a consecutive number" % (what, ", ".join(values))
+    )
+
+    parts = [_NUMBERS.split(value) for value in values]
+    first = parts[0]
+    if any(len(p) != len(first) or p[0::2] != first[0::2] for p in parts):
+        raise invalid
+
+    varying = [
+        index
+        for index in range(1, len(first), 2)
+        if len(set(p[index] for p in parts)) > 1
+    ]
+    if len(varying) != 1:
+        raise invalid
+
+    index = varying[0]
+    numbers = [p[index] for p in parts]
+    if int(numbers[0]) > int(numbers[-1]) or _range(numbers[0], numbers[-1]) != numbers:
+        raise invalid
+
+    return "%s{%s...%s}%s" % (
+        "".join(first[:index]),
+        numbers[0],
+        numbers[-1],
+        "".join(first[index + 1 :]),
+    )
+
+
+def _endpoints(value, what):
+    """Return the expansion notation and the expanded list of a pool's hosts or drives,
+    given either of them."""
+    if not value:
+        return None, []
+
+    if isinstance(value, string_types):
+        return value, minio_expand(value)
+
+    if not isinstance(value, list):
+        raise AnsibleFilterError(
+            "The %s of a pool must be a string or a list, got %s"
+            % (what, type(value).__name__)
+        )
+
+    expanded = []
+    for item in value:
+        expanded.extend(minio_expand(item))
+    return _compress(expanded, what), expanded
+
+
+def _default_parity(set_size):
+    if set_size == 1:
+        return 0
+    if set_size <= 3:
+        return 1
+    if set_size <= 5:
+        return 2
+    if set_size <= 7:
+        return 3
+    return 4
+
+
+def minio_pools(pools, scheme="http", port=9000, parity=None):
+    """Validate the server pools of a Minio deployment, and describe their layout.
+
+    Each pool lists its hosts and the drives of each host, either in Minio expansion
+    notation or as lists. The pools are rejected when their drives cannot be split
+    into erasure sets the way the Minio server would on its first start.
+    """
+    if not isinstance(pools, list) or not pools:
+        raise AnsibleFilterError("minio_pools expects a non-empty list of pools")
+
+    if scheme not in ("http", "https"):
+        raise AnsibleFilterError("Invalid scheme %s, expected http or https" % scheme)
+
+    layout = []
+    endpoints = set()
+    for number, pool in enumerate(pools, 1):
+        if not isinstance(pool, dict) or not pool.get("drives"):
+            raise AnsibleFilterError("Pool %d does not list its drives" % number)
+
+        host_pattern, hosts = _endpoints(pool.get("hosts"), "hosts")
+        drive_pattern, drives = _endpoints(pool["drives"], "drives")
+
+        if layout and bool(hosts) != bool(layout[0]["hosts"]):
+            raise AnsibleFilterError(
+                "Either all pools or none of them must list their hosts"
+            )
+
+        for drive in drives:
+            if not drive.startswith("/"):
+                raise AnsibleFilterError(
+                    "Drive %s of pool %d is not an absolute path" % (drive, number)
+                )
+
+        for endpoint in itertools.product(hosts or [None], drives):
+            if endpoint in endpoints:
+                raise AnsibleFilterError(
+                    "Drive %s%s of pool %d is already used by another pool"
+                    % (endpoint[1], " on %s" % endpoint[0] if hosts else "", number)
+                )
+            endpoints.add(endpoint)
+
+        host_count = len(hosts) or 1
+        drive_count = host_count * len(drives)
+        if drive_count == 1:
+            if len(pools) > 1:
+                raise AnsibleFilterError(
+                    "Pool %d has a single drive, which is only supported in a "
+                    "deployment of a single pool" % number
+                )
+            set_size = 1
+        else:
+            # Erasure sets are spread evenly across the hosts of the pool
+            sizes = [
+                size
+                for size in ERASURE_SET_SIZES
+                if drive_count % size == 0
+                and (size % host_count == 0 or host_count % size == 0)
+            ]
+            if not sizes:
+                raise AnsibleFilterError(
+                    "Pool %d has %d drives (%d hosts with %d drives each), which cannot "
+                    "be split into erasure sets of %d to %d drives spread evenly "
+                    "across its hosts"
+                    % (
+                        number,
+                        drive_count,
+                        host_count,
+                        len(drives),
+                        ERASURE_SET_SIZES[0],
+                        ERASURE_SET_SIZES[-1],
+                    )
+                )
+            set_size = max(sizes)
+
+        if hosts:
+            volumes = "%s://%s:%d%s" % (scheme, host_pattern, int(port), drive_pattern)
+        else:
+            volumes = drive_pattern
+
+        layout.append(
+            dict(
+                hosts=hosts,
+                drives=drives,
+                volumes=volumes,
+                drive_count=drive_count,
+                set_size=set_size,
+                set_count=drive_count // set_size,
+            )
+        )
+
+    # Minio derives the default parity of every pool from the first one
+    if parity is None:
+        parity = _default_parity(layout[0]["set_size"])
+
+    for number, pool in enumerate(layout, 1):
+        set_size = pool["set_size"]
+        if parity < 0 or parity > set_size // 2:
+            raise AnsibleFilterError(
+                "EC:%d parity is invalid for pool %d, whose erasure sets have %d drives "
+                "(at most EC:%d)" % (parity, number, set_size, set_size // 2)
+            )
+
+        write_quorum = set_size - parity
+        if write_quorum == parity:
+            write_quorum += 1
+
+        # Drives a single unavailable host takes out of each erasure set
+        host_drives = max(1, set_size // (len(pool["hosts"]) or 1))
+        pool.update(
+            parity=parity,
+            write_quorum=write_quorum,
+            max_unavailable_hosts=(
+                (set_size - write_quorum) // host_drives if pool["hosts"] else 0
+            ),
+        )
+
+    return layout
+
+
+class FilterModule(object):
+    def filters(self):
+        return {
+            "minio_expand": minio_expand,
+            "minio_pools": minio_pools,
+        }
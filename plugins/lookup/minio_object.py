@@ -0,0 +1,294 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: Josh Williams <jdubz@dubzland.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = """
+---
+name: minio_object
+short_description: Reads the content of objects in a Minio bucket
+description:
+  - Returns the content of each object, decoded as text.
+  - Objects are kept in an on-disk cache on the controller. A cached object is
+    revalidated with a conditional request, which costs a single C(304 Not Modified)
+    response when it has not changed, or is used as is within O(ttl) seconds of
+    being validated.
+  - The least recently used objects are evicted once the cache grows beyond O(cache_size).
+  - Objects are cached separately for each server URL and access key, so an
+    object is never read from the cache with credentials other than the ones
+    which fetched it.
+author:
+  - Josh Williams (@t3hpr1m3)
+requirements:
+  - python >= 3.8
+  - minio >= 7.1.4
+options:
+  _terms:
+    description: Names (keys) of the objects to read.
+    required: true
+    type: list
+    elements: str
+  bucket:
+    description: Name of the bucket containing the objects.
+    required: true
+    type: str
+  auth:
+    description:
+      - Connection details for the Minio instance, accepting the same options as the
+        O(dubzland.minio.minio_bucket#module:auth) option of the modules in this collection.
+    required: true
+    type: dict
+  ttl:
+    description:
+      - Seconds a cached object is used without being revalidated.
+      - With V(0), every lookup revalidates the object.
+    type: int
+    default: 0
+    env:
+      - name: ANSIBLE_MINIO_OBJECT_TTL
+    ini:
+      - section: minio_object_lookup
+        key: ttl
+  cache_dir:
+    description: Directory holding the cached objects.
+    type: path
+    default: ~/.ansible/cache/dubzland.minio/objects
+    env:
+      - name: ANSIBLE_MINIO_OBJECT_CACHE_DIR
+    ini:
+      - section: minio_object_lookup
+        key: cache_dir
+  cache_size:
+    description: Maximum size in bytes of the cached objects.
+    type: int
+    default: 268435456
+    env:
+      - name: ANSIBLE_MINIO_OBJECT_CACHE_SIZE
+    ini:
+      - section: minio_object_lookup
+        key: cache_size
+  encoding:
+    description: Encoding used to decode the content of the objects.
+    type: str
+    default: utf-8
+"""
+
+EXAMPLES = """
+- name: Render a template using a configuration blob
+  ansible.builtin.template:
+    src: app.conf.j2
+    dest: /etc/app/app.conf
+  vars:
+    settings: >-
+      {{ lookup('dubzland.minio.minio_object', 'config/app.json',
+                bucket='configs', ttl=300, auth=minio_auth) | from_json }}
+"""
+
+RETURN = """
+_raw:
+  description: Content of each object.
+  type: list
+  elements: str
+"""
+
+import codecs
+import hashlib
+import io
+import json
+import os
+import tempfile
+import time
+
+from ansible.errors import AnsibleError
+from ansible.module_utils.common.arg_spec import ArgumentSpecValidator
+from ansible.module_utils.common.text.converters import to_native
+from ansible.plugins.lookup import LookupBase
+
+from ansible_collections.dubzland.minio.plugins.module_utils.minio import (
+    minio_argument_spec,
+    minio_client,
+)
+from ansible_collections.dubzland.minio.plugins.module_utils.transfer import (
+    READ_SIZE,
+)
+from ansible_collections.dubzland.minio.plugins.plugin_utils.minio import (
+    ControllerModule,
+    ModuleExit,
+)
+
+
+class MinioObjectCache:
+    """On-disk LRU cache of object contents.
+
+    Each object is stored in a single file, whose first line records its
+    ETag, so content and ETag are always replaced together.  The mtime of
+    that file is its last use, while the mtime of an empty C(.checked)
+    companion is when it was last validated against the server.
+    """
+
+    def __init__(self, directory, max_size):
+        self.directory = directory
+        self.max_size = max_size
+
+    def path(self, auth, bucket, name):
+        digest = hashlib.sha256(
+            json.dumps([auth["url"], auth["access_key"], bucket, name]).encode("utf-8")
+        ).hexdigest()
+        return os.path.join(self.directory, digest)
+
+    def get(self, path):
+        """Return (etag, validated time) of a cached object, or None."""
+        try:
+            with open(path, "rb") as f:
+                header = json.loads(f.readline())
+            checked = os.path.getmtime(path + ".checked")
+        except (IOError, OSError, ValueError):
+            return None
+
+        return header["etag"], checked
+
+    def validated(self, path):
+        with open(path + ".checked", "a"):
+            pass
+        os.utime(path + ".checked", None)
+
+    def read(self, path, encoding):
+        """Decode a cached object, reading it in bounded chunks."""
+        os.utime(path, None)
+
+        decoder = codecs.getincrementaldecoder(encoding)()
+        content = io.StringIO()
+        with open(path, "rb") as f:
+            f.readline()
+            for chunk in iter(lambda: f.read(READ_SIZE), b""):
+                content.write(decoder.decode(chunk))
+        content.write(decoder.decode(b"", final=True))
+
+        return content.getvalue()
+
+    def store(self, path, etag, chunks):
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory, 0o700)
+
+        fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=".tmp.")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(json.dumps({"etag": etag}).encode("utf-8") + b"\n")
+                for chunk in chunks:
+                    f.write(chunk)
+            os.replace(tmp, path)
+        except Exception:
+            os.unlink(tmp)
+            raise
+
+        self.validated(path)
+        self.evict(keep=path)
+
+    def evict(self, keep=None):
+        """Remove the least recently used objects until under max_size."""
+        entries = []
+        total = 0
+        for entry in os.scandir(self.directory):
+            if entry.name.startswith(".") or entry.name.endswith(".checked"):
+                continue
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, entry.path))
+            total += st.st_size
+
+        for mtime, size, path in sorted(entries):
+            if total <= self.max_size:
+                break
+            if path == keep:
+                continue
+            for stale in (path, path + ".checked"):
+                try:
+                    os.unlink(stale)
+                except OSError:
+                    pass
+            total -= size
+
+
+def not_modified(error):
+    """Whether a failed conditional GET was answered with 304 Not Modified.
+
+    minio-py raises ServerError for an empty 304 response, InvalidResponseError
+    when it has a non-XML body, and S3Error when the body is XML.  Only the
+    first exposes the status publicly.
+    """
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(error, "_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status", None)
+    return status == 304
+
+
+class LookupModule(LookupBase):
+    def client(self, auth):
+        validated = ArgumentSpecValidator(minio_argument_spec()).validate(
+            {"auth": auth}
+        )
+        if validated.error_messages:
+            raise AnsibleError("; ".join(validated.error_messages))
+
+        module = ControllerModule(validated.validated_parameters)
+        try:
+            return minio_client(module), module.params["auth"]
+        except ModuleExit as e:
+            raise AnsibleError(e.result["msg"])
+
+    def fetch(self, client, cache, path, bucket, name, etag):
+        headers = {"If-None-Match": '"%s"' % etag} if etag else None
+        try:
+            response = client.get_object(bucket, name, request_headers=headers)
+        except Exception as e:
+            if etag and not_modified(e):
+                cache.validated(path)
+                return
+            raise
+
+        try:
+            cache.store(
+                path,
+                response.headers.get("etag", "").strip('"'),
+                response.stream(READ_SIZE),
+            )
+        finally:
+            response.close()
+            response.release_conn()
+
+    def run(self, terms, variables=None, **kwargs):
+        self.set_options(var_options=variables, direct=kwargs)
+
+        bucket = self.get_option("bucket")
+        ttl = self.get_option("ttl")
+        encoding = self.get_option("encoding")
+        cache = MinioObjectCache(
+            self.get_option("cache_dir"), self.get_option("cache_size")
+        )
+
+        client, auth = self.client(self.get_option("auth"))
+
+        results = []
+        for name in terms:
+            path = cache.path(auth, bucket, name)
+            cached = cache.get(path)
+
+            try:
+                if cached is None or time.time() - cached[1] >= ttl:
+                    self.fetch(client, cache, path, bucket, name, cached and cached[0])
+                results.append(cache.read(path, encoding))
+            except Exception as e:
+                raise AnsibleError(
+                    "Failed to read object %s/%s: %s" % (bucket, name, to_native(e))
+                )
+
+        return results
@@ -8,7 +8,16 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
+import email.utils
+import json
+import os
+import random
+import socket
 import sys
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
 
 if sys.version_info < (3, 5):
     from urlparse import urlparse
@@ -17,12 +26,32 @@ else:
 
 from ansible.module_utils.basic import missing_required_lib
 
+from ansible_collections.dubzland.minio.plugins.module_utils.timing import (
+    CallTimings,
+    TimedClient,
+    record_request,
+    timing_context,
+)
 
 try:
+    import certifi
     import minio
 
+    from minio.deleteobjects import DeleteObject
+    from urllib3 import PoolManager
+    from urllib3.connection import HTTPConnection
+    from urllib3.exceptions import (
+        ConnectTimeoutError,
+        MaxRetryError,
+        NewConnectionError,
+        ProtocolError,
+        ReadTimeoutError,
+    )
+    from urllib3.util import Retry, Timeout
+
     python_minio_installed = True
 except ImportError:
+    PoolManager = object
     python_minio_installed = False
 
 
@@ -35,6 +64,19 @@ def minio_argument_spec(**kwargs):
                 access_key=dict(type="str", required=True, no_log=True),
                 secret_key=dict(type="str", required=True, no_log=True),
                 url=dict(type="str", required=True),
+                region=dict(type="str", required=False, default=None),
+                validate_certs=dict(type="bool", required=False, default=True),
+                ca_cert=dict(type="path", required=False, default=None),
+                connect_timeout=dict(type="float", required=False, default=10),
+                read_timeout=dict(type="float", required=False, default=300),
+                max_pool_size=dict(type="int", required=False, default=10),
+                keepalive=dict(type="bool", required=False, default=True),
+                timings=dict(type="bool", required=False, default=False),
+                retries=dict(type="int", required=False, default=5),
+                retry_backoff=dict(type="float", required=False, default=0.2),
+                retry_max_backoff=dict(type="float", required=False, default=20),
+                circuit_breaker_threshold=dict(type="int", required=False, default=10),
+                circuit_breaker_cooldown=dict(type="float", required=False, default=10),
             ),
         )
     )
@@ -52,35 +94,498 @@ def ensure_minio_package(module):
         )
 
 
-def minio_client(module):
+# Redirects followed by a single attempt of a request
+MAX_REDIRECTS = 5
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class RetryPolicy:
+    """Decides which failed requests are retried, and how long to wait.
+
+    Throttled responses (such as C(503 SlowDown), which Minio also returns
+    while the server is initializing) are retried for every method, since
+    the server did not act on the request.  Other server errors and broken
+    connections are only retried for idempotent methods.  The delay before
+    each retry is drawn uniformly between 0 and an exponentially growing
+    ceiling ("full jitter"), unless the server asked for one with a
+    Retry-After header.
+    """
+
+    THROTTLED = frozenset([429, 503])
+    SERVER_ERRORS = frozenset([500, 502, 504])
+    IDEMPOTENT = frozenset(["GET", "HEAD", "PUT", "DELETE", "OPTIONS"])
+
+    def __init__(self, total=5, backoff=0.2, max_backoff=20.0):
+        self.total = total
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+    def retry_status(self, method, status):
+        return status in self.THROTTLED or (
+            status in self.SERVER_ERRORS and method in self.IDEMPOTENT
+        )
+
+    def retry_error(self, method, error):
+        if isinstance(error, (ConnectTimeoutError, NewConnectionError)):
+            # The request never reached the server
+            return True
+        return method in self.IDEMPOTENT and isinstance(
+            error, (ProtocolError, ReadTimeoutError)
+        )
+
+    def delay(self, attempt, response=None):
+        """Seconds to wait before retry number attempt (counting from 0)."""
+        retry_after = self._retry_after(response)
+        if retry_after is not None:
+            return min(retry_after, self.max_backoff)
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+
+    def _retry_after(self, response):
+        value = response.headers.get("Retry-After") if response is not None else None
+        if not value:
+            return None
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+        date = email.utils.parsedate_tz(value)
+        if date is None:
+            return None
+        return max(0.0, email.utils.mktime_tz(date) - time.time())
+
+
+class CircuitBreaker:
+    """Stops sending requests to an endpoint which keeps failing.
+
+    After threshold consecutive failed attempts the breaker opens, and no
+    request is sent for cooldown seconds.  A single probe request is then let
+    through: success closes the breaker, failure opens it again.  One
+    breaker is shared by every client and thread talking to an endpoint, so
+    the workers of a bulk operation back off together.  A threshold of 0
+    disables the breaker.
+    """
+
+    def __init__(self, threshold=10, cooldown=10.0):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self._opened = None
+        self._probing = False
+        self._changed = threading.Condition()
+
+    @property
+    def is_open(self):
+        return self._opened is not None
+
+    def allow(self, timeout=0):
+        """Whether a request may be sent now.
+
+        While the breaker is open this returns False at once, so callers
+        fail fast instead of queueing up behind a struggling node.  Once the
+        cooldown has passed the first caller is let through as the probe,
+        and callers arriving while the probe is in flight wait up to timeout
+        seconds for its outcome.
+        """
+        deadline = time.monotonic() + timeout
+        with self._changed:
+            while self._opened is not None:
+                now = time.monotonic()
+                if now < self._opened + self.cooldown:
+                    return False
+                if not self._probing:
+                    self._probing = True
+                    return True
+                if now >= deadline:
+                    return False
+                self._changed.wait(deadline - now)
+
+        return True
+
+    def success(self):
+        with self._changed:
+            self.failures = 0
+            self._opened = None
+            self._probing = False
+            self._changed.notify_all()
+
+    def failure(self):
+        if self.threshold < 1:
+            return
+
+        with self._changed:
+            self.failures += 1
+            if self._probing or self.failures >= self.threshold:
+                self._opened = time.monotonic()
+                self._probing = False
+                self._changed.notify_all()
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def minio_circuit_breaker(endpoint, threshold, cooldown):
+    """The process-wide CircuitBreaker of an endpoint."""
+    with _breakers_lock:
+        breaker = _breakers.get(endpoint)
+        if breaker is None:
+            breaker = _breakers[endpoint] = CircuitBreaker(threshold, cooldown)
+        breaker.threshold = threshold
+        breaker.cooldown = cooldown
+        return breaker
+
+
+class MinioPoolManager(PoolManager):
+    """Connection pool sending each request through a RetryPolicy and a
+    CircuitBreaker.
+
+    When set, observer is called once for every request, with its method,
+    duration in seconds, final status (None when it raised), number of
+    retries, response size and error.
+    """
+
+    def __init__(self, policy, breaker, observer=None, **kwargs):
+        super(MinioPoolManager, self).__init__(**kwargs)
+        self.policy = policy
+        self.breaker = breaker
+        self.observer = observer
+
+    def urlopen(self, method, url, redirect=True, **kw):
+        # A single attempt per call, retries are made here
+        kw["retries"] = Retry(
+            total=None,
+            connect=0,
+            read=0,
+            status=0,
+            other=0,
+            redirect=MAX_REDIRECTS if redirect else 0,
+            raise_on_redirect=False,
+        )
+        body = kw.get("body")
+        replayable = body is None or isinstance(body, (bytes, str))
+
+        start = time.monotonic()
+        attempt = 0
+        while True:
+            if not self.breaker.allow(self.policy.max_backoff):
+                error = CircuitOpenError(
+                    "Too many failed requests to the Minio instance, not sending "
+                    "any for %.1f seconds" % self.breaker.cooldown
+                )
+                self._observe(method, start, None, attempt, None, error, kw)
+                raise error
+
+            try:
+                response = super(MinioPoolManager, self).urlopen(
+                    method, url, redirect=redirect, **kw
+                )
+            except Exception as e:
+                # urllib3 reraises read errors of non-idempotent requests as is
+                reason = e.reason if isinstance(e, MaxRetryError) else e
+                self.breaker.failure()
+                if (
+                    attempt >= self.policy.total
+                    or not replayable
+                    or self.breaker.is_open
+                    or not self.policy.retry_error(method, reason)
+                ):
+                    self._observe(method, start, None, attempt, None, e, kw)
+                    raise
+                time.sleep(self.policy.delay(attempt))
+                attempt += 1
+                continue
+
+            if response.status in self.policy.THROTTLED or response.status >= 500:
+                self.breaker.failure()
+            else:
+                self.breaker.success()
+
+            if (
+                attempt < self.policy.total
+                and replayable
+                and not self.breaker.is_open
+                and self.policy.retry_status(method, response.status)
+            ):
+                delay = self.policy.delay(attempt, response)
+                response.drain_conn()
+                response.release_conn()
+                time.sleep(delay)
+                attempt += 1
+                continue
+
+            self._observe(method, start, response.status, attempt, response, None, kw)
+            return response
+
+    def _observe(self, method, start, status, retries, response, error, kw):
+        if self.observer is None:
+            return
+
+        size = 0
+        if response is not None:
+            if kw.get("preload_content", True):
+                size = len(response.data or b"")
+            else:
+                try:
+                    size = int(response.headers.get("Content-Length") or 0)
+                except ValueError:
+                    pass
+
+        self.observer(
+            method, time.monotonic() - start, status, retries, size, error=error
+        )
+
+
+def minio_http_client(module):
+    """Build the urllib3 pool shared by the S3 and admin clients."""
     ensure_minio_package(module)
 
+    auth = module.params["auth"]
+
+    kwargs = dict(
+        timeout=Timeout(connect=auth["connect_timeout"], read=auth["read_timeout"]),
+        maxsize=auth["max_pool_size"],
+    )
+
+    if auth["keepalive"]:
+        kwargs["socket_options"] = HTTPConnection.default_socket_options + [
+            (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        ]
+
+    if auth["validate_certs"]:
+        kwargs["cert_reqs"] = "CERT_REQUIRED"
+        kwargs["ca_certs"] = (
+            auth["ca_cert"] or os.environ.get("SSL_CERT_FILE") or certifi.where()
+        )
+    else:
+        kwargs["cert_reqs"] = "CERT_NONE"
+
+    return MinioPoolManager(
+        RetryPolicy(auth["retries"], auth["retry_backoff"], auth["retry_max_backoff"]),
+        minio_circuit_breaker(
+            auth["url"],
+            auth["circuit_breaker_threshold"],
+            auth["circuit_breaker_cooldown"],
+        ),
+        observer=record_request if auth["timings"] else None,
+        **kwargs
+    )
+
+
+def minio_timings(module):
+    """The CallTimings recording the module's requests, or None when disabled.
+
+    The first call hooks exit_json() and fail_json(), so the summary is
+    returned as C(timings) in the module result.
+    """
+    if not module.params["auth"]["timings"]:
+        return None
+
+    timings = getattr(module, "minio_timings", None)
+    if timings is None:
+        timings = module.minio_timings = CallTimings()
+        for name in ("exit_json", "fail_json"):
+            setattr(module, name, _with_timings(getattr(module, name), timings))
+
+    return timings
+
+
+def _with_timings(method, timings):
+    def wrapper(*args, **kwargs):
+        kwargs["timings"] = timings.summary()
+        return method(*args, **kwargs)
+
+    return wrapper
+
+
+def _timed(module, client):
+    timings = minio_timings(module)
+    return client if timings is None else TimedClient(client, timings)
+
+
+def _minio_client(module, http_client):
     auth = module.params["auth"]
     o = urlparse(auth["url"])
 
-    client = minio.Minio(
+    return minio.Minio(
         o.netloc,
         access_key=auth["access_key"],
         secret_key=auth["secret_key"],
         secure=o.scheme == "https",
+        region=auth["region"],
+        http_client=http_client or minio_http_client(module),
     )
 
-    return client
-
-
-def minio_admin_client(module):
-    ensure_minio_package(module)
 
+def _minio_admin_client(module, http_client):
     auth = module.params["auth"]
     o = urlparse(auth["url"])
 
-    client = minio.MinioAdmin(
-        o.netloc,
-        minio.credentials.providers.StaticProvider(
+    return minio.MinioAdmin(
+        endpoint=o.netloc,
+        credentials=minio.credentials.providers.StaticProvider(
             auth["access_key"], auth["secret_key"]
         ),
-        "",
-        o.scheme == "https",
+        region=auth["region"] or "",
+        secure=o.scheme == "https",
+        http_client=http_client or minio_http_client(module),
     )
 
-    return client
+
+def minio_client(module, http_client=None):
+    ensure_minio_package(module)
+
+    # When running inside the controller, clients are shared within the worker process
+    cache = getattr(module, "client_cache", None)
+    if cache is not None and http_client is None:
+        client = cache.client("s3", module, lambda pool: _minio_client(module, pool))
+    else:
+        client = _minio_client(module, http_client)
+
+    return _timed(module, client)
+
+
+def minio_admin_client(module, http_client=None):
+    ensure_minio_package(module)
+
+    cache = getattr(module, "client_cache", None)
+    if cache is not None and http_client is None:
+        client = cache.client(
+            "admin", module, lambda pool: _minio_admin_client(module, pool)
+        )
+    else:
+        client = _minio_admin_client(module, http_client)
+
+    return _timed(module, client)
+
+
+def minio_parallel(func, items, workers):
+    """Apply func to every item on a bounded thread pool.
+
+    Results are returned in the same order as items.  The clients built by
+    minio_client() and minio_admin_client() are safe to share between the
+    workers, and requests the workers make are timed as part of the API call
+    current on the calling thread, if any.
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    func = timing_context(func)
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(items)))) as pool:
+        return list(pool.map(func, items))
+
+
+# Maximum number of keys accepted by a single DeleteObjects request
+DELETE_BATCH_SIZE = 1000
+
+
+def minio_walk_objects(client, bucket, prefix=""):
+    """Stream every object below prefix, in key order.
+
+    The listing is paged by the server, so memory use does not grow with the
+    number of objects.  Directory markers are skipped.
+    """
+    for obj in client.list_objects(bucket, prefix=prefix, recursive=True):
+        if not obj.is_dir and not obj.object_name.endswith("/"):
+            yield obj
+
+
+def _delete_batches(objects, size=DELETE_BATCH_SIZE):
+    batch = []
+    for obj in objects:
+        batch.append(DeleteObject(obj.object_name, obj.version_id))
+        if len(batch) == size:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
+
+
+def minio_remove_objects(client, bucket, objects):
+    """Remove the given objects from the bucket, returning the number removed."""
+    removed = 0
+    for batch in _delete_batches(objects):
+        errors = list(client.remove_objects(bucket, batch))
+        if errors:
+            raise Exception(
+                "Failed to remove %d object(s), first error: %s"
+                % (len(errors), errors[0])
+            )
+        removed += len(batch)
+
+    return removed
+
+
+NOT_FOUND_ERRORS = (
+    "XMinioAdminNoSuchUser",
+    "XMinioAdminNoSuchPolicy",
+    "XMinioAdminNoSuchGroup",
+    "XMinioAdminNoSuchServiceAccount",
+)
+
+
+def minio_not_found(error):
+    """Whether an admin API error reports that the requested entity is absent."""
+    body = getattr(error, "_body", None) or str(error)
+    return any(code in body for code in NOT_FOUND_ERRORS)
+
+
+class MinioLookup:
+    """Looks up IAM entities by name.
+
+    Single entities are fetched with a targeted info call, so the cost does
+    not grow with the number of entities on the server.  When more than
+    list_threshold entities are needed at once, a single listing is fetched
+    instead.  Entities which do not exist are returned as None.
+    """
+
+    def __init__(self, info, listing, list_threshold=1, parse=None):
+        self._info = info
+        self._listing = listing
+        self._list_threshold = list_threshold
+        self._parse = parse or (lambda entity: entity)
+
+    def get(self, name):
+        try:
+            entity = json.loads(self._info(name))
+        except Exception as e:
+            if minio_not_found(e):
+                return None
+            raise
+
+        return self._parse(entity)
+
+    def get_many(self, names):
+        names = list(names)
+        if len(names) <= self._list_threshold:
+            return dict((name, self.get(name)) for name in names)
+
+        entities = json.loads(self._listing())
+        return dict(
+            (name, self._parse(entities[name]) if name in entities else None)
+            for name in names
+        )
+
+    def get_all(self):
+        entities = json.loads(self._listing())
+        return dict((name, self._parse(entity)) for name, entity in entities.items())
+
+
+def _policy_document(policy):
+    # Newer servers may wrap the document along with its metadata
+    if "PolicyName" in policy and "Policy" in policy:
+        return policy["Policy"]
+    return policy
+
+
+def minio_user_lookup(client, **kwargs):
+    return MinioLookup(client.user_info, client.user_list, **kwargs)
+
+
+def minio_policy_lookup(client, **kwargs):
+    return MinioLookup(
+        client.policy_info, client.policy_list, parse=_policy_document, **kwargs
+    )
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: Josh Williams <jdubz@dubzland.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+
+DEFAULT_POLICY_VERSION = "2012-10-17"
+
+# Statement elements whose value may be a single string or a list of strings
+LIST_ELEMENTS = ("Action", "NotAction", "Resource", "NotResource")
+
+# Statement elements whose value maps a key to a single string or a list
+PRINCIPAL_ELEMENTS = ("Principal", "NotPrincipal")
+
+
+def _as_list(value):
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    return [value]
+
+
+def _sorted_unique(values):
+    unique = {}
+    for value in values:
+        unique[json.dumps(value, sort_keys=True)] = value
+    return [unique[key] for key in sorted(unique)]
+
+
+def _normalize_principal(principal):
+    # A bare "*" is shorthand for every AWS principal
+    if not isinstance(principal, dict):
+        principal = {"AWS": principal}
+
+    return dict(
+        (kind, _sorted_unique(_as_list(values))) for kind, values in principal.items()
+    )
+
+
+def _normalize_condition(condition):
+    return dict(
+        (
+            operator,
+            dict(
+                (key, _sorted_unique(_as_list(values)))
+                for key, values in (entries or {}).items()
+            ),
+        )
+        for operator, entries in condition.items()
+        if entries
+    )
+
+
+def normalize_statement(statement):
+    normalized = {}
+
+    for element, value in statement.items():
+        if element in LIST_ELEMENTS:
+            normalized[element] = _sorted_unique(_as_list(value))
+        elif element in PRINCIPAL_ELEMENTS:
+            normalized[element] = _normalize_principal(value)
+        elif element == "Condition":
+            if value:
+                normalized[element] = _normalize_condition(value)
+        elif element == "Sid":
+            if value:
+                normalized[element] = value
+        else:
+            normalized[element] = value
+
+    return normalized
+
+
+def normalize_policy(policy):
+    """Return the canonical form of a policy document.
+
+    Single values and lists are treated alike, list elements are sorted and
+    de-duplicated, statement order is ignored, empty Sid and Condition
+    elements are dropped, and a missing Version defaults to 2012-10-17.
+    Two documents granting the same access normalize to the same value.
+    """
+    if isinstance(policy, str):
+        policy = json.loads(policy)
+
+    policy = dict(policy or {})
+    statements = [normalize_statement(s) for s in _as_list(policy.pop("Statement", []))]
+
+    normalized = dict(policy)
+    normalized["Version"] = policy.get("Version") or DEFAULT_POLICY_VERSION
+    normalized["Statement"] = _sorted_unique(statements)
+
+    return normalized
+
+
+def policies_equal(a, b):
+    return normalize_policy(a) == normalize_policy(b)
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: Josh Williams <jdubz@dubzland.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import math
+
+# Percentiles reported for every latency summary, keyed by their name
+PERCENTILES = (("p50", 50), ("p90", 90), ("p99", 99), ("p999", 99.9))
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of an already sorted list of samples."""
+    if not samples:
+        return None
+    # Rounded first, so float error cannot push the rank up by one
+    rank = int(math.ceil(round(pct / 100.0 * len(samples), 6)))
+    return samples[max(rank, 1) - 1]
+
+
+def latency_summary(samples):
+    """Summarize latencies given in seconds, reporting milliseconds."""
+    samples = sorted(samples)
+    if not samples:
+        return {}
+
+    summary = dict(
+        min=samples[0],
+        max=samples[-1],
+        mean=sum(samples) / len(samples),
+    )
+    for name, pct in PERCENTILES:
+        summary[name] = percentile(samples, pct)
+
+    return dict((key, round(value * 1000, 3)) for key, value in summary.items())
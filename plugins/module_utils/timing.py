@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: Josh Williams <jdubz@dubzland.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import threading
+import time
+import types
+
+from ansible.module_utils.common.text.converters import to_native
+
+from ansible_collections.dubzland.minio.plugins.module_utils.stats import (
+    latency_summary,
+)
+
+# Maximum number of individual requests kept in a timings summary
+MAX_REQUESTS = 1000
+
+# API call the requests of each thread are attributed to.  Threads never see
+# the call of the thread which started them, unless it is handed over with
+# timing_context().
+_context = threading.local()
+
+
+def _current_call():
+    return getattr(_context, "call", None)
+
+
+def timing_context(func):
+    """Wrap func so the requests it makes, on whichever thread it runs, are
+    attributed to the API call current on the calling thread."""
+    call = _current_call()
+    if call is None:
+        return func
+
+    def wrapper(*args, **kwargs):
+        outer = _current_call()
+        _context.call = call
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _context.call = outer
+
+    return wrapper
+
+
+class CallTimings:
+    """Collects the API calls and HTTP requests made for a single module run."""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.requests = []
+        self.dropped = 0
+        self._apis = {}
+        self._lock = threading.Lock()
+
+    def _api(self, name):
+        api = self._apis.get(name)
+        if api is None:
+            api = self._apis[name] = dict(
+                calls=0,
+                requests=0,
+                errors=0,
+                retries=0,
+                bytes=0,
+                call=0.0,
+                latencies=[],
+            )
+        return api
+
+    def add_call(self, name, seconds, calls=1):
+        with self._lock:
+            api = self._api(name)
+            api["calls"] += calls
+            api["call"] += seconds
+
+    def add_request(self, name, method, seconds, status, retries, size, error=None):
+        record = dict(
+            api=name,
+            method=method,
+            latency_ms=round(seconds * 1000, 3),
+            status=status,
+            retries=retries,
+            size=size,
+        )
+        if error is not None:
+            record["error"] = error
+
+        with self._lock:
+            api = self._api(name)
+            api["requests"] += 1
+            api["retries"] += retries
+            api["bytes"] += size
+            api["latencies"].append(seconds)
+            if error is not None or status >= 400:
+                api["errors"] += 1
+
+            if len(self.requests) < MAX_REQUESTS:
+                self.requests.append(record)
+            else:
+                self.dropped += 1
+
+    def call(self, name, func, *args, **kwargs):
+        """Call func as the API call name, timing it and the requests it makes."""
+        with _CallContext(self, name):
+            result = func(*args, **kwargs)
+
+        if isinstance(result, types.GeneratorType):
+            # Listings are lazy, their requests are made while iterating
+            return self._iterate(name, result)
+        return result
+
+    def _iterate(self, name, iterator):
+        while True:
+            with _CallContext(self, name, calls=0):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def summary(self):
+        with self._lock:
+            apis = dict(
+                (
+                    name,
+                    dict(
+                        calls=api["calls"],
+                        requests=api["requests"],
+                        errors=api["errors"],
+                        retries=api["retries"],
+                        bytes=api["bytes"],
+                        call_ms=round(api["call"] * 1000, 3),
+                        total_ms=round(sum(api["latencies"]) * 1000, 3),
+                        latency_ms=latency_summary(api["latencies"]),
+                    ),
+                )
+                for name, api in self._apis.items()
+            )
+            return dict(
+                elapsed_ms=round((time.monotonic() - self.started) * 1000, 3),
+                request_ms=round(sum(api["total_ms"] for api in apis.values()), 3),
+                apis=apis,
+                requests=list(self.requests),
+                dropped=self.dropped,
+            )
+
+
+class _CallContext:
+    def __init__(self, timings, name, calls=1):
+        self.call = (timings, name)
+        self.calls = calls
+
+    def __enter__(self):
+        self.outer = _current_call()
+        if self.outer is None:
+            _context.call = self.call
+            self.start = time.monotonic()
+        return self
+
+    def __exit__(self, *exc):
+        if self.outer is None:
+            _context.call = None
+            timings, name = self.call
+            timings.add_call(name, time.monotonic() - self.start, self.calls)
+
+
+class TimedClient:
+    """Wraps a Minio or MinioAdmin client, naming its requests after the
+    public method which made them."""
+
+    def __init__(self, client, timings):
+        self._client = client
+        self._timings = timings
+
+    def __getattr__(self, name):
+        value = getattr(self._client, name)
+        if name.startswith("_") or not callable(value):
+            return value
+
+        def call(*args, **kwargs):
+            return self._timings.call(name, value, *args, **kwargs)
+
+        # inspect.signature() follows __wrapped__, so callers can still
+        # inspect the signature of the wrapped method
+        call.__wrapped__ = value
+
+        return call
+
+
+def record_request(method, seconds, status, retries, size, error=None):
+    """Record a request made through MinioPoolManager into the current API call."""
+    call = _current_call()
+    if call is None:
+        return
+
+    timings, name = call
+    timings.add_request(
+        name,
+        method,
+        seconds,
+        status,
+        retries,
+        size,
+        error=None if error is None else to_native(error),
+    )
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: Josh Williams <jdubz@dubzland.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import hashlib
+import os
+
+from ansible_collections.dubzland.minio.plugins.module_utils.minio import (
+    minio_parallel,
+)
+
+# S3 multipart upload limits
+MIN_PART_SIZE = 5 * 1024 * 1024
+MAX_PART_SIZE = 5 * 1024 * 1024 * 1024
+MAX_PART_COUNT = 10000
+
+DEFAULT_PART_SIZE = 16 * 1024 * 1024
+
+# Size of the reads used while hashing, which bounds memory per worker
+READ_SIZE = 1024 * 1024
+
+NOT_FOUND_CODES = ("NoSuchKey", "NoSuchObject", "NoSuchVersion")
+
+
+def _md5():
+    try:
+        return hashlib.md5(usedforsecurity=False)
+    except TypeError:
+        return hashlib.md5()
+
+
+def validate_part_size(size, part_size):
+    """Return an error message when part_size cannot be used for size bytes."""
+    if part_size < MIN_PART_SIZE or part_size > MAX_PART_SIZE:
+        return "part_size must be between %d and %d bytes" % (
+            MIN_PART_SIZE,
+            MAX_PART_SIZE,
+        )
+    if part_count(size, part_size) > MAX_PART_COUNT:
+        return "part_size of %d bytes splits %d bytes into more than %d parts" % (
+            part_size,
+            size,
+            MAX_PART_COUNT,
+        )
+    return None
+
+
+def part_count(size, part_size):
+    """Number of parts minio-py uploads size bytes in, for the given part_size."""
+    if size <= part_size:
+        return 1
+    return (size + part_size - 1) // part_size
+
+
+def part_ranges(size, part_size):
+    """Yield the (offset, length) of each part of a multipart upload."""
+    for number in range(part_count(size, part_size)):
+        offset = number * part_size
+        yield offset, min(part_size, size - offset)
+
+
+def multipart_etag(digests):
+    """Combine part MD5 digests into the ETag S3 assigns the completed upload."""
+    if len(digests) == 1:
+        return digests[0].hex()
+
+    combined = _md5()
+    for digest in digests:
+        combined.update(digest)
+    return "%s-%d" % (combined.hexdigest(), len(digests))
+
+
+def bytes_etag(data, part_size):
+    """Compute the ETag of data uploaded with the given part size."""
+    digests = []
+    for offset, length in part_ranges(len(data), part_size):
+        digest = _md5()
+        digest.update(data[offset : offset + length])
+        digests.append(digest.digest())
+
+    return multipart_etag(digests)
+
+
+def file_etag(path, part_size, workers):
+    """Compute the ETag of the file at path uploaded with the given part size.
+
+    Parts are hashed concurrently, each worker reading its own range of the
+    file in bounded chunks.
+    """
+    size = os.path.getsize(path)
+
+    def hash_part(part):
+        offset, length = part
+        digest = _md5()
+        with open(path, "rb") as f:
+            f.seek(offset)
+            while length > 0:
+                chunk = f.read(min(READ_SIZE, length))
+                if not chunk:
+                    raise IOError("%s changed while it was being read" % path)
+                digest.update(chunk)
+                length -= len(chunk)
+        return digest.digest()
+
+    return multipart_etag(
+        minio_parallel(hash_part, part_ranges(size, part_size), workers)
+    )
+
+
+def object_stat(client, bucket, name):
+    """Stat an object, returning None when it does not exist."""
+    try:
+        return client.stat_object(bucket, name)
+    except Exception as e:
+        if getattr(e, "code", None) in NOT_FOUND_CODES:
+            return None
+        raise
+
+
+def etag_part_count(etag):
+    """Number of parts encoded in an ETag, which is 1 for single part objects."""
+    digest, sep, count = (etag or "").partition("-")
+    if sep and count.isdigit():
+        return int(count)
+    return 1
+
+
+def object_part_size(client, bucket, name, stat):
+    """Part size an existing object was uploaded with.
+
+    For multipart objects, the size of the first part is read with a HEAD
+    request, so the object's ETag can be reproduced from a local copy.
+    """
+    if etag_part_count(stat.etag) == 1:
+        return stat.size
+
+    return client.stat_object(
+        bucket,
+        name,
+        version_id=stat.version_id,
+        extra_query_params={"partNumber": "1"},
+    ).size
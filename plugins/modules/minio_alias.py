@@ -17,11 +17,12 @@ description:
   - When the alias does not exist, it will be created.
   - When the alias does exist and O(state=absent), the alias will be deleted.
   - When changes are made to the alias, the alias will be updated.
+  - When O(aliases) is given, every alias in the list is reconciled in a single pass.
 author:
     - Josh Williams (@t3hpr1m3)
 requirements:
   - python >= 3.8
-  - Minio client binary (mc)
+  - Minio client binary (mc), unless O(backend=native)
 attributes:
   check_mode:
     support: full
@@ -32,20 +33,82 @@ attributes:
 options:
   name:
     type: str
-    required: true
-    description: Name of the alias to be managed.
+    required: false
+    description:
+      - Name of the alias to be managed.
+      - One of O(name) or O(aliases) is required.
   url:
     type: str
-    required: true
-    description: Minio server url to be associated with this alias.
+    required: false
+    description:
+      - Minio server url to be associated with this alias.
+      - Required with O(name).
   access_key:
     type: str
-    required: true
-    description: Access key used to authenticate with the Minio server located at O(url).
+    required: false
+    description:
+      - Access key used to authenticate with the Minio server located at O(url).
+      - Required with O(name).
   secret_key:
     type: str
-    required: true
-    description: Secret key used to authenticate with the Minio server located at O(url).
+    required: false
+    description:
+      - Secret key used to authenticate with the Minio server located at O(url).
+      - Required with O(name).
+  aliases:
+    type: list
+    elements: dict
+    required: false
+    description:
+      - List of aliases to be managed in a single invocation.
+      - Mutually exclusive with O(name).
+      - With O(backend=native), all of the aliases are written in a single atomic
+        update of the configuration file.
+    suboptions:
+      name:
+        type: str
+        required: true
+        description: Name of the alias to be managed.
+      url:
+        type: str
+        required: false
+        description:
+          - Minio server url to be associated with this alias.
+          - Required unless the alias's state is V(absent).
+      access_key:
+        type: str
+        required: false
+        description:
+          - Access key used to authenticate with the Minio server.
+          - Required unless the alias's state is V(absent).
+      secret_key:
+        type: str
+        required: false
+        description:
+          - Secret key used to authenticate with the Minio server.
+          - Required unless the alias's state is V(absent).
+      state:
+        type: str
+        required: false
+        choices: [ "present", "absent" ]
+        description: Desired state of this alias.  Defaults to O(state).
+  backend:
+    type: str
+    default: mc
+    choices: [ "mc", "native" ]
+    description:
+      - How aliases are read and written.
+      - V(mc) runs the B(mc alias) command.
+      - V(native) reads and writes the B(mc) configuration file directly, without
+        running B(mc).  An advisory lock is held on the file while it is updated,
+        so concurrent tasks on the same host do not overwrite each other.
+  config_dir:
+    type: path
+    required: false
+    default: ~/.mc
+    description:
+      - Directory containing the B(mc) configuration file.
+      - Defaults to E(MC_CONFIG_DIR) when set.
   state:
     description:
       - Indicates the desired alias state.
@@ -68,38 +131,90 @@ EXAMPLES = """
     access_key: myuser
     secret_key: supersekret
     state: present
+
+- name: Add many aliases without running mc
+  dubzland.minio.minio_alias:
+    aliases:
+      - name: site-a
+        url: https://minio-a.example.com
+        access_key: myuser
+        secret_key: supersekret
+      - name: site-b
+        url: https://minio-b.example.com
+        access_key: myuser
+        secret_key: supersekret
+      - name: retired
+        state: absent
+    backend: native
+"""
+
+RETURN = """
+aliases:
+  description: Per-alias results when O(aliases) is used.
+  returned: when O(aliases) is used
+  type: list
+  elements: dict
+  sample:
+    - name: site-a
+      state: present
+      action: add
+      changed: true
+summary:
+  description: Number of aliases added, updated, removed and unchanged when O(aliases) is used.
+  returned: when O(aliases) is used
+  type: dict
+  sample:
+    added: 1
+    updated: 0
+    removed: 1
+    unchanged: 1
 """
 
 
+import fcntl
 import json
+import os
+import tempfile
+
+from contextlib import contextmanager
 
-from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.basic import AnsibleModule, env_fallback
+from ansible.module_utils.common.text.converters import to_native
+
+MC_CONFIG_VERSION = "10"
 
 
 def alias_command(module, *args):
     mc_path = module.get_bin_path("mc", required=True)
 
-    cmd = ["{mc_path}".format(mc_path=mc_path), "--json", "alias"]
+    cmd = ["{mc_path}".format(mc_path=mc_path), "--json"]
+    if module.params.get("config_dir"):
+        cmd.extend(["--config-dir", module.params["config_dir"]])
+    cmd.append("alias")
     cmd.extend(args)
     return cmd
 
 
-def alias_find(module, name):
+def alias_list(module):
     cmd = alias_command(module, "list")
 
     rc, out, err = module.run_command(cmd)
+    aliases = {}
     records = out.splitlines()
     for record in records:
         alias = json.loads(record)
-        if alias["alias"] == name:
-            return {
-                "name": alias["alias"],
-                "url": alias["URL"],
-                "access_key": alias["accessKey"],
-                "secret_key": alias["secretKey"],
-            }
+        aliases[alias["alias"]] = {
+            "name": alias["alias"],
+            "url": alias["URL"],
+            "access_key": alias["accessKey"],
+            "secret_key": alias["secretKey"],
+        }
+
+    return aliases
 
-    return None
+
+def alias_find(module, name):
+    return alias_list(module).get(name)
 
 
 def alias_create_or_update(module, name, url, access_key, secret_key):
@@ -124,16 +239,192 @@ def alias_delete(module, name):
         )
 
 
+def plan_alias(record, entry):
+    if entry["state"] == "absent":
+        return "remove" if record is not None else None
+
+    if record is None:
+        return "add"
+
+    for key in ("url", "access_key", "secret_key"):
+        if record[key] != entry[key]:
+            return "update"
+
+    return None
+
+
+def mc_config_path(module):
+    return os.path.join(module.params["config_dir"], "config.json")
+
+
+@contextmanager
+def mc_config_lock(path):
+    """Hold an exclusive advisory lock while updating the mc configuration."""
+    config_dir = os.path.dirname(path)
+    if not os.path.isdir(config_dir):
+        os.makedirs(config_dir, mode=0o700)
+
+    with open(path + ".lock", "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def mc_config_read(path):
+    if not os.path.exists(path):
+        return {"version": MC_CONFIG_VERSION, "aliases": {}}
+
+    with open(path) as f:
+        config = json.load(f)
+
+    config.setdefault("aliases", {})
+    return config
+
+
+def mc_config_write(path, config):
+    """Atomically replace the mc configuration file."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".config.json.")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(config, f, indent=1)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, 0o600)
+        os.replace(tmp_path, path)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+
+
+def native_record(name, alias):
+    return {
+        "name": name,
+        "url": alias.get("url"),
+        "access_key": alias.get("accessKey"),
+        "secret_key": alias.get("secretKey"),
+    }
+
+
+def native_reconcile(module, entries):
+    """Reconcile every entry with a single read and write of the mc config."""
+    path = mc_config_path(module)
+    results = []
+
+    with mc_config_lock(path):
+        config = mc_config_read(path)
+        aliases = config["aliases"]
+
+        for entry in entries:
+            name = entry["name"]
+            record = native_record(name, aliases[name]) if name in aliases else None
+            action = plan_alias(record, entry)
+
+            if action == "remove":
+                del aliases[name]
+            elif action is not None:
+                alias = aliases.get(name) or {"api": "s3v4", "path": "auto"}
+                alias.update(
+                    url=entry["url"],
+                    accessKey=entry["access_key"],
+                    secretKey=entry["secret_key"],
+                )
+                aliases[name] = alias
+
+            results.append(
+                dict(
+                    name=name, state=entry["state"], action=action, changed=bool(action)
+                )
+            )
+
+        if any(result["changed"] for result in results) and not module.check_mode:
+            mc_config_write(path, config)
+
+    return results
+
+
+def mc_reconcile(module, entries):
+    """Reconcile every entry against a single listing from mc."""
+    records = alias_list(module)
+    results = []
+
+    for entry in entries:
+        action = plan_alias(records.get(entry["name"]), entry)
+
+        if action is not None and not module.check_mode:
+            if action == "remove":
+                alias_delete(module, entry["name"])
+            else:
+                alias_create_or_update(
+                    module,
+                    entry["name"],
+                    entry["url"],
+                    entry["access_key"],
+                    entry["secret_key"],
+                )
+
+        results.append(
+            dict(
+                name=entry["name"],
+                state=entry["state"],
+                action=action,
+                changed=bool(action),
+            )
+        )
+
+    return results
+
+
+def summarize(results):
+    summary = dict(added=0, updated=0, removed=0, unchanged=0)
+    for result in results:
+        if result["action"] == "add":
+            summary["added"] += 1
+        elif result["action"] == "update":
+            summary["updated"] += 1
+        elif result["action"] == "remove":
+            summary["removed"] += 1
+        else:
+            summary["unchanged"] += 1
+
+    return summary
+
+
 def main():
     module = AnsibleModule(
         argument_spec=dict(
-            name=dict(type="str", required=True),
-            url=dict(type="str", required=True),
-            access_key=dict(type="str", required=True, no_log=True),
-            secret_key=dict(type="str", required=True, no_log=True),
+            name=dict(type="str", required=False),
+            url=dict(type="str", required=False),
+            access_key=dict(type="str", required=False, no_log=True),
+            secret_key=dict(type="str", required=False, no_log=True),
             state=dict(default="present", choices=["present", "absent"]),
+            aliases=dict(
+                type="list",
+                elements="dict",
+                required=False,
+                options=dict(
+                    name=dict(type="str", required=True),
+                    url=dict(type="str", required=False),
+                    access_key=dict(type="str", required=False, no_log=False),
+                    secret_key=dict(type="str", required=False, no_log=True),
+                    state=dict(
+                        type="str", required=False, choices=["present", "absent"]
+                    ),
+                ),
+            ),
+            backend=dict(type="str", default="mc", choices=["mc", "native"]),
+            config_dir=dict(
+                type="path",
+                required=False,
+                default="~/.mc",
+                fallback=(env_fallback, ["MC_CONFIG_DIR"]),
+            ),
         ),
         supports_check_mode=True,
+        mutually_exclusive=[("name", "aliases")],
+        required_one_of=[("name", "aliases")],
+        required_together=[("name", "url", "access_key", "secret_key")],
     )
 
     # Set LANG env since we parse stdout
@@ -146,8 +437,47 @@ def main():
     access_key = module.params["access_key"]
     secret_key = module.params["secret_key"]
     state = module.params["state"]
+    aliases = module.params["aliases"]
+    backend = module.params["backend"]
     changed = False
 
+    if aliases is not None or backend == "native":
+        if aliases is None:
+            aliases = [
+                dict(
+                    name=name,
+                    url=url,
+                    access_key=access_key,
+                    secret_key=secret_key,
+                    state=state,
+                )
+            ]
+
+        entries = {}
+        for alias in aliases:
+            entry = dict(alias, state=alias["state"] or state)
+            if entry["state"] != "absent" and not all(
+                entry[key] for key in ("url", "access_key", "secret_key")
+            ):
+                module.fail_json(
+                    msg="url, access_key and secret_key are required for alias %s"
+                    % entry["name"]
+                )
+            entries[entry["name"]] = entry
+
+        try:
+            if backend == "native":
+                results = native_reconcile(module, entries.values())
+            else:
+                results = mc_reconcile(module, entries.values())
+        except (IOError, OSError, ValueError) as e:
+            module.fail_json(msg="Failed to update aliases: %s" % to_native(e))
+
+        changed = any(result["changed"] for result in results)
+        if module.params["aliases"] is None:
+            module.exit_json(changed=changed)
+        module.exit_json(changed=changed, aliases=results, summary=summarize(results))
+
     record = alias_find(module, name)
 
     if record is not None:
@@ -164,14 +494,17 @@ def main():
                 sort_keys=True,
             )
             if current_str != new_str:
-                alias_create_or_update(module, name, url, access_key, secret_key)
+                if not module.check_mode:
+                    alias_create_or_update(module, name, url, access_key, secret_key)
                 changed = True
         else:
-            alias_delete(module, name)
+            if not module.check_mode:
+                alias_delete(module, name)
             changed = True
     else:
         if state == "present":
-            alias_create_or_update(module, name, url, access_key, secret_key)
+            if not module.check_mode:
+                alias_create_or_update(module, name, url, access_key, secret_key)
             changed = True
 
     module.exit_json(changed=changed)
@@ -0,0 +1,454 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright: Josh Williams <jdubz@dubzland.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = """
+---
+module: minio_benchmark
+short_description: Measures the performance of a Minio instance
+description:
+  - Runs a mixed workload of object PUT, GET, LIST and DELETE requests against a
+    bucket for a fixed duration, and reports the throughput and latency
+    percentiles of each operation.
+  - Objects are written below a unique prefix, spread over O(fanout) sub-prefixes,
+    and removed once the run completes.
+  - Only the Minio instance given in O(auth) is contacted, so the module can run
+    against a local single node instance without network access.
+author:
+  - Josh Williams (@t3hpr1m3)
+requirements:
+  - python >= 3.8
+  - minio >= 7.1.4
+attributes:
+  check_mode:
+    support: none
+    description: Can run in check_mode and return changed status prediction without modifying target.
+  diff_mode:
+    support: none
+    description: Will return details on what has changed (or possibly needs changing in check_mode), when in diff mode.
+options:
+  bucket:
+    type: str
+    required: true
+    description: Name of an existing bucket to run the benchmark in.
+  prefix:
+    type: str
+    default: minio-benchmark/
+    description: Prefix below which the unique prefix of each run is created.
+  duration:
+    type: float
+    default: 30
+    description: Seconds the workload runs for.
+  concurrency:
+    type: int
+    default: 8
+    description:
+      - Number of requests in flight at once.
+      - Consider raising O(auth.max_pool_size) to match.
+  operations:
+    type: dict
+    default: {}
+    description: Relative weight of each operation in the workload.
+    suboptions:
+      put:
+        type: int
+        default: 30
+        description: Weight of object uploads.
+      get:
+        type: int
+        default: 50
+        description: Weight of object downloads.
+      list:
+        type: int
+        default: 10
+        description: Weight of listings of a single sub-prefix.
+      delete:
+        type: int
+        default: 10
+        description: Weight of object removals.
+  object_sizes:
+    type: list
+    elements: dict
+    default: [ { size: 65536 } ]
+    description: Sizes of the uploaded objects, chosen according to their weight.
+    suboptions:
+      size:
+        type: int
+        required: true
+        description: Size of the object in bytes.
+      weight:
+        type: int
+        default: 1
+        description: Relative weight of this size.
+  fanout:
+    type: int
+    default: 16
+    description: Number of sub-prefixes the objects are spread over.
+  preload:
+    type: int
+    default: 100
+    description: Number of objects uploaded before the timed run, so there is data to read.
+  cleanup:
+    type: bool
+    default: true
+    description:
+      - Remove the objects written by the run once it completes.
+      - In a versioned bucket, every version and delete marker below the run's prefix
+        is removed.
+notes:
+  - Throughput is reported in decimal megabytes (1,000,000 bytes) per second.
+extends_documentation_fragment:
+  - dubzland.minio.minio_auth
+  - dubzland.minio.minio_controller
+"""
+
+EXAMPLES = """
+- name: Benchmark a Minio instance
+  dubzland.minio.minio_benchmark:
+    bucket: benchmark
+    duration: 60
+    concurrency: 32
+    operations:
+      put: 20
+      get: 70
+      list: 5
+      delete: 5
+    object_sizes:
+      - size: 4096
+        weight: 3
+      - size: 1048576
+    auth:
+      url: http://minio-server:9000
+      access_key: myuser
+      secret_key: supersekret
+      max_pool_size: 32
+  delegate_to: localhost
+  register: benchmark
+
+- name: Fail the deployment when GET latency regresses
+  ansible.builtin.assert:
+    that:
+      - benchmark.operations.get.latency_ms.p99 < 50
+      - benchmark.operations.put.ops_per_sec > 500
+"""
+
+RETURN = """
+prefix:
+  description: Prefix the objects of this run were written below.
+  returned: always
+  type: str
+  sample: minio-benchmark/3f2a1c9e/
+elapsed:
+  description: Seconds the timed run actually took.
+  returned: always
+  type: float
+  sample: 30.004
+operations:
+  description: Results of each operation in the workload.
+  returned: always
+  type: dict
+  contains:
+    ops:
+      description: Number of successful requests.
+      type: int
+    errors:
+      description: Number of failed requests.
+      type: int
+    error:
+      description: Message of the first failed request.
+      type: str
+      returned: when a request failed
+    ops_per_sec:
+      description: Successful requests per second.
+      type: float
+    mb_per_sec:
+      description: Megabytes transferred per second by successful requests.
+      type: float
+    latency_ms:
+      description: Latency of successful requests in milliseconds (min, mean, max, p50, p90, p99 and p999).
+      type: dict
+  sample:
+    get:
+      ops: 41235
+      errors: 0
+      ops_per_sec: 1374.5
+      mb_per_sec: 90.08
+      latency_ms: {min: 1.2, mean: 5.8, max: 48.1, p50: 5.1, p90: 8.9, p99: 17.3, p999: 31.0}
+removed:
+  description: Number of objects, object versions and delete markers removed during cleanup.
+  returned: when O(cleanup=true)
+  type: int
+  sample: 12840
+"""
+
+import io
+import itertools
+import os
+import random
+import threading
+import time
+import uuid
+
+from ansible_collections.dubzland.minio.plugins.module_utils.minio import (
+    minio_argument_spec,
+    minio_client,
+    minio_parallel,
+    minio_remove_objects,
+)
+from ansible_collections.dubzland.minio.plugins.module_utils.stats import (
+    latency_summary,
+)
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.common.text.converters import to_native
+
+OPERATIONS = ("put", "get", "list", "delete")
+
+
+class Workload:
+    """Issues benchmark requests, tracking the objects available to read."""
+
+    def __init__(self, client, bucket, prefix, fanout, sizes):
+        self.client = client
+        self.bucket = bucket
+        self.prefix = prefix
+        self.fanout = fanout
+        self.sizes = [entry["size"] for entry in sizes]
+        self.size_weights = [entry["weight"] for entry in sizes]
+        self.payload = os.urandom(max(self.sizes))
+        self.keys = []
+        self._lock = threading.Lock()
+        self._counter = itertools.count()
+
+    def shard(self, number):
+        return "%s%04d/" % (self.prefix, number % self.fanout)
+
+    def put(self, rng):
+        number = next(self._counter)
+        key = "%s%d" % (self.shard(number), number)
+        size = rng.choices(self.sizes, self.size_weights)[0]
+        self.client.put_object(self.bucket, key, io.BytesIO(self.payload[:size]), size)
+        with self._lock:
+            self.keys.append(key)
+        return size
+
+    def get(self, rng):
+        with self._lock:
+            if not self.keys:
+                return None
+            key = rng.choice(self.keys)
+
+        try:
+            response = self.client.get_object(self.bucket, key)
+        except Exception as e:
+            if getattr(e, "code", None) == "NoSuchKey":
+                # Removed by another worker after it was chosen
+                return None
+            raise
+
+        try:
+            return sum(len(chunk) for chunk in response.stream(1024 * 1024))
+        finally:
+            response.close()
+            response.release_conn()
+
+    def list(self, rng):
+        prefix = self.shard(rng.randrange(self.fanout))
+        for obj in self.client.list_objects(self.bucket, prefix=prefix):
+            pass
+        return 0
+
+    def delete(self, rng):
+        with self._lock:
+            if not self.keys:
+                return None
+            index = rng.randrange(len(self.keys))
+            self.keys[index], self.keys[-1] = self.keys[-1], self.keys[index]
+            key = self.keys.pop()
+
+        self.client.remove_object(self.bucket, key)
+        return 0
+
+
+def new_results():
+    return dict(
+        (op, dict(latencies=[], bytes=0, errors=0, error=None)) for op in OPERATIONS
+    )
+
+
+def run_worker(workload, mix, deadline, seed):
+    """Issue requests until the deadline, returning per-operation results.
+
+    Each worker keeps its own results, so recording a request never waits
+    on another worker.
+    """
+    rng = random.Random(seed)
+    ops = [op for op in OPERATIONS if mix[op]]
+    weights = [mix[op] for op in ops]
+    results = new_results()
+
+    while time.monotonic() < deadline:
+        op = rng.choices(ops, weights)[0]
+        start = time.monotonic()
+        try:
+            transferred = getattr(workload, op)(rng)
+        except Exception as e:
+            results[op]["errors"] += 1
+            if results[op]["error"] is None:
+                results[op]["error"] = to_native(e)
+            continue
+
+        if transferred is None:
+            # No object was available to read or remove
+            continue
+
+        results[op]["latencies"].append(time.monotonic() - start)
+        results[op]["bytes"] += transferred
+
+    return results
+
+
+def summarize(worker_results, elapsed):
+    operations = {}
+    for op in OPERATIONS:
+        latencies = []
+        transferred = 0
+        errors = 0
+        error = None
+        for results in worker_results:
+            latencies.extend(results[op]["latencies"])
+            transferred += results[op]["bytes"]
+            errors += results[op]["errors"]
+            error = error or results[op]["error"]
+
+        summary = dict(
+            ops=len(latencies),
+            errors=errors,
+            ops_per_sec=round(len(latencies) / elapsed, 2),
+            mb_per_sec=round(transferred / 1000000.0 / elapsed, 2),
+            latency_ms=latency_summary(latencies),
+        )
+        if error is not None:
+            summary["error"] = error
+        operations[op] = summary
+
+    return operations
+
+
+def module_args():
+    argument_spec = minio_argument_spec(
+        bucket=dict(type="str", required=True),
+        prefix=dict(type="str", required=False, default="minio-benchmark/"),
+        duration=dict(type="float", required=False, default=30),
+        concurrency=dict(type="int", required=False, default=8),
+        operations=dict(
+            type="dict",
+            required=False,
+            default={},
+            options=dict(
+                put=dict(type="int", default=30),
+                get=dict(type="int", default=50),
+                list=dict(type="int", default=10),
+                delete=dict(type="int", default=10),
+            ),
+        ),
+        object_sizes=dict(
+            type="list",
+            elements="dict",
+            required=False,
+            default=[dict(size=65536)],
+            options=dict(
+                size=dict(type="int", required=True),
+                weight=dict(type="int", default=1),
+            ),
+        ),
+        fanout=dict(type="int", required=False, default=16),
+        preload=dict(type="int", required=False, default=100),
+        cleanup=dict(type="bool", required=False, default=True),
+    )
+    return dict(argument_spec=argument_spec, supports_check_mode=False)
+
+
+def run_module(module):
+    bucket = module.params["bucket"]
+    concurrency = module.params["concurrency"]
+    mix = module.params["operations"]
+    sizes = module.params["object_sizes"]
+
+    if concurrency < 1 or module.params["fanout"] < 1:
+        module.fail_json(msg="concurrency and fanout must be at least 1")
+    if not any(mix[op] for op in OPERATIONS) or any(mix[op] < 0 for op in OPERATIONS):
+        module.fail_json(msg="operations must have non-negative weights, not all 0")
+    if any(entry["size"] < 0 or entry["weight"] < 1 for entry in sizes):
+        module.fail_json(
+            msg="object_sizes must have non-negative sizes and weights of at least 1"
+        )
+
+    prefix = module.params["prefix"]
+    if prefix and not prefix.endswith("/"):
+        prefix += "/"
+    prefix = "%s%s/" % (prefix, uuid.uuid4().hex[:8])
+
+    client = minio_client(module)
+    workload = Workload(client, bucket, prefix, module.params["fanout"], sizes)
+    result = dict(prefix=prefix)
+
+    try:
+        rng = random.Random()
+        minio_parallel(
+            lambda n: workload.put(rng), range(module.params["preload"]), concurrency
+        )
+
+        start = time.monotonic()
+        deadline = start + module.params["duration"]
+        worker_results = minio_parallel(
+            lambda n: run_worker(workload, mix, deadline, n),
+            range(concurrency),
+            concurrency,
+        )
+        elapsed = time.monotonic() - start
+    except Exception as e:
+        error = to_native(e)
+    else:
+        error = None
+        result.update(
+            elapsed=round(elapsed, 3),
+            operations=summarize(worker_results, elapsed),
+        )
+
+    changed = True
+    if module.params["cleanup"]:
+        try:
+            # Every version is removed, so nothing is left behind by the
+            # deletes and overwrites of the run in a versioned bucket
+            result["removed"] = minio_remove_objects(
+                client,
+                bucket,
+                client.list_objects(
+                    bucket, prefix=prefix, recursive=True, include_version=True
+                ),
+            )
+            changed = False
+        except Exception as e:
+            module.warn("Failed to remove the benchmark objects: %s" % to_native(e))
+
+    if error is not None:
+        module.fail_json(msg="Benchmark failed: %s" % error, changed=changed, **result)
+
+    module.exit_json(changed=changed, **result)
+
+
+def main():
+    module = AnsibleModule(**module_args())
+    run_module(module)
+
+
+if __name__ == "__main__":
+    main()
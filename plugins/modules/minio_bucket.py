@@ -17,6 +17,8 @@ description:
   - When the bucket does not exist, it will be created.
   - When the bucket does exist and O(state=absent), the bucket will be deleted.
   - When changes are made to the bucket, the bucket will be updated.
+  - When O(buckets) is given, every bucket in the list is reconciled against a
+    single listing of the buckets on the server.
 author:
   - Josh Williams (@t3hpr1m3)
 requirements:
@@ -32,8 +34,54 @@ attributes:
 options:
   name:
     type: str
-    required: true
-    description: Name of the bucket to be managed.
+    required: false
+    description:
+      - Name of the bucket to be managed.
+      - One of O(name) or O(buckets) is required.
+  buckets:
+    type: list
+    elements: dict
+    required: false
+    description:
+      - List of buckets to be managed in a single invocation.
+      - Mutually exclusive with O(name).
+    suboptions:
+      name:
+        type: str
+        required: true
+        description: Name of the bucket to be managed.
+      state:
+        type: str
+        required: false
+        choices: [ "present", "absent" ]
+        description: Desired state of this bucket.  Defaults to O(state).
+  force:
+    type: bool
+    default: false
+    description:
+      - When set to V(true), every object (including all versions and delete
+        markers) is removed before the bucket is deleted.
+      - Without it, removing a bucket which is not empty fails.
+      - Objects are removed in batches of up to 1000 keys, streamed from
+        listings of the shards of O(purge_prefixes), each shard purged by a
+        separate worker.
+  purge_prefixes:
+    type: list
+    elements: str
+    required: false
+    description:
+      - Prefixes the keys of a bucket are sharded by when O(force=true).
+      - Defaults to one shard for each ASCII letter and digit a key can start
+        with.  Keys outside of every shard are removed by a final pass.
+      - Prefixes covered by a shorter one in the list are ignored.
+  workers:
+    type: int
+    default: 8
+    description:
+      - Maximum number of buckets created or removed concurrently when using O(buckets).
+      - Maximum number of shards purged concurrently when O(force=true). When several
+        buckets are removed at once, the workers are split between them.
+      - Consider raising O(auth.max_pool_size) to match.
   state:
     description:
       - Indicates the desired bucket state.
@@ -46,7 +94,9 @@ seealso:
   - name: mc mb
     description: Documentation for the B(mc mb) command.
     link: https://min.io/docs/minio/linux/reference/minio-mc/mc-mb.html
-extends_documentation_fragment: dubzland.minio.minio_auth
+extends_documentation_fragment:
+  - dubzland.minio.minio_auth
+  - dubzland.minio.minio_controller
 """
 
 EXAMPLES = """
@@ -59,39 +109,279 @@ EXAMPLES = """
       secret_key: supersekret
     state: present
   delegate_to: localhost
+
+- name: Add many Minio buckets at once
+  dubzland.minio.minio_bucket:
+    buckets:
+      - name: tenant-a
+      - name: tenant-b
+      - name: tenant-old
+        state: absent
+    workers: 16
+    auth:
+      url: http://minio-server:9000
+      access_key: myuser
+      secret_key: supersekret
+  delegate_to: localhost
+
+- name: Remove a Minio bucket along with all of its objects
+  dubzland.minio.minio_bucket:
+    name: decommissioned
+    force: true
+    workers: 32
+    auth:
+      url: http://minio-server:9000
+      access_key: myuser
+      secret_key: supersekret
+    state: absent
+  delegate_to: localhost
+"""
+
+RETURN = """
+buckets:
+  description: Per-bucket results when O(buckets) is used.
+  returned: when O(buckets) is used
+  type: list
+  elements: dict
+  sample:
+    - name: tenant-a
+      state: present
+      action: create
+      changed: true
+purged:
+  description: Number of object versions removed before deleting the bucket(s).
+  returned: when O(force=true)
+  type: int
+  sample: 12345
+summary:
+  description: Number of buckets created, removed, unchanged and failed when O(buckets) is used.
+  returned: when O(buckets) is used
+  type: dict
+  sample:
+    created: 1
+    removed: 0
+    unchanged: 2
+    failed: 0
 """
 
 from ansible_collections.dubzland.minio.plugins.module_utils.minio import (
     minio_client,
     minio_argument_spec,
+    minio_parallel,
+    minio_remove_objects,
 )
 
+import string
+
 from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.common.text.converters import to_native
 
+# Characters object keys usually start with, each purged by its own worker
+PURGE_PREFIXES = list(string.ascii_letters + string.digits)
 
-def main():
+
+def purge_shards(prefixes):
+    """Return the sorted prefixes, without those covered by a shorter one."""
+    shards = []
+    for prefix in sorted(set(prefixes)):
+        if not shards or not prefix.startswith(shards[-1]):
+            shards.append(prefix)
+    return shards
+
+
+def purge_bucket(client, name, workers, prefixes=None):
+    """Remove every object version from the bucket.
+
+    The key space is split into shards by prefix, and each shard is streamed
+    into batched removals by its own worker, so no listing is buffered.  A
+    final pass removes the keys which no shard covered.
+    """
+
+    def purge_prefix(prefix):
+        return minio_remove_objects(
+            client,
+            name,
+            client.list_objects(
+                name, prefix=prefix, recursive=True, include_version=True
+            ),
+        )
+
+    shards = purge_shards(prefixes or PURGE_PREFIXES)
+    removed = sum(minio_parallel(purge_prefix, shards, workers))
+    if shards != [""]:
+        removed += purge_prefix("")
+
+    return removed
+
+
+def purge_workers(workers, removals):
+    """Shard workers for each of removals buckets purged concurrently.
+
+    The workers are split between the buckets, so the nested pools together
+    use about as many connections as a single pool of workers would.
+    """
+    return max(1, workers // max(1, min(workers, removals)))
+
+
+def remove_bucket(client, name, force, workers, prefixes=None):
+    purged = 0
+    if force:
+        purged = purge_bucket(client, name, workers, prefixes)
+
+    client.remove_bucket(name)
+
+    return purged
+
+
+def plan_buckets(existing, buckets, default_state):
+    """Compute the action required for each requested bucket.
+
+    existing is the set of bucket names currently on the server.  Later
+    entries for the same bucket name take precedence.
+    """
+    desired = {}
+    for bucket in buckets:
+        desired[bucket["name"]] = bucket["state"] or default_state
+
+    plan = []
+    for name, state in desired.items():
+        action = None
+        if state == "present" and name not in existing:
+            action = "create"
+        elif state == "absent" and name in existing:
+            action = "remove"
+        plan.append({"name": name, "state": state, "action": action})
+
+    return plan
+
+
+def apply_bucket(client, entry, check_mode, force, workers, prefixes=None):
+    result = dict(entry, changed=entry["action"] is not None)
+
+    if check_mode or entry["action"] is None:
+        return result
+
+    try:
+        if entry["action"] == "create":
+            client.make_bucket(entry["name"])
+        else:
+            result["purged"] = remove_bucket(
+                client, entry["name"], force, workers, prefixes
+            )
+    except Exception as e:
+        result.update(changed=False, failed=True, msg=to_native(e))
+
+    return result
+
+
+def reconcile_buckets(module, client, buckets, state, force, workers, prefixes=None):
+    existing = set(bucket.name for bucket in client.list_buckets())
+    plan = plan_buckets(existing, buckets, state)
+
+    shard_workers = purge_workers(
+        workers, sum(1 for entry in plan if entry["action"] == "remove")
+    )
+    results = minio_parallel(
+        lambda entry: apply_bucket(
+            client, entry, module.check_mode, force, shard_workers, prefixes
+        ),
+        plan,
+        workers,
+    )
+
+    summary = dict(created=0, removed=0, unchanged=0, failed=0)
+    for result in results:
+        if result.get("failed"):
+            summary["failed"] += 1
+        elif result["action"] == "create":
+            summary["created"] += 1
+        elif result["action"] == "remove":
+            summary["removed"] += 1
+        else:
+            summary["unchanged"] += 1
+
+    return results, summary
+
+
+def module_args():
     argument_spec = minio_argument_spec(
-        name=dict(type="str", required=True),
+        name=dict(type="str", required=False),
+        buckets=dict(
+            type="list",
+            elements="dict",
+            required=False,
+            options=dict(
+                name=dict(type="str", required=True),
+                state=dict(type="str", required=False, choices=["present", "absent"]),
+            ),
+        ),
+        force=dict(type="bool", required=False, default=False),
+        purge_prefixes=dict(type="list", elements="str", required=False),
+        workers=dict(type="int", required=False, default=8),
         state=dict(default="present", choices=["present", "absent"]),
     )
-    module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True)
+    return dict(
+        argument_spec=argument_spec,
+        supports_check_mode=True,
+        mutually_exclusive=[("name", "buckets")],
+        required_one_of=[("name", "buckets")],
+    )
+
 
+def run_module(module):
     name = module.params["name"]
+    buckets = module.params["buckets"]
+    force = module.params["force"]
+    workers = module.params["workers"]
+    prefixes = module.params["purge_prefixes"]
     state = module.params["state"]
 
     changed = False
+    result = {}
 
     client = minio_client(module)
 
+    if buckets is not None:
+        results, summary = reconcile_buckets(
+            module, client, buckets, state, force, workers, prefixes
+        )
+        changed = any(result["changed"] for result in results)
+        if force:
+            result["purged"] = sum(r.get("purged", 0) for r in results)
+        if summary["failed"]:
+            module.fail_json(
+                msg="Failed to reconcile %d bucket(s)" % summary["failed"],
+                changed=changed,
+                buckets=results,
+                summary=summary,
+                **result
+            )
+        module.exit_json(changed=changed, buckets=results, summary=summary, **result)
+
     if client.bucket_exists(name):
-        if state == "present":
-            pass
+        if state == "absent":
+            if not module.check_mode:
+                try:
+                    purged = remove_bucket(client, name, force, workers, prefixes)
+                except Exception as e:
+                    module.fail_json(
+                        msg="Failed to remove bucket %s: %s" % (name, to_native(e))
+                    )
+                if force:
+                    result["purged"] = purged
+            changed = True
     else:
         if state == "present":
-            client.make_bucket(name)
+            if not module.check_mode:
+                client.make_bucket(name)
             changed = True
 
-    module.exit_json(changed=changed)
+    module.exit_json(changed=changed, **result)
+
+
+def main():
+    module = AnsibleModule(**module_args())
+    run_module(module)
 
 
 if __name__ == "__main__":
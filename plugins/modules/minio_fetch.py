@@ -0,0 +1,347 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright: Josh Williams <jdubz@dubzland.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = """
+---
+module: minio_fetch
+short_description: Downloads an object from a Minio bucket
+description:
+  - Downloads an object to a file on the managed host.
+  - The object is fetched with up to O(workers) concurrent ranged requests, each
+    written directly into its place in a preallocated C(.part) file next to O(dest).
+    Memory use is bounded by O(workers), not by the size of the object.
+  - Completed ranges are recorded as they finish, so an interrupted download is
+    resumed by running the task again.
+  - When O(dest) already has the size and ETag of the object, nothing is downloaded.
+author:
+  - Josh Williams (@t3hpr1m3)
+requirements:
+  - python >= 3.8
+  - minio >= 7.1.4
+attributes:
+  check_mode:
+    support: full
+    description: Can run in check_mode and return changed status prediction without modifying target.
+  diff_mode:
+    support: none
+    description: Will return details on what has changed (or possibly needs changing in check_mode), when in diff mode.
+options:
+  bucket:
+    type: str
+    required: true
+    description: Name of the bucket containing the object.
+  object:
+    type: str
+    required: true
+    description: Name (key) of the object to download.
+  version_id:
+    type: str
+    required: false
+    description: Version of the object to download. Defaults to the latest version.
+  dest:
+    type: path
+    required: true
+    description: Path of the file to write the object to.
+  part_size:
+    type: int
+    default: 16777216
+    description: Size in bytes of each ranged request.
+  workers:
+    type: int
+    default: 4
+    description: Maximum number of ranges downloaded, or hashed, concurrently.
+  force:
+    type: bool
+    default: false
+    description: Download the object even when O(dest) already matches it.
+  verify:
+    type: bool
+    default: true
+    description:
+      - Compare the ETag of the downloaded file with the ETag of the object before
+        moving it into place.
+      - Objects encrypted with SSE-KMS or SSE-C do not have MD5 based ETags, and must
+        be downloaded with O(verify=false).
+notes:
+  - The ETag of multipart objects is reproduced locally by reading the size of their
+    first part with a HEAD request.
+seealso:
+  - module: ansible.builtin.get_url
+extends_documentation_fragment:
+  - dubzland.minio.minio_auth
+  - ansible.builtin.files
+"""
+
+EXAMPLES = """
+- name: Download a release artifact
+  dubzland.minio.minio_fetch:
+    bucket: releases
+    object: myapp/1.2.0/myapp.tar.gz
+    dest: /opt/myapp/myapp.tar.gz
+    workers: 8
+    mode: "0644"
+    auth:
+      url: http://minio-server:9000
+      access_key: myuser
+      secret_key: supersekret
+"""
+
+RETURN = """
+dest:
+  description: Path of the downloaded file.
+  returned: always
+  type: str
+  sample: /opt/myapp/myapp.tar.gz
+etag:
+  description: ETag of the object.
+  returned: always
+  type: str
+  sample: 9b2cf535f27731c974343645a3985328-3
+size:
+  description: Size of the object in bytes.
+  returned: always
+  type: int
+  sample: 50331648
+resumed:
+  description: Number of bytes reused from an earlier, interrupted download.
+  returned: when the object was downloaded
+  type: int
+  sample: 33554432
+"""
+
+import json
+import os
+import tempfile
+import threading
+
+from ansible_collections.dubzland.minio.plugins.module_utils.minio import (
+    minio_argument_spec,
+    minio_client,
+    minio_parallel,
+)
+from ansible_collections.dubzland.minio.plugins.module_utils.transfer import (
+    DEFAULT_PART_SIZE,
+    READ_SIZE,
+    file_etag,
+    object_part_size,
+    part_ranges,
+)
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.common.text.converters import to_native
+
+
+class FetchState:
+    """Records which ranges of a partial download have been written.
+
+    The record is only trusted while the object's ETag and size, and the
+    range size, are the same as when the download started.
+    """
+
+    def __init__(self, path, etag, size, part_size):
+        self.path = path
+        self.identity = dict(etag=etag, size=size, part_size=part_size)
+        self.done = set()
+        self._lock = threading.Lock()
+
+    def load(self):
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (IOError, OSError, ValueError):
+            return
+
+        if all(data.get(key) == value for key, value in self.identity.items()):
+            self.done = set(data.get("done", []))
+
+    def mark(self, index):
+        with self._lock:
+            self.done.add(index)
+            self._save()
+
+    def remove(self):
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def _save(self):
+        fd, tmp = tempfile.mkstemp(
+            dir=os.path.dirname(self.path) or ".", prefix=".minio_fetch."
+        )
+        with os.fdopen(fd, "w") as f:
+            json.dump(dict(self.identity, done=sorted(self.done)), f)
+        os.replace(tmp, self.path)
+
+
+def write_response(fd, response, offset):
+    """Write a streamed response into fd at offset, returning the end position."""
+    for chunk in response.stream(READ_SIZE):
+        view = memoryview(chunk)
+        while view:
+            written = os.pwrite(fd, view, offset)
+            view = view[written:]
+            offset += written
+
+    return offset
+
+
+def download(client, bucket, name, stat, path, state, part_size, workers):
+    """Fill path with the object, fetching only the ranges not in state.
+
+    Returns the number of bytes reused from an earlier download.
+    """
+    ranges = list(part_ranges(stat.size, part_size)) if stat.size else []
+
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o666)
+    try:
+        if os.fstat(fd).st_size != stat.size:
+            state.done = set()
+        if not state.done:
+            os.ftruncate(fd, stat.size)
+            if stat.size and hasattr(os, "posix_fallocate"):
+                try:
+                    os.posix_fallocate(fd, 0, stat.size)
+                except OSError:
+                    # Not supported by every filesystem, the file is sparse instead
+                    pass
+
+        resumed = sum(ranges[index][1] for index in state.done)
+
+        if stat.version_id:
+            kwargs = dict(version_id=stat.version_id)
+        else:
+            kwargs = dict(request_headers={"If-Match": '"%s"' % stat.etag})
+
+        def fetch(index):
+            offset, length = ranges[index]
+            response = client.get_object(
+                bucket, name, offset=offset, length=length, **kwargs
+            )
+            try:
+                end = write_response(fd, response, offset)
+            finally:
+                response.close()
+                response.release_conn()
+
+            if end != offset + length:
+                raise IOError(
+                    "expected %d bytes at offset %d, received %d"
+                    % (length, offset, end - offset)
+                )
+
+            # The range must be on disk before it is recorded as done
+            os.fsync(fd)
+            state.mark(index)
+
+        pending = [index for index in range(len(ranges)) if index not in state.done]
+        minio_parallel(fetch, pending, workers)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+    return resumed
+
+
+def module_args():
+    argument_spec = minio_argument_spec(
+        bucket=dict(type="str", required=True),
+        object=dict(type="str", required=True),
+        version_id=dict(type="str", required=False),
+        dest=dict(type="path", required=True),
+        part_size=dict(type="int", required=False, default=DEFAULT_PART_SIZE),
+        workers=dict(type="int", required=False, default=4),
+        force=dict(type="bool", required=False, default=False),
+        verify=dict(type="bool", required=False, default=True),
+    )
+    return dict(
+        argument_spec=argument_spec,
+        supports_check_mode=True,
+        add_file_common_args=True,
+    )
+
+
+def run_module(module):
+    bucket = module.params["bucket"]
+    name = module.params["object"]
+    dest = module.params["dest"]
+    part_size = module.params["part_size"]
+    workers = module.params["workers"]
+
+    if part_size < 1:
+        module.fail_json(msg="part_size must be a positive number of bytes")
+
+    client = minio_client(module)
+
+    try:
+        stat = client.stat_object(bucket, name, version_id=module.params["version_id"])
+        etag_part_size = object_part_size(client, bucket, name, stat)
+    except Exception as e:
+        module.fail_json(
+            msg="Failed to stat object %s/%s: %s" % (bucket, name, to_native(e))
+        )
+
+    result = dict(dest=dest, etag=stat.etag, size=stat.size)
+
+    def matches(path):
+        return file_etag(path, etag_part_size, workers) == stat.etag
+
+    changed = True
+    if (
+        not module.params["force"]
+        and os.path.isfile(dest)
+        and os.path.getsize(dest) == stat.size
+    ):
+        try:
+            changed = not matches(dest)
+        except (IOError, OSError) as e:
+            module.fail_json(msg="Failed to read %s: %s" % (dest, to_native(e)))
+
+    if changed and not module.check_mode:
+        part = dest + ".part"
+        state = FetchState(part + ".json", stat.etag, stat.size, part_size)
+        if os.path.exists(part):
+            state.load()
+
+        try:
+            result["resumed"] = download(
+                client, bucket, name, stat, part, state, part_size, workers
+            )
+        except Exception as e:
+            module.fail_json(
+                msg="Failed to download %s/%s, run the task again to resume: %s"
+                % (bucket, name, to_native(e)),
+                **result
+            )
+
+        if module.params["verify"] and not matches(part):
+            os.unlink(part)
+            state.remove()
+            module.fail_json(
+                msg="Downloaded file does not match the ETag of %s/%s" % (bucket, name),
+                **result
+            )
+
+        os.replace(part, dest)
+        state.remove()
+
+    if os.path.exists(dest):
+        file_args = module.load_file_common_arguments(module.params, path=dest)
+        changed = module.set_fs_attributes_if_different(file_args, changed)
+
+    module.exit_json(changed=changed, **result)
+
+
+def main():
+    module = AnsibleModule(**module_args())
+    run_module(module)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright: Josh Williams <jdubz@dubzland.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = """
+---
+module: minio_health
+short_description: Waits for a Minio server to become healthy
+description:
+  - Polls the unauthenticated health endpoints of a Minio server until all of
+    O(checks) pass, backing off exponentially between attempts, or fails once
+    O(timeout) expires.
+  - Meant to gate tasks which talk to a server which was just started or
+    restarted, and which would otherwise fail while it is still initializing.
+author:
+  - Josh Williams (@t3hpr1m3)
+requirements:
+  - python >= 3.8
+attributes:
+  check_mode:
+    support: full
+    description: Can run in check_mode and return changed status prediction without modifying target.
+  diff_mode:
+    support: none
+    description: Will return details on what has changed (or possibly needs changing in check_mode), when in diff mode.
+options:
+  url:
+    type: str
+    required: true
+    description: Minio Server URL, such as V(http://localhost:9000).
+  checks:
+    type: list
+    elements: str
+    default: [ "ready" ]
+    choices: [ "live", "ready", "cluster", "cluster_read" ]
+    description:
+      - Health checks which must pass.
+      - V(live) passes once the server process responds, V(ready) once it
+        accepts requests.
+      - V(cluster) passes once the erasure sets of a distributed deployment
+        have write quorum, V(cluster_read) once they have read quorum.
+  maintenance:
+    type: bool
+    default: false
+    description:
+      - Makes the V(cluster) check only pass when taking this server offline
+        would keep write quorum.
+  wait_for_heal:
+    type: bool
+    default: false
+    description:
+      - Makes the V(cluster) check only pass once no drive is being healed.
+  timeout:
+    type: float
+    default: 300
+    description: Seconds to wait for the checks to pass.
+  delay:
+    type: float
+    default: 1
+    description: Seconds to wait after the first failed attempt, doubled after each one.
+  max_delay:
+    type: float
+    default: 30
+    description: Longest wait between two attempts, in seconds.
+  request_timeout:
+    type: float
+    default: 5
+    description: Seconds to wait for each health endpoint to respond.
+  validate_certs:
+    type: bool
+    default: true
+    description: When set to V(false), SSL certificates will not be validated.
+  ca_cert:
+    type: path
+    required: false
+    description: CA bundle used to validate the Minio server certificate.
+seealso:
+  - name: Healthcheck API
+    description: Documentation for the Minio health endpoints.
+    link: https://min.io/docs/minio/linux/operations/monitoring/healthcheck-probe.html
+"""
+
+EXAMPLES = """
+- name: Wait for a single node to accept requests
+  dubzland.minio.minio_health:
+    url: http://localhost:9000
+
+- name: Wait for a distributed deployment to have write quorum
+  dubzland.minio.minio_health:
+    url: http://localhost:9000
+    checks:
+      - ready
+      - cluster
+    timeout: 600
+
+- name: Wait until this node can be restarted without losing write quorum
+  dubzland.minio.minio_health:
+    url: http://localhost:9000
+    checks:
+      - cluster
+    maintenance: true
+    wait_for_heal: true
+"""
+
+RETURN = """
+checks:
+  description: Result of the last attempt of each check.
+  returned: always
+  type: dict
+  contains:
+    status:
+      description: HTTP status returned by the endpoint, null when it could not be reached.
+      type: int
+    error:
+      description: Why the endpoint could not be reached.
+      returned: when the endpoint could not be reached
+      type: str
+    write_quorum:
+      description: Drives needed in each erasure set to write objects.
+      returned: by the V(cluster) check
+      type: int
+    healing_drives:
+      description: Drives being healed.
+      returned: by the V(cluster) check, when drives are being healed
+      type: int
+  sample:
+    ready:
+      status: 200
+    cluster:
+      status: 200
+      write_quorum: 12
+attempts:
+  description: Number of times the checks were made.
+  returned: always
+  type: int
+  sample: 3
+elapsed:
+  description: Seconds spent waiting for the checks to pass.
+  returned: always
+  type: float
+  sample: 7.02
+"""
+
+import time
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.common.text.converters import to_native
+from ansible.module_utils.six.moves.urllib.error import HTTPError, URLError
+from ansible.module_utils.urls import open_url
+
+HEALTH_CHECKS = dict(
+    live="/minio/health/live",
+    ready="/minio/health/ready",
+    cluster="/minio/health/cluster",
+    cluster_read="/minio/health/cluster/read",
+)
+
+HEALTH_HEADERS = dict(
+    write_quorum="X-Minio-Write-Quorum",
+    healing_drives="X-Minio-Healing-Drives",
+)
+
+
+def module_args():
+    return dict(
+        argument_spec=dict(
+            url=dict(type="str", required=True),
+            checks=dict(
+                type="list",
+                elements="str",
+                required=False,
+                default=["ready"],
+                choices=list(HEALTH_CHECKS),
+            ),
+            maintenance=dict(type="bool", required=False, default=False),
+            wait_for_heal=dict(type="bool", required=False, default=False),
+            timeout=dict(type="float", required=False, default=300),
+            delay=dict(type="float", required=False, default=1),
+            max_delay=dict(type="float", required=False, default=30),
+            request_timeout=dict(type="float", required=False, default=5),
+            validate_certs=dict(type="bool", required=False, default=True),
+            ca_cert=dict(type="path", required=False),
+        ),
+        supports_check_mode=True,
+    )
+
+
+def health_check(module, check):
+    """Call the endpoint of check once, returning its status and health headers."""
+    url = module.params["url"].rstrip("/") + HEALTH_CHECKS[check]
+    if check == "cluster" and module.params["maintenance"]:
+        url += "?maintenance=true"
+
+    try:
+        response = open_url(
+            url,
+            method="GET",
+            timeout=module.params["request_timeout"],
+            validate_certs=module.params["validate_certs"],
+            ca_path=module.params["ca_cert"],
+        )
+        status, headers = response.getcode(), response.headers
+    except HTTPError as e:
+        status, headers = e.code, e.headers
+    except (URLError, IOError, OSError) as e:
+        return dict(status=None, error=to_native(getattr(e, "reason", e)))
+
+    result = dict(status=status)
+    for key, header in HEALTH_HEADERS.items():
+        value = headers.get(header)
+        if value is not None:
+            result[key] = int(value)
+    return result
+
+
+def check_failure(module, result):
+    """Describe why a check failed, or return None when it passed."""
+    if result["status"] is None:
+        return result["error"]
+    if result["status"] != 200:
+        return "HTTP %d" % result["status"]
+    if module.params["wait_for_heal"] and result.get("healing_drives"):
+        return "%d drives healing" % result["healing_drives"]
+    return None
+
+
+def run_module(module):
+    started = time.monotonic()
+    deadline = started + module.params["timeout"]
+    delay = module.params["delay"]
+    attempts = 0
+
+    while True:
+        attempts += 1
+        checks = dict(
+            (check, health_check(module, check)) for check in module.params["checks"]
+        )
+        failures = [
+            "%s: %s" % (check, failure)
+            for check, failure in (
+                (check, check_failure(module, checks[check]))
+                for check in module.params["checks"]
+            )
+            if failure is not None
+        ]
+
+        result = dict(
+            changed=False,
+            checks=checks,
+            attempts=attempts,
+            elapsed=round(time.monotonic() - started, 3),
+        )
+        if not failures:
+            module.exit_json(**result)
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            module.fail_json(
+                msg="Minio at %s was not healthy after %d seconds (%s)"
+                % (module.params["url"], module.params["timeout"], ", ".join(failures)),
+                **result
+            )
+
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, module.params["max_delay"])
+
+
+def main():
+    module = AnsibleModule(**module_args())
+    run_module(module)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright: Josh Williams <jdubz@dubzland.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = """
+---
+module: minio_info
+short_description: Gathers information about a Minio instance
+description:
+  - Gathers the buckets, users, groups, policies, policy mappings and server
+    information of a Minio instance in a single invocation.
+  - Each subset is retrieved concurrently.
+  - The results are keyed by name, so later tasks can test for membership
+    instead of querying the server again.
+author:
+  - Josh Williams (@t3hpr1m3)
+requirements:
+  - python >= 3.8
+  - minio >= 7.1.4
+attributes:
+  check_mode:
+    support: full
+    description: Can run in check_mode and return changed status prediction without modifying target.
+  diff_mode:
+    support: none
+    description: Will return details on what has changed (or possibly needs changing in check_mode), when in diff mode.
+options:
+  gather_subset:
+    type: list
+    elements: str
+    default: [ "all" ]
+    choices: [ "all", "buckets", "users", "groups", "policies", "policy_mappings", "server" ]
+    description:
+      - Restricts the information gathered to the given subsets.
+      - V(policy_mappings) also requires the users and groups to be listed, but only
+        returns them when they are gathered as well.
+  workers:
+    type: int
+    default: 8
+    description: Maximum number of requests issued concurrently.
+notes:
+  - The O(auth.access_key) provided must have permission to list the requested information.
+extends_documentation_fragment:
+  - dubzland.minio.minio_auth
+  - dubzland.minio.minio_controller
+"""
+
+EXAMPLES = """
+- name: Gather information about the Minio server
+  dubzland.minio.minio_info:
+    gather_subset:
+      - buckets
+      - users
+    auth:
+      url: http://minio-server:9000
+      access_key: myuser
+      secret_key: supersekret
+  delegate_to: localhost
+  register: minio
+
+- name: Add the bucket when it is missing
+  dubzland.minio.minio_bucket:
+    name: testbucket
+    auth:
+      url: http://minio-server:9000
+      access_key: myuser
+      secret_key: supersekret
+  delegate_to: localhost
+  when: "'testbucket' not in minio.buckets"
+"""
+
+RETURN = """
+buckets:
+  description: Buckets on the server, keyed by name.
+  returned: when V(buckets) is gathered
+  type: dict
+  sample:
+    testbucket:
+      creation_date: "2024-04-27T12:00:00+00:00"
+users:
+  description: Users on the server, keyed by access key.
+  returned: when V(users) is gathered
+  type: dict
+  sample:
+    testuser:
+      policyName: readwrite
+      status: enabled
+groups:
+  description: Groups on the server, keyed by name.
+  returned: when V(groups) is gathered
+  type: dict
+  sample:
+    developers:
+      members: [testuser]
+      policy: readwrite
+      status: enabled
+policies:
+  description: Policy documents on the server, keyed by name.
+  returned: when V(policies) is gathered
+  type: dict
+  sample:
+    readonly:
+      Version: "2012-10-17"
+      Statement:
+        - Effect: Allow
+          Action: ["s3:GetObject"]
+          Resource: ["arn:aws:s3:::*"]
+policy_mappings:
+  description: Users and groups each policy is attached to.
+  returned: when V(policy_mappings) is gathered
+  type: dict
+  sample:
+    readwrite:
+      users: [testuser]
+      groups: [developers]
+server:
+  description: Server information, as returned by B(mc admin info).
+  returned: when V(server) is gathered
+  type: dict
+"""
+
+import json
+
+from ansible_collections.dubzland.minio.plugins.module_utils.minio import (
+    minio_admin_client,
+    minio_argument_spec,
+    minio_client,
+    minio_parallel,
+)
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.common.text.converters import to_native
+
+SUBSETS = ["buckets", "users", "groups", "policies", "policy_mappings", "server"]
+
+
+def gather_buckets(client, workers):
+    return dict(
+        (
+            bucket.name,
+            {
+                "creation_date": (
+                    bucket.creation_date.isoformat() if bucket.creation_date else None
+                )
+            },
+        )
+        for bucket in client.list_buckets()
+    )
+
+
+def gather_users(admin_client, workers):
+    return json.loads(admin_client.user_list()) or {}
+
+
+def gather_groups(admin_client, workers):
+    names = json.loads(admin_client.group_list()) or []
+    groups = minio_parallel(
+        lambda name: json.loads(admin_client.group_info(name)), names, workers
+    )
+    return dict(zip(names, groups))
+
+
+def gather_policies(admin_client, workers):
+    return json.loads(admin_client.policy_list()) or {}
+
+
+def gather_server(admin_client, workers):
+    return json.loads(admin_client.info())
+
+
+def policy_names(value):
+    if not value:
+        return []
+    return [name for name in value.split(",") if name]
+
+
+def policy_mappings(users, groups):
+    mappings = {}
+    for kind, entities, key in (
+        ("users", users, "policyName"),
+        ("groups", groups, "policy"),
+    ):
+        for name, entity in sorted(entities.items()):
+            for policy in policy_names(entity.get(key)):
+                mapping = mappings.setdefault(policy, {"users": [], "groups": []})
+                mapping[kind].append(name)
+
+    return mappings
+
+
+def module_args():
+    argument_spec = minio_argument_spec(
+        gather_subset=dict(
+            type="list",
+            elements="str",
+            default=["all"],
+            choices=["all"] + SUBSETS,
+        ),
+        workers=dict(type="int", required=False, default=8),
+    )
+    return dict(argument_spec=argument_spec, supports_check_mode=True)
+
+
+def run_module(module):
+    workers = module.params["workers"]
+    subsets = set(module.params["gather_subset"])
+    if "all" in subsets:
+        subsets = set(SUBSETS)
+
+    gather = set(subsets)
+    if "policy_mappings" in gather:
+        gather.update(["users", "groups"])
+        gather.discard("policy_mappings")
+
+    client = minio_client(module) if "buckets" in gather else None
+    admin_client = minio_admin_client(module) if gather - set(["buckets"]) else None
+
+    gatherers = {
+        "buckets": lambda: gather_buckets(client, workers),
+        "users": lambda: gather_users(admin_client, workers),
+        "groups": lambda: gather_groups(admin_client, workers),
+        "policies": lambda: gather_policies(admin_client, workers),
+        "server": lambda: gather_server(admin_client, workers),
+    }
+
+    def run(subset):
+        try:
+            return gatherers[subset](), None
+        except Exception as e:
+            return None, to_native(e)
+
+    names = sorted(gather)
+    facts = {}
+    for subset, (result, error) in zip(names, minio_parallel(run, names, workers)):
+        if error is not None:
+            module.fail_json(msg="Failed to gather %s: %s" % (subset, error))
+        facts[subset] = result
+
+    if "policy_mappings" in subsets:
+        facts["policy_mappings"] = policy_mappings(facts["users"], facts["groups"])
+
+    module.exit_json(
+        changed=False, **dict((subset, facts[subset]) for subset in subsets)
+    )
+
+
+def main():
+    module = AnsibleModule(**module_args())
+    run_module(module)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,328 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright: Josh Williams <jdubz@dubzland.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = """
+---
+module: minio_object
+short_description: Manages objects in a Minio bucket
+description:
+  - Uploads a file or in-memory content to a Minio bucket, or removes an object.
+  - Files larger than O(part_size) are uploaded in parts, with up to O(workers)
+    parts in flight at once.
+  - Before uploading, the ETag the object would have is computed locally and
+    compared with the existing object, so unchanged objects are skipped after a
+    single HEAD request.
+author:
+  - Josh Williams (@t3hpr1m3)
+requirements:
+  - python >= 3.8
+  - minio >= 7.1.4
+attributes:
+  check_mode:
+    support: full
+    description: Can run in check_mode and return changed status prediction without modifying target.
+  diff_mode:
+    support: none
+    description: Will return details on what has changed (or possibly needs changing in check_mode), when in diff mode.
+options:
+  bucket:
+    type: str
+    required: true
+    description: Name of the bucket containing the object.
+  object:
+    type: str
+    required: true
+    description: Name (key) of the object to be managed.
+  src:
+    type: path
+    required: false
+    description:
+      - Path of the file to upload.
+      - Mutually exclusive with O(content).
+  content:
+    type: str
+    required: false
+    description:
+      - Content to upload, without writing it to a temporary file.
+      - Mutually exclusive with O(src).
+  content_type:
+    type: str
+    required: false
+    default: application/octet-stream
+    description: Content type stored with the object when it is uploaded.
+  metadata:
+    type: dict
+    required: false
+    description: User metadata stored with the object when it is uploaded.
+  part_size:
+    type: int
+    default: 16777216
+    description:
+      - Size in bytes of each part of a multipart upload, between 5 MiB and 5 GiB.
+      - Objects no larger than this are uploaded with a single request.
+      - The ETag comparison assumes the existing object was uploaded with the same
+        part size. Changing it causes unchanged objects to be uploaded once more.
+  workers:
+    type: int
+    default: 4
+    description:
+      - Maximum number of parts uploaded, or hashed, concurrently.
+      - Each uploading worker holds one part in memory.
+  overwrite:
+    type: str
+    default: different
+    choices: [ "always", "different", "never" ]
+    description:
+      - V(different) uploads only when the object is missing, or its ETag or size differs.
+      - V(always) uploads even when the object is unchanged.
+      - V(never) uploads only when the object is missing.
+  state:
+    description:
+      - Indicates the desired object state.
+      - V(present) ensures the object is present, uploading O(src) or O(content).
+      - V(absent) ensures the object is absent.
+    default: present
+    choices: [ "present", "absent" ]
+    type: str
+notes:
+  - Only the object content is compared, changes to O(content_type) or O(metadata)
+    alone do not cause an upload.
+  - Objects encrypted with SSE-KMS or SSE-C do not have MD5 based ETags, and are
+    always considered changed.
+seealso:
+  - name: mc cp
+    description: Documentation for the B(mc cp) command.
+    link: https://min.io/docs/minio/linux/reference/minio-mc/mc-cp.html
+extends_documentation_fragment:
+  - dubzland.minio.minio_auth
+  - dubzland.minio.minio_controller
+"""
+
+EXAMPLES = """
+- name: Upload a release artifact
+  dubzland.minio.minio_object:
+    bucket: releases
+    object: myapp/1.2.0/myapp.tar.gz
+    src: /build/myapp.tar.gz
+    part_size: 67108864
+    workers: 8
+    auth:
+      url: http://minio-server:9000
+      access_key: myuser
+      secret_key: supersekret
+  delegate_to: localhost
+
+- name: Store generated content
+  dubzland.minio.minio_object:
+    bucket: releases
+    object: myapp/latest
+    content: "1.2.0"
+    content_type: text/plain
+    auth:
+      url: http://minio-server:9000
+      access_key: myuser
+      secret_key: supersekret
+  delegate_to: localhost
+
+- name: Remove an object
+  dubzland.minio.minio_object:
+    bucket: releases
+    object: myapp/0.9.0/myapp.tar.gz
+    auth:
+      url: http://minio-server:9000
+      access_key: myuser
+      secret_key: supersekret
+    state: absent
+  delegate_to: localhost
+"""
+
+RETURN = """
+etag:
+  description: ETag of the object.
+  returned: when O(state=present), unless the object would be uploaded in check mode
+  type: str
+  sample: 9b2cf535f27731c974343645a3985328-3
+size:
+  description: Size of the object in bytes.
+  returned: when O(state=present)
+  type: int
+  sample: 50331648
+version_id:
+  description: Version of the uploaded object, when versioning is enabled on the bucket.
+  returned: when the object was uploaded
+  type: str
+  sample: 3d7b9a2e-6c1f-4a8e-9f4b-0e5c2d1a7b6c
+"""
+
+import io
+import os
+
+from ansible_collections.dubzland.minio.plugins.module_utils.minio import (
+    minio_argument_spec,
+    minio_client,
+)
+from ansible_collections.dubzland.minio.plugins.module_utils.transfer import (
+    DEFAULT_PART_SIZE,
+    bytes_etag,
+    file_etag,
+    object_part_size,
+    object_stat,
+    validate_part_size,
+)
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.common.text.converters import to_bytes, to_native
+
+
+def needs_upload(stat, size, etag, overwrite):
+    """Whether an object described by stat must be replaced.
+
+    etag is a callable, so the local ETag is only computed once the cheaper
+    checks have passed.
+    """
+    if stat is None or overwrite == "always":
+        return True
+    if overwrite == "never":
+        return False
+    if stat.size != size:
+        return True
+    return stat.etag != etag()
+
+
+def module_args():
+    argument_spec = minio_argument_spec(
+        bucket=dict(type="str", required=True),
+        object=dict(type="str", required=True),
+        src=dict(type="path", required=False),
+        content=dict(type="str", required=False),
+        content_type=dict(
+            type="str", required=False, default="application/octet-stream"
+        ),
+        metadata=dict(type="dict", required=False),
+        part_size=dict(type="int", required=False, default=DEFAULT_PART_SIZE),
+        workers=dict(type="int", required=False, default=4),
+        overwrite=dict(
+            type="str",
+            required=False,
+            default="different",
+            choices=["always", "different", "never"],
+        ),
+        state=dict(default="present", choices=["present", "absent"]),
+    )
+    return dict(
+        argument_spec=argument_spec,
+        supports_check_mode=True,
+        mutually_exclusive=[("src", "content")],
+        required_if=[("state", "present", ("src", "content"), True)],
+    )
+
+
+def run_module(module):
+    bucket = module.params["bucket"]
+    name = module.params["object"]
+    src = module.params["src"]
+    content = module.params["content"]
+    part_size = module.params["part_size"]
+    workers = module.params["workers"]
+    state = module.params["state"]
+
+    client = minio_client(module)
+
+    try:
+        stat = object_stat(client, bucket, name)
+    except Exception as e:
+        module.fail_json(
+            msg="Failed to stat object %s/%s: %s" % (bucket, name, to_native(e))
+        )
+
+    if state == "absent":
+        if stat is not None and not module.check_mode:
+            try:
+                client.remove_object(bucket, name)
+            except Exception as e:
+                module.fail_json(
+                    msg="Failed to remove object %s/%s: %s"
+                    % (bucket, name, to_native(e))
+                )
+        module.exit_json(changed=stat is not None)
+
+    if src is not None:
+        if not os.path.isfile(src):
+            module.fail_json(msg="Source file %s does not exist" % src)
+        data = None
+        size = os.path.getsize(src)
+    else:
+        data = to_bytes(content, errors="surrogate_or_strict")
+        size = len(data)
+
+    error = validate_part_size(size, part_size)
+    if error:
+        module.fail_json(msg=error)
+
+    etags = []
+
+    def etag():
+        # The local ETag is rebuilt with the part size the stored object was
+        # uploaded with, which need not be the one used for new uploads
+        if not etags:
+            try:
+                etag_part_size = object_part_size(client, bucket, name, stat)
+            except Exception as e:
+                module.fail_json(
+                    msg="Failed to stat object %s/%s: %s" % (bucket, name, to_native(e))
+                )
+            if data is None:
+                etags.append(file_etag(src, etag_part_size, workers))
+            else:
+                etags.append(bytes_etag(data, etag_part_size))
+        return etags[0]
+
+    result = dict(size=size)
+
+    try:
+        changed = needs_upload(stat, size, etag, module.params["overwrite"])
+    except (IOError, OSError) as e:
+        module.fail_json(msg="Failed to read %s: %s" % (src, to_native(e)))
+
+    if changed and not module.check_mode:
+        kwargs = dict(
+            content_type=module.params["content_type"],
+            metadata=module.params["metadata"],
+            part_size=part_size,
+            num_parallel_uploads=workers,
+        )
+        try:
+            if data is None:
+                written = client.fput_object(bucket, name, src, **kwargs)
+            else:
+                written = client.put_object(
+                    bucket, name, io.BytesIO(data), size, **kwargs
+                )
+        except Exception as e:
+            module.fail_json(
+                msg="Failed to upload object %s/%s: %s" % (bucket, name, to_native(e))
+            )
+        result.update(etag=written.etag, version_id=written.version_id)
+    elif etags:
+        result["etag"] = etags[0]
+    elif stat is not None:
+        result["etag"] = stat.etag
+
+    module.exit_json(changed=changed, **result)
+
+
+def main():
+    module = AnsibleModule(**module_args())
+    run_module(module)
+
+
+if __name__ == "__main__":
+    main()
@@ -17,6 +17,8 @@ description:
   - When the policy does not exist, it will be created.
   - When the policy does exist and O(state=absent), the policy will be deleted.
   - When changes are made to the policy, the policy will be updated.
+  - When O(policies) is given, every policy in the list is reconciled against a
+    single listing of the policies on the server.
 author:
     - Josh Williams (@t3hpr1m3)
 requirements:
@@ -32,12 +34,14 @@ attributes:
 options:
   name:
     type: str
-    required: true
-    description: Name of the policy to be managed.
+    required: false
+    description:
+      - Name of the policy to be managed.
+      - One of O(name) or O(policies) is required.
   statements:
     type: list
     elements: dict
-    required: true
+    required: false
     suboptions:
       effect:
         type: str
@@ -60,7 +64,39 @@ options:
         required: true
         description: >-
           List of resources to which this policy will apply.
-    description: List of policy statements to include
+    description:
+      - List of policy statements to include.
+      - Required with O(name).
+  policies:
+    type: list
+    elements: dict
+    required: false
+    description:
+      - List of policies to be managed in a single invocation.
+      - Mutually exclusive with O(name).
+    suboptions:
+      name:
+        type: str
+        required: true
+        description: Name of the policy to be managed.
+      statements:
+        type: list
+        elements: dict
+        required: false
+        description:
+          - List of policy statements to include, in the same format as O(statements).
+          - Required unless the policy's state is V(absent).
+      state:
+        type: str
+        required: false
+        choices: [ "present", "absent" ]
+        description: Desired state of this policy.  Defaults to O(state).
+  workers:
+    type: int
+    default: 8
+    description:
+      - Maximum number of policies uploaded or removed concurrently when using O(policies).
+      - Consider raising O(auth.max_pool_size) to match.
   state:
     type: str
     default: present
@@ -75,7 +111,9 @@ seealso:
     link: https://min.io/docs/minio/linux/reference/minio-mc-admin/mc-admin-policy-create.html
 notes:
   - The O(auth.access_key) provided must have the B(admin:CreatePolicy) permission.
-extends_documentation_fragment: dubzland.minio.minio_auth
+extends_documentation_fragment:
+  - dubzland.minio.minio_auth
+  - dubzland.minio.minio_controller
 """
 
 EXAMPLES = """
@@ -92,8 +130,48 @@ EXAMPLES = """
       secret_key: supersekret
     state: present
   delegate_to: localhost
+
+- name: Add many policies to the Minio server at once
+  dubzland.minio.minio_policy:
+    policies:
+      - name: tenant-a
+        statements:
+          - effect: Allow
+            action: "s3:*"
+            resource: "arn:aws:s3:::tenant-a/*"
+      - name: tenant-old
+        state: absent
+    auth:
+      url: http://minio-server:9000
+      access_key: myuser
+      secret_key: supersekret
+  delegate_to: localhost
 """
 
+RETURN = """
+policies:
+  description: Per-policy results when O(policies) is used.
+  returned: when O(policies) is used
+  type: list
+  elements: dict
+  sample:
+    - name: tenant-a
+      state: present
+      action: add
+      changed: true
+summary:
+  description: Number of policies added, updated, removed, unchanged and failed when O(policies) is used.
+  returned: when O(policies) is used
+  type: dict
+  sample:
+    added: 1
+    updated: 0
+    removed: 1
+    unchanged: 0
+    failed: 0
+"""
+
+import inspect
 import json
 import os
 import tempfile
@@ -103,9 +181,21 @@ from contextlib import contextmanager
 from ansible_collections.dubzland.minio.plugins.module_utils.minio import (
     minio_admin_client,
     minio_argument_spec,
+    minio_parallel,
+    minio_policy_lookup,
+)
+from ansible_collections.dubzland.minio.plugins.module_utils.policy import (
+    policies_equal,
 )
 
 from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.common.text.converters import to_native
+
+STATEMENT_OPTIONS = dict(
+    effect=dict(type="str", choices=["Allow", "Deny"], required=True),
+    action=dict(type="list", elements="str", required=True),
+    resource=dict(type="list", elements="str", required=True),
+)
 
 
 @contextmanager
@@ -118,76 +208,200 @@ def policy_tempfile(data):
         yield tmp_path
 
 
-def main():
+def policy_document(statements):
+    data = {
+        "Version": "2012-10-17",
+        "Statement": [],
+    }
+
+    for statement in statements:
+        data["Statement"].append(
+            {
+                "Effect": statement["effect"],
+                "Action": statement["action"],
+                "Resource": statement["resource"],
+            }
+        )
+
+    return data
+
+
+def policy_changed(current, desired):
+    return not policies_equal(current, desired)
+
+
+def policy_add_from_memory(client):
+    """Whether policy_add() of the client accepts the policy document itself.
+
+    Older minio releases only accept a path to the policy document.
+    """
+    return "policy" in inspect.signature(client.policy_add).parameters
+
+
+def policy_upload(client, name, document, from_memory):
+    """Upload the policy document, straight from memory when supported."""
+    if from_memory:
+        return client.policy_add(name, policy=document)
+
+    with policy_tempfile(json.dumps(document)) as policy_file:
+        return client.policy_add(name, policy_file)
+
+
+def plan_policy(current, entry):
+    if entry["state"] == "absent":
+        return "remove" if current is not None else None
+
+    document = policy_document(entry["statements"])
+    if current is None:
+        return "add"
+    if policy_changed(current, document):
+        return "update"
+
+    return None
+
+
+def reconcile_policy(module, client, current, entry, from_memory):
+    action = plan_policy(current, entry)
+    result = dict(name=entry["name"], state=entry["state"], action=action)
+
+    try:
+        if action is not None and not module.check_mode:
+            if action == "remove":
+                client.policy_remove(entry["name"])
+            else:
+                policy_upload(
+                    client,
+                    entry["name"],
+                    policy_document(entry["statements"]),
+                    from_memory,
+                )
+    except Exception as e:
+        result.update(failed=True, msg=to_native(e))
+
+    result["changed"] = action is not None and not result.get("failed")
+    return result
+
+
+def reconcile_policies(module, client, policies, state, workers, from_memory):
+    desired = {}
+    for policy in policies:
+        desired[policy["name"]] = dict(policy, state=policy["state"] or state)
+
+    snapshot = minio_policy_lookup(client).get_many(desired.keys())
+
+    results = minio_parallel(
+        lambda entry: reconcile_policy(
+            module, client, snapshot.get(entry["name"]), entry, from_memory
+        ),
+        desired.values(),
+        workers,
+    )
+
+    summary = dict(added=0, updated=0, removed=0, unchanged=0, failed=0)
+    for result in results:
+        if result.get("failed"):
+            summary["failed"] += 1
+        elif result["action"] == "add":
+            summary["added"] += 1
+        elif result["action"] == "update":
+            summary["updated"] += 1
+        elif result["action"] == "remove":
+            summary["removed"] += 1
+        else:
+            summary["unchanged"] += 1
+
+    return results, summary
+
+
+def module_args():
     argument_spec = minio_argument_spec(
-        name=dict(type="str", required=True),
+        name=dict(type="str", required=False),
         statements=dict(
             type="list",
             elements="dict",
-            required=True,
+            required=False,
+            options=STATEMENT_OPTIONS,
+        ),
+        policies=dict(
+            type="list",
+            elements="dict",
+            required=False,
             options=dict(
-                effect=dict(type="str", choices=["Allow", "Deny"], required=True),
-                action=dict(type="list", elements="str", required=True),
-                resource=dict(type="list", elements="str", required=True),
+                name=dict(type="str", required=True),
+                statements=dict(
+                    type="list",
+                    elements="dict",
+                    required=False,
+                    options=STATEMENT_OPTIONS,
+                ),
+                state=dict(type="str", required=False, choices=["present", "absent"]),
             ),
         ),
+        workers=dict(type="int", required=False, default=8),
         state=dict(default="present", choices=["present", "absent"]),
     )
+    return dict(
+        argument_spec=argument_spec,
+        supports_check_mode=True,
+        mutually_exclusive=[("name", "policies")],
+        required_one_of=[("name", "policies")],
+        required_together=[("name", "statements")],
+    )
 
-    module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True)
-
-    needs_policy_add = False
-    changed = False
-
-    client = minio_admin_client(module)
-
-    res = client.policy_list()
-    policies = json.loads(res)
 
-    state = module.params["state"]
+def run_module(module):
     name = module.params["name"]
     statements = module.params["statements"]
+    policies = module.params["policies"]
+    workers = module.params["workers"]
     state = module.params["state"]
 
-    data = {
-        "Version": "2012-10-17",
-        "Statement": [],
-    }
+    changed = False
 
-    for statement in statements:
-        data["Statement"].append(
-            {
-                "Effect": statement["effect"],
-                "Action": [",".join(statement["action"])],
-                "Resource": [",".join(statement["resource"])],
-            }
+    client = minio_admin_client(module)
+    from_memory = policy_add_from_memory(client)
+
+    if policies is not None:
+        for policy in policies:
+            if (policy["state"] or state) != "absent" and policy["statements"] is None:
+                module.fail_json(
+                    msg="statements are required for policy %s" % policy["name"]
+                )
+
+        results, summary = reconcile_policies(
+            module, client, policies, state, workers, from_memory
         )
+        changed = any(result["changed"] for result in results)
+        if summary["failed"]:
+            module.fail_json(
+                msg="Failed to reconcile %d policies" % summary["failed"],
+                changed=changed,
+                policies=results,
+                summary=summary,
+            )
+        module.exit_json(changed=changed, policies=results, summary=summary)
 
-    json_data = json.dumps(data)
-
-    if name in policies:
-        if state == "present":
-            # policy already exists
-            new_policy = json.loads(json_data)
-            current_policy = policies[name]
-            if json.dumps(current_policy, sort_keys=True) != json.dumps(
-                new_policy, sort_keys=True
-            ):
-                needs_policy_add = True
-        else:
-            client.policy_remove(name)
-            changed = True
-    else:
-        if state == "present":
-            needs_policy_add = True
+    current_policy = minio_policy_lookup(client).get(name)
 
-    if needs_policy_add:
-        with policy_tempfile(json_data) as policy_file:
-            client.policy_add(name, policy_file)
-            changed = True
+    result = reconcile_policy(
+        module,
+        client,
+        current_policy,
+        dict(name=name, statements=statements, state=state),
+        from_memory,
+    )
+    if result.get("failed"):
+        module.fail_json(msg="Failed to manage policy %s: %s" % (name, result["msg"]))
+
+    changed = result["changed"]
 
     module.exit_json(changed=changed)
 
 
+def main():
+    module = AnsibleModule(**module_args())
+    run_module(module)
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,184 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright: Josh Williams <jdubz@dubzland.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = """
+---
+module: minio_presign
+short_description: Generates presigned URLs for objects in a Minio bucket
+description:
+  - Generates presigned URLs for a list of objects, or for every object below a
+    prefix, in a single invocation.
+  - URLs are signed locally. The only request made is a single streamed listing
+    when O(prefix) is used, plus a lookup of the bucket region when O(auth.region)
+    is not set.
+author:
+  - Josh Williams (@t3hpr1m3)
+requirements:
+  - python >= 3.8
+  - minio >= 7.1.4
+attributes:
+  check_mode:
+    support: full
+    description: Can run in check_mode and return changed status prediction without modifying target.
+  diff_mode:
+    support: none
+    description: Will return details on what has changed (or possibly needs changing in check_mode), when in diff mode.
+options:
+  bucket:
+    type: str
+    required: true
+    description: Name of the bucket containing the objects.
+  objects:
+    type: list
+    elements: str
+    required: false
+    description:
+      - Names (keys) of the objects to generate URLs for.
+      - The objects do not need to exist, which allows generating V(PUT) URLs for new objects.
+      - One of O(objects) or O(prefix) is required.
+  prefix:
+    type: str
+    required: false
+    description:
+      - Generate URLs for every object whose name starts with this prefix.
+      - Mutually exclusive with O(objects).
+  method:
+    type: str
+    default: GET
+    choices: [ "GET", "PUT" ]
+    description: HTTP method the URLs are valid for.
+  expires:
+    type: int
+    default: 604800
+    description: Seconds the URLs remain valid for, at most 604800 (7 days).
+notes:
+  - Signing happens on the host running the module, whose clock must be accurate.
+  - The access key is part of every URL, so unlike other modules it is not
+    masked in the task result or logs. The secret key still is.
+seealso:
+  - name: mc share
+    description: Documentation for the B(mc share) command.
+    link: https://min.io/docs/minio/linux/reference/minio-mc/mc-share.html
+extends_documentation_fragment:
+  - dubzland.minio.minio_auth
+  - dubzland.minio.minio_controller
+"""
+
+EXAMPLES = """
+- name: Generate download links for a release
+  dubzland.minio.minio_presign:
+    bucket: releases
+    prefix: myapp/1.2.0/
+    expires: 86400
+    auth:
+      url: http://minio-server:9000
+      access_key: myuser
+      secret_key: supersekret
+  delegate_to: localhost
+  register: links
+
+- name: Generate upload links
+  dubzland.minio.minio_presign:
+    bucket: uploads
+    objects:
+      - incoming/report.csv
+      - incoming/summary.csv
+    method: PUT
+    expires: 3600
+    auth:
+      url: http://minio-server:9000
+      access_key: myuser
+      secret_key: supersekret
+  delegate_to: localhost
+"""
+
+RETURN = """
+urls:
+  description: Presigned URL of each object, keyed by object name.
+  returned: always
+  type: dict
+  sample:
+    myapp/1.2.0/myapp.tar.gz: "http://minio-server:9000/releases/myapp/1.2.0/myapp.tar.gz?X-Amz-Algorithm=..."
+"""
+
+from datetime import timedelta
+
+from ansible_collections.dubzland.minio.plugins.module_utils.minio import (
+    minio_argument_spec,
+    minio_client,
+    minio_walk_objects,
+)
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.common.text.converters import to_native
+
+# Longest validity allowed by AWS Signature Version 4
+MAX_EXPIRES = 7 * 24 * 60 * 60
+
+
+def module_args():
+    argument_spec = minio_argument_spec(
+        bucket=dict(type="str", required=True),
+        objects=dict(type="list", elements="str", required=False),
+        prefix=dict(type="str", required=False),
+        method=dict(type="str", required=False, default="GET", choices=["GET", "PUT"]),
+        expires=dict(type="int", required=False, default=MAX_EXPIRES),
+    )
+    # Every URL carries the access key in X-Amz-Credential, so masking it in
+    # the result would make them unusable
+    argument_spec["auth"]["options"]["access_key"]["no_log"] = False
+    return dict(
+        argument_spec=argument_spec,
+        supports_check_mode=True,
+        mutually_exclusive=[("objects", "prefix")],
+        required_one_of=[("objects", "prefix")],
+    )
+
+
+def run_module(module):
+    bucket = module.params["bucket"]
+    prefix = module.params["prefix"]
+    expires = module.params["expires"]
+
+    if expires < 1 or expires > MAX_EXPIRES:
+        module.fail_json(msg="expires must be between 1 and %d seconds" % MAX_EXPIRES)
+
+    client = minio_client(module)
+
+    if prefix is not None:
+        names = (obj.object_name for obj in minio_walk_objects(client, bucket, prefix))
+    else:
+        names = module.params["objects"]
+
+    urls = {}
+    try:
+        for name in names:
+            urls[name] = client.get_presigned_url(
+                module.params["method"],
+                bucket,
+                name,
+                expires=timedelta(seconds=expires),
+            )
+    except Exception as e:
+        module.fail_json(
+            msg="Failed to generate presigned URLs for %s: %s" % (bucket, to_native(e))
+        )
+
+    module.exit_json(changed=False, urls=urls)
+
+
+def main():
+    module = AnsibleModule(**module_args())
+    run_module(module)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,415 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright: Josh Williams <jdubz@dubzland.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = """
+---
+module: minio_sync
+short_description: Mirrors a local directory to a Minio bucket
+description:
+  - Uploads new and changed files below O(src) to O(bucket), under O(prefix).
+  - When O(delete=true), objects below O(prefix) with no matching local file are removed.
+  - The remote prefix is streamed in key order and merged against the sorted local
+    files. Only the name and ETag of objects needing an ETag comparison, and the
+    objects to delete when O(delete=true), are kept in memory, rather than the
+    whole listing.
+  - A file whose size differs from its object is uploaded without being read. Files
+    of the same size are compared by ETag, using the ETag recorded in O(manifest)
+    when the file size and modification time have not changed since it was recorded,
+    and hashing the file otherwise.
+author:
+  - Josh Williams (@t3hpr1m3)
+requirements:
+  - python >= 3.8
+  - minio >= 7.1.4
+attributes:
+  check_mode:
+    support: full
+    description: Can run in check_mode and return changed status prediction without modifying target.
+  diff_mode:
+    support: none
+    description: Will return details on what has changed (or possibly needs changing in check_mode), when in diff mode.
+options:
+  src:
+    type: path
+    required: true
+    description: Local directory to mirror.
+  bucket:
+    type: str
+    required: true
+    description: Name of the bucket to mirror O(src) into.
+  prefix:
+    type: str
+    default: ""
+    description:
+      - Prefix prepended to the path of each file, relative to O(src), to form its object name.
+      - A trailing V(/) is added when missing.
+  delete:
+    type: bool
+    default: false
+    description: Remove objects below O(prefix) which have no matching file in O(src).
+  exclude:
+    type: list
+    elements: str
+    default: []
+    description:
+      - Shell-style patterns matched against the path of each file relative to O(src).
+      - Excluded files are neither uploaded nor protected from O(delete).
+  manifest:
+    type: path
+    required: false
+    description:
+      - File recording the size, modification time and ETag of each file after it
+        was last hashed or uploaded.
+      - Defaults to C(.minio_sync.json) in O(src), which is never uploaded.
+      - The manifest is not updated in check mode.
+  part_size:
+    type: int
+    default: 16777216
+    description:
+      - Size in bytes of each part when uploading files larger than this, between 5 MiB and 5 GiB.
+      - Recorded ETags are discarded when this changes.
+  workers:
+    type: int
+    default: 8
+    description: Maximum number of files hashed or uploaded concurrently.
+notes:
+  - Files are compared by content only, changes to metadata are not detected.
+  - The content type of each object is guessed from its file extension.
+seealso:
+  - name: mc mirror
+    description: Documentation for the B(mc mirror) command.
+    link: https://min.io/docs/minio/linux/reference/minio-mc/mc-mirror.html
+extends_documentation_fragment:
+  - dubzland.minio.minio_auth
+  - dubzland.minio.minio_controller
+"""
+
+EXAMPLES = """
+- name: Publish static assets
+  dubzland.minio.minio_sync:
+    src: /srv/www/static
+    bucket: assets
+    prefix: static/
+    delete: true
+    exclude:
+      - "*.map"
+    workers: 32
+    auth:
+      url: http://minio-server:9000
+      access_key: myuser
+      secret_key: supersekret
+  delegate_to: localhost
+"""
+
+RETURN = """
+uploaded:
+  description: Names of the objects uploaded (or which would be uploaded in check mode).
+  returned: always
+  type: list
+  elements: str
+  sample: ["static/css/site.css"]
+deleted:
+  description: Names of the objects removed (or which would be removed in check mode).
+  returned: always
+  type: list
+  elements: str
+  sample: ["static/js/old.js"]
+summary:
+  description: Number of files uploaded, objects deleted, files unchanged, files hashed and failures.
+  returned: always
+  type: dict
+  sample:
+    uploaded: 1
+    deleted: 1
+    unchanged: 1499998
+    hashed: 12
+    failed: 0
+"""
+
+import fnmatch
+import json
+import mimetypes
+import os
+import tempfile
+
+from ansible_collections.dubzland.minio.plugins.module_utils.minio import (
+    minio_argument_spec,
+    minio_client,
+    minio_parallel,
+    minio_remove_objects,
+    minio_walk_objects,
+)
+from ansible_collections.dubzland.minio.plugins.module_utils.transfer import (
+    DEFAULT_PART_SIZE,
+    file_etag,
+    validate_part_size,
+)
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.common.text.converters import to_native
+
+MANIFEST_NAME = ".minio_sync.json"
+MANIFEST_VERSION = 1
+
+
+class SyncManifest:
+    """Records the ETag of each local file, along with its size and mtime.
+
+    An entry is only trusted while the file's size and modification time are
+    unchanged, and while files are uploaded with the same part size.
+    """
+
+    def __init__(self, path, part_size):
+        self.path = path
+        self.part_size = part_size
+        self.files = {}
+
+    def load(self):
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (IOError, OSError, ValueError):
+            return
+
+        if (
+            data.get("version") == MANIFEST_VERSION
+            and data.get("part_size") == self.part_size
+        ):
+            self.files = data.get("files", {})
+
+    def etag(self, path, size, mtime):
+        entry = self.files.get(path)
+        if entry and entry["size"] == size and entry["mtime"] == mtime:
+            return entry["etag"]
+        return None
+
+    def record(self, path, size, mtime, etag):
+        self.files[path] = dict(size=size, mtime=mtime, etag=etag)
+
+    def prune(self, paths):
+        self.files = dict((p, e) for p, e in self.files.items() if p in paths)
+
+    def save(self):
+        directory = os.path.dirname(self.path) or "."
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".minio_sync.")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(
+                    dict(
+                        version=MANIFEST_VERSION,
+                        part_size=self.part_size,
+                        files=self.files,
+                    ),
+                    f,
+                    separators=(",", ":"),
+                )
+            os.replace(tmp, self.path)
+        except Exception:
+            os.unlink(tmp)
+            raise
+
+
+def local_files(src, exclude, skip):
+    """Return {relative path: (size, mtime)} for every file below src."""
+    files = {}
+    for root, dirs, names in os.walk(src):
+        dirs.sort()
+        for name in names:
+            path = os.path.join(root, name)
+            rel = os.path.relpath(path, src).replace(os.sep, "/")
+            if path == skip or any(fnmatch.fnmatch(rel, p) for p in exclude):
+                continue
+            st = os.stat(path)
+            files[rel] = (st.st_size, st.st_mtime_ns)
+
+    return files
+
+
+def plan_sync(files, remote, prefix, delete):
+    """Merge the sorted local files against the streamed remote listing.
+
+    Both sides are in key order, so each remote object is compared as soon
+    as it is read, and only kept when it needs an ETag comparison or is to be
+    deleted.  Returns the relative paths to upload, the (relative path,
+    remote ETag) pairs which need an ETag comparison, and the remote objects
+    to delete.
+    """
+    upload = []
+    compare = []
+    extra = []
+
+    local = iter(sorted(files))
+    rel = next(local, None)
+
+    for obj in remote:
+        key = obj.object_name[len(prefix) :]
+        while rel is not None and rel < key:
+            upload.append(rel)
+            rel = next(local, None)
+
+        if rel == key:
+            if files[rel][0] != obj.size:
+                upload.append(rel)
+            else:
+                compare.append((rel, obj.etag))
+            rel = next(local, None)
+        elif delete:
+            extra.append(obj)
+
+    while rel is not None:
+        upload.append(rel)
+        rel = next(local, None)
+
+    return upload, compare, extra
+
+
+def module_args():
+    argument_spec = minio_argument_spec(
+        src=dict(type="path", required=True),
+        bucket=dict(type="str", required=True),
+        prefix=dict(type="str", required=False, default=""),
+        delete=dict(type="bool", required=False, default=False),
+        exclude=dict(type="list", elements="str", required=False, default=[]),
+        manifest=dict(type="path", required=False),
+        part_size=dict(type="int", required=False, default=DEFAULT_PART_SIZE),
+        workers=dict(type="int", required=False, default=8),
+    )
+    return dict(argument_spec=argument_spec, supports_check_mode=True)
+
+
+def run_module(module):
+    src = module.params["src"]
+    bucket = module.params["bucket"]
+    prefix = module.params["prefix"]
+    part_size = module.params["part_size"]
+    workers = module.params["workers"]
+
+    if prefix and not prefix.endswith("/"):
+        prefix += "/"
+
+    if not os.path.isdir(src):
+        module.fail_json(msg="Source directory %s does not exist" % src)
+
+    error = validate_part_size(0, part_size)
+    if error:
+        module.fail_json(msg=error)
+
+    manifest = SyncManifest(
+        module.params["manifest"] or os.path.join(src, MANIFEST_NAME), part_size
+    )
+    manifest.load()
+
+    files = local_files(src, module.params["exclude"], manifest.path)
+
+    client = minio_client(module)
+
+    try:
+        upload, compare, extra = plan_sync(
+            files,
+            minio_walk_objects(client, bucket, prefix),
+            prefix,
+            module.params["delete"],
+        )
+    except Exception as e:
+        module.fail_json(
+            msg="Failed to list %s/%s: %s" % (bucket, prefix, to_native(e))
+        )
+
+    def local_etag(item):
+        rel, remote_etag = item
+        size, mtime = files[rel]
+        etag = manifest.etag(rel, size, mtime)
+        hashed = etag is None
+        if hashed:
+            etag = file_etag(os.path.join(src, rel), part_size, 1)
+        return rel, etag, remote_etag, hashed
+
+    summary = dict(uploaded=0, deleted=0, unchanged=0, hashed=0, failed=0)
+    errors = []
+
+    try:
+        compared = minio_parallel(local_etag, compare, workers)
+    except (IOError, OSError) as e:
+        module.fail_json(msg="Failed to hash %s: %s" % (src, to_native(e)))
+
+    for rel, etag, remote_etag, hashed in compared:
+        manifest.record(rel, files[rel][0], files[rel][1], etag)
+        summary["hashed"] += hashed
+        if etag != remote_etag:
+            upload.append(rel)
+        else:
+            summary["unchanged"] += 1
+
+    upload.sort()
+
+    def put(rel):
+        if module.check_mode:
+            return rel, None
+        path = os.path.join(src, rel)
+        try:
+            written = client.fput_object(
+                bucket,
+                prefix + rel,
+                path,
+                content_type=mimetypes.guess_type(rel)[0] or "application/octet-stream",
+                part_size=part_size,
+                num_parallel_uploads=1,
+            )
+        except Exception as e:
+            return rel, e
+        manifest.record(rel, files[rel][0], files[rel][1], written.etag)
+        return rel, None
+
+    uploaded = []
+    for rel, error in minio_parallel(put, upload, workers):
+        if error is None:
+            uploaded.append(prefix + rel)
+        else:
+            errors.append("%s: %s" % (prefix + rel, to_native(error)))
+
+    deleted = [obj.object_name for obj in extra]
+    if extra and not module.check_mode:
+        try:
+            minio_remove_objects(client, bucket, extra)
+        except Exception as e:
+            deleted = []
+            errors.append(to_native(e))
+
+    summary.update(uploaded=len(uploaded), deleted=len(deleted), failed=len(errors))
+    changed = bool(uploaded or deleted)
+    result = dict(changed=changed, uploaded=uploaded, deleted=deleted, summary=summary)
+
+    if not module.check_mode:
+        manifest.prune(files)
+        try:
+            manifest.save()
+        except (IOError, OSError) as e:
+            module.warn(
+                "Failed to save manifest %s: %s" % (manifest.path, to_native(e))
+            )
+
+    if errors:
+        module.fail_json(
+            msg="Failed to sync %d object(s), first error: %s"
+            % (len(errors), errors[0]),
+            **result
+        )
+
+    module.exit_json(**result)
+
+
+def main():
+    module = AnsibleModule(**module_args())
+    run_module(module)
+
+
+if __name__ == "__main__":
+    main()
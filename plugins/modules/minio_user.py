@@ -17,6 +17,8 @@ description:
   - When the user does not exist, it will be created.
   - When the user does exist and O(state=absent), the user will be deleted.
   - When changes are made to the user, the user will be updated.
+  - When O(users) is given, every user in the list is reconciled against a
+    single listing of the users on the server.
 author:
   - Josh Williams (@t3hpr1m3)
 requirements:
@@ -32,12 +34,16 @@ attributes:
 options:
   access_key:
     type: str
-    required: true
-    description: Access key (username) for the user.
+    required: false
+    description:
+      - Access key (username) for the user.
+      - One of O(access_key) or O(users) is required.
   secret_key:
     type: str
-    required: true
-    description: Secret key (password) for the user.
+    required: false
+    description:
+      - Secret key (password) for the user.
+      - Required with O(access_key).
   policy:
     type: str
     required: false
@@ -56,11 +62,50 @@ options:
     default: present
     choices: [ "present", "absent", "enabled", "disabled" ]
     type: str
+  users:
+    type: list
+    elements: dict
+    required: false
+    description:
+      - List of users to be managed in a single invocation.
+      - Mutually exclusive with O(access_key).
+    suboptions:
+      access_key:
+        type: str
+        required: true
+        description: Access key (username) for the user.
+      secret_key:
+        type: str
+        required: false
+        description:
+          - Secret key (password) for the user.
+          - Required unless the user's state is V(absent).
+      policy:
+        type: str
+        required: false
+        description: An existing policy to apply to this user.
+      force:
+        type: bool
+        default: false
+        description: When set to V(true), the O(users[].secret_key) will always be updated.
+      state:
+        type: str
+        required: false
+        choices: [ "present", "absent", "enabled", "disabled" ]
+        description: Desired state of this user.  Defaults to O(state).
+  workers:
+    type: int
+    default: 8
+    description:
+      - Maximum number of users updated concurrently when using O(users).
+      - Consider raising O(auth.max_pool_size) to match.
 seealso:
   - name: mc mb
     description: Documentation for the B(mc mb) command.
     link: https://min.io/docs/minio/linux/reference/minio-mc/mc-mb.html
-extends_documentation_fragment: dubzland.minio.minio_auth
+extends_documentation_fragment:
+  - dubzland.minio.minio_auth
+  - dubzland.minio.minio_controller
 """
 
 EXAMPLES = """
@@ -74,16 +119,57 @@ EXAMPLES = """
       url: http://minio-server:9000
     state: present
   delegate_to: localhost
+
+- name: Manage many Minio users at once
+  dubzland.minio.minio_user:
+    users:
+      - access_key: service-a
+        secret_key: supersekret-a
+        policy: readwrite
+      - access_key: service-b
+        secret_key: supersekret-b
+        state: disabled
+      - access_key: service-old
+        state: absent
+    auth:
+      access_key: minioadmin
+      secret_key: minioadmin
+      url: http://minio-server:9000
+  delegate_to: localhost
 """
 
-import json
+RETURN = """
+users:
+  description: Per-user results when O(users) is used.
+  returned: when O(users) is used
+  type: list
+  elements: dict
+  sample:
+    - access_key: service-a
+      state: present
+      actions: [create, policy_set]
+      changed: true
+summary:
+  description: Number of users created, updated, removed, unchanged and failed when O(users) is used.
+  returned: when O(users) is used
+  type: dict
+  sample:
+    created: 1
+    updated: 0
+    removed: 1
+    unchanged: 1
+    failed: 0
+"""
 
 from ansible_collections.dubzland.minio.plugins.module_utils.minio import (
     minio_admin_client,
     minio_argument_spec,
+    minio_parallel,
+    minio_user_lookup,
 )
 
 from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.common.text.converters import to_native
 
 
 class MinioUser:
@@ -93,11 +179,10 @@ class MinioUser:
         self.user_object = None
 
     def find_user(self, access_key):
-        user_list_str = self._client.user_list()
-        user_list = json.loads(user_list_str)
+        return minio_user_lookup(self._client).get(access_key)
 
-        if access_key in user_list:
-            return user_list[access_key]
+    def find_users(self, access_keys):
+        return minio_user_lookup(self._client).get_many(access_keys)
 
     def user_exists(self, access_key):
         user = self.find_user(access_key)
@@ -108,106 +193,200 @@ class MinioUser:
         return False
 
     def create_or_update_user(self, access_key, options):
-        changed = False
+        actions = self.plan_user(access_key, options)
+        if not actions:
+            return False
+
+        if not self._module.check_mode:
+            self.apply_plan(access_key, actions)
+
+        return True
+
+    def plan_user(self, access_key, options):
+        """Compute the mutations needed to bring the user to the desired state.
+
+        The plan is derived from self.user_object alone, and is returned as a
+        list of (action, argument) tuples in the order they must be applied.
+        """
+        actions = []
+
+        current = self.user_object
+        if current is None:
+            actions.append(("create", options["secret_key"]))
+            # Newly added users are enabled, with no policy
+            current = {"status": "enabled"}
+        elif options.get("force") and options["secret_key"]:
+            actions.append(("update_secret", options["secret_key"]))
+            # Updating the password automatically enables the user
+            current = dict(current, status="enabled")
+
+        new_policy = options.get("policy")
+        current_policy = current.get("policyName")
+        if current_policy and new_policy is None:
+            actions.append(("policy_unset", current_policy))
+        elif new_policy is not None and new_policy != current_policy:
+            actions.append(("policy_set", new_policy))
+
+        if options["state"] == "disabled" and current.get("status") != "disabled":
+            actions.append(("disable", None))
+        elif options["state"] == "enabled" and current.get("status") != "enabled":
+            actions.append(("enable", None))
+
+        return actions
+
+    def apply_plan(self, access_key, actions):
+        """Issue the mutations from plan_user(), tracking the resulting user."""
+        user = dict(self.user_object or {})
+
+        for action, arg in actions:
+            if action in ("create", "update_secret"):
+                self._client.user_add(access_key, arg)
+                user["status"] = "enabled"
+            elif action == "policy_set":
+                self._client.policy_set(arg, user=access_key)
+                user["policyName"] = arg
+            elif action == "policy_unset":
+                self._client.policy_unset(arg, user=access_key)
+                user.pop("policyName", None)
+            elif action == "disable":
+                self._client.user_disable(access_key)
+                user["status"] = "disabled"
+            elif action == "enable":
+                self._client.user_enable(access_key)
+                user["status"] = "enabled"
+
+        self.user_object = user
+        return user
 
-        if self.user_object is None:
-            if self._module.check_mode:
-                return True
+    def delete_user(self, access_key):
+        if not self._module.check_mode:
+            self._client.user_remove(access_key)
 
-            self._client.user_add(access_key, options["secret_key"])
-            self.user_object = self._client.user_info(access_key)
-            changed = True
-        else:
-            changed = False
-            # We have to update the password first, as this will automatically
-            # enable them
-            if (
-                "force" in options
-                and options["force"] is True
-                and options["secret_key"]
-            ):
-                if self._module.check_mode:
-                    return True
-
-                self._client.user_add(access_key, options["secret_key"])
-                self.user_object = self._client.user_info(access_key)
-                changed = True
-
-        new_policy = None
-        if "policy" in options:
-            new_policy = options["policy"]
-
-        if "policyName" in self.user_object:
-            # User has a policy set
-            if new_policy is None:
-                if self._module.check_mode:
-                    return True
-
-                self._client.policy_unset(
-                    self.user_object["policyName"], user=access_key
-                )
-                self.user_object = self._client.user_info(access_key)
-                changed = True
-            elif new_policy != self.user_object["policyName"]:
-                if self._module.check_mode:
-                    return True
-
-                self._client.policy_set(new_policy, user=access_key)
-                self.user_object = self._client.user_info(access_key)
-                changed = True
+        return True
+
+
+def reconcile_user(module, client, user_object, entry):
+    access_key = entry["access_key"]
+    result = dict(access_key=access_key, state=entry["state"], actions=[])
+
+    minio_user = MinioUser(module, client)
+    minio_user.user_object = user_object
+
+    try:
+        if entry["state"] == "absent":
+            if user_object is not None:
+                result["actions"] = ["remove"]
+                minio_user.delete_user(access_key)
         else:
-            # No policy set
-            if new_policy is not None:
-                if self._module.check_mode:
-                    return True
+            actions = minio_user.plan_user(access_key, entry)
+            result["actions"] = [action for action, arg in actions]
+            if actions and not module.check_mode:
+                minio_user.apply_plan(access_key, actions)
+    except Exception as e:
+        result.update(failed=True, msg=to_native(e))
+
+    result["changed"] = bool(result["actions"]) and not result.get("failed")
+    return result
 
-                self._client.policy_set(new_policy, user=access_key)
-                self.user_object = self._client.user_info(access_key)
-                changed = True
 
-        if options["state"] == "disabled" and self.user_object["status"] != "disabled":
-            if self._module.check_mode:
-                return True
+def reconcile_users(module, client, users, state, workers):
+    desired = {}
+    for user in users:
+        desired[user["access_key"]] = dict(user, state=user["state"] or state)
 
-            self._client.user_disable(access_key)
-            self.user_object = self._client.user_info(access_key)
-            changed = True
-        elif options["state"] == "enabled" and self.user_object["status"] != "enabled":
-            if self._module.check_mode:
-                return True
+    snapshot = MinioUser(module, client).find_users(desired.keys())
 
-            self._client.user_enable(access_key)
-            self.user_object = self._client.user_info(access_key)
-            changed = True
+    results = minio_parallel(
+        lambda entry: reconcile_user(
+            module, client, snapshot.get(entry["access_key"]), entry
+        ),
+        desired.values(),
+        workers,
+    )
 
-        return changed
+    summary = dict(created=0, updated=0, removed=0, unchanged=0, failed=0)
+    for result in results:
+        if result.get("failed"):
+            summary["failed"] += 1
+        elif not result["actions"]:
+            summary["unchanged"] += 1
+        elif result["actions"][0] == "create":
+            summary["created"] += 1
+        elif result["actions"][0] == "remove":
+            summary["removed"] += 1
+        else:
+            summary["updated"] += 1
 
-    def delete_user(self, access_key):
-        self._client.user_remove(access_key)
+    return results, summary
 
 
-def main():
+def module_args():
     argument_spec = minio_argument_spec(
-        access_key=dict(type="str", required=True, no_log=True),
-        secret_key=dict(type="str", required=True, no_log=True),
+        access_key=dict(type="str", required=False, no_log=True),
+        secret_key=dict(type="str", required=False, no_log=True),
         policy=dict(type="str", required=False, default=None),
         force=dict(type="bool", required=False, default=False),
         state=dict(
             default="present", choices=["present", "absent", "enabled", "disabled"]
         ),
+        users=dict(
+            type="list",
+            elements="dict",
+            required=False,
+            options=dict(
+                access_key=dict(type="str", required=True, no_log=False),
+                secret_key=dict(type="str", required=False, no_log=True),
+                policy=dict(type="str", required=False, default=None),
+                force=dict(type="bool", required=False, default=False),
+                state=dict(
+                    type="str",
+                    required=False,
+                    choices=["present", "absent", "enabled", "disabled"],
+                ),
+            ),
+        ),
+        workers=dict(type="int", required=False, default=8),
+    )
+    return dict(
+        argument_spec=argument_spec,
+        supports_check_mode=True,
+        mutually_exclusive=[("access_key", "users")],
+        required_one_of=[("access_key", "users")],
+        required_together=[("access_key", "secret_key")],
     )
-    module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True)
 
+
+def run_module(module):
     access_key = module.params["access_key"]
     secret_key = module.params["secret_key"]
     policy = module.params["policy"]
     force = module.params["force"]
     state = module.params["state"]
+    users = module.params["users"]
+    workers = module.params["workers"]
 
     changed = False
 
     client = minio_admin_client(module)
 
+    if users is not None:
+        for user in users:
+            if (user["state"] or state) != "absent" and user["secret_key"] is None:
+                module.fail_json(
+                    msg="secret_key is required for user %s" % user["access_key"]
+                )
+
+        results, summary = reconcile_users(module, client, users, state, workers)
+        changed = any(result["changed"] for result in results)
+        if summary["failed"]:
+            module.fail_json(
+                msg="Failed to reconcile %d user(s)" % summary["failed"],
+                changed=changed,
+                users=results,
+                summary=summary,
+            )
+        module.exit_json(changed=changed, users=results, summary=summary)
+
     minio_user = MinioUser(module, client)
 
     exists = minio_user.user_exists(access_key)
@@ -229,5 +408,10 @@ def main():
     module.exit_json(changed=changed)
 
 
+def main():
+    module = AnsibleModule(**module_args())
+    run_module(module)
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: Josh Williams <jdubz@dubzland.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import threading
+import time
+import traceback
+
+from ansible.module_utils.common.arg_spec import ArgumentSpecValidator
+from ansible.module_utils.common.parameters import remove_values
+from ansible.module_utils.common.text.converters import to_native
+from ansible.module_utils.parsing.convert_bool import boolean
+from ansible.plugins.action import ActionBase
+
+from ansible_collections.dubzland.minio.plugins.module_utils.minio import (
+    minio_http_client,
+    python_minio_installed,
+)
+
+# Seconds a cached connection pool may sit unused before it is closed
+CLIENT_IDLE_TIMEOUT = 300
+
+
+class MinioClientCache:
+    """Process-wide cache of Minio clients.
+
+    Clients are keyed by server url and access key, and share one connection
+    pool per key, so the items of a loop, which run in the same worker
+    process, reuse warm connections.  Entries unused for longer than
+    idle_timeout are evicted, and an entry is rebuilt when any of its other
+    auth options change.
+    """
+
+    def __init__(self, idle_timeout=CLIENT_IDLE_TIMEOUT):
+        self._idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def client(self, kind, module, factory):
+        auth = module.params["auth"]
+        key = (auth["url"], auth["access_key"])
+        options = sorted(auth.items())
+        now = time.monotonic()
+
+        with self._lock:
+            self._evict(now)
+
+            entry = self._entries.get(key)
+            if entry is None or entry["options"] != options:
+                if entry is not None:
+                    entry["pool"].clear()
+                entry = dict(
+                    pool=minio_http_client(module), options=options, clients={}
+                )
+                self._entries[key] = entry
+
+            entry["used"] = now
+            if kind not in entry["clients"]:
+                entry["clients"][kind] = factory(entry["pool"])
+
+            return entry["clients"][kind]
+
+    def clear(self):
+        with self._lock:
+            for entry in self._entries.values():
+                entry["pool"].clear()
+            self._entries = {}
+
+    def _evict(self, now):
+        for key, entry in list(self._entries.items()):
+            if now - entry["used"] > self._idle_timeout:
+                entry["pool"].clear()
+                del self._entries[key]
+
+
+CLIENT_CACHE = MinioClientCache()
+
+
+class ModuleExit(Exception):
+    def __init__(self, result):
+        super(ModuleExit, self).__init__(result.get("msg"))
+        self.result = result
+
+
+class ControllerModule:
+    """Stands in for AnsibleModule when a module runs inside the controller."""
+
+    client_cache = CLIENT_CACHE
+
+    def __init__(self, params, check_mode=False):
+        self.params = params
+        self.check_mode = check_mode
+        self.warnings = []
+
+    def warn(self, warning):
+        self.warnings.append(warning)
+
+    def exit_json(self, **kwargs):
+        kwargs.setdefault("changed", False)
+        raise ModuleExit(self._result(kwargs))
+
+    def fail_json(self, msg, **kwargs):
+        kwargs.update(msg=msg, failed=True)
+        raise ModuleExit(self._result(kwargs))
+
+    def _result(self, result):
+        if self.warnings:
+            result["warnings"] = self.warnings
+        return result
+
+
+def no_log_values(argument_spec, params):
+    """Return the values of the no_log options in params, and in their
+    suboptions, as AnsibleModule collects them for masking."""
+    values = set()
+    for name, spec in argument_spec.items():
+        value = params.get(name)
+        if value is None:
+            continue
+
+        if spec.get("no_log"):
+            values.add(to_native(value))
+
+        if spec.get("options"):
+            for item in value if isinstance(value, list) else [value]:
+                if isinstance(item, dict):
+                    values.update(no_log_values(spec["options"], item))
+
+    return values
+
+
+def run_on_controller(module, args, check_mode=False):
+    """Run a module's run_module() in this process and return its result.
+
+    The arguments are validated against the module's own argument spec, and
+    no_log values are masked in the result, as AnsibleModule would do.
+    """
+    kwargs = module.module_args()
+    argument_spec = kwargs.pop("argument_spec")
+    supports_check_mode = kwargs.pop("supports_check_mode", False)
+
+    validator = ArgumentSpecValidator(argument_spec, **kwargs)
+    validated = validator.validate(args)
+
+    if validated.error_messages:
+        return dict(
+            failed=True,
+            msg="; ".join(validated.error_messages),
+        )
+
+    if check_mode and not supports_check_mode:
+        return dict(skipped=True, msg="remote module does not support check mode")
+
+    controller_module = ControllerModule(
+        validated.validated_parameters, check_mode=check_mode
+    )
+
+    try:
+        module.run_module(controller_module)
+        result = dict(changed=False)
+    except ModuleExit as e:
+        result = e.result
+    except Exception as e:
+        result = dict(
+            failed=True,
+            msg="Unhandled error: %s" % to_native(e),
+            exception=traceback.format_exc(),
+        )
+
+    return remove_values(
+        result, no_log_values(argument_spec, validated.validated_parameters)
+    )
+
+
+class MinioActionBase(ActionBase):
+    """Runs a Minio module inside the controller when the task is local.
+
+    When the C(minio_controller_execution) variable is true, tasks using a
+    local connection (for example C(delegate_to: localhost)) run the module's
+    logic in the controller process, skipping AnsiballZ and sharing clients
+    through CLIENT_CACHE.  Otherwise, or when minio cannot be imported by
+    the controller, the module is executed on the target as usual, with its
+    ansible_python_interpreter.
+    """
+
+    TRANSFERS_FILES = False
+
+    # The module (from plugins/modules) implementing this action
+    module = None
+
+    def _run_on_controller(self, task_vars):
+        if not boolean(task_vars.get("minio_controller_execution", False)):
+            return False
+
+        if not python_minio_installed:
+            return False
+
+        return self._connection.transport in ("local", "ansible.builtin.local")
+
+    def run(self, tmp=None, task_vars=None):
+        task_vars = task_vars or {}
+
+        result = super(MinioActionBase, self).run(tmp, task_vars)
+        del tmp
+
+        if not self._run_on_controller(task_vars):
+            result.update(self._execute_module(task_vars=task_vars))
+            return result
+
+        result.update(
+            run_on_controller(
+                self.module, self._task.args, check_mode=self._task.check_mode
+            )
+        )
+        return result
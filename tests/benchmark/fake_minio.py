@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: Josh Williams <jdubz@dubzland.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""In-process stand-in for the parts of the Minio S3 and admin APIs used by
+the modules in this collection.
+
+Requests are not authenticated, and only the state the modules observe is
+kept: buckets, users with their status and policy, and policy documents.
+Every request is counted, along with the body bytes sent in each direction,
+so the cost of a module invocation can be measured without a real server.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import collections
+import io
+import json
+import threading
+
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+from xml.sax.saxutils import escape
+
+from minio.crypto import DecryptReader, encrypt
+
+ADMIN_PREFIX = "/minio/admin/v3/"
+S3_NS = "http://s3.amazonaws.com/doc/2006-03-01/"
+
+
+class _Body:
+    """Lets DecryptReader consume a request body as if it were a response."""
+
+    def __init__(self, data):
+        self._data = io.BytesIO(data)
+
+    def read(self, size=-1):
+        return self._data.read(size)
+
+    def close(self):
+        pass
+
+    def release_conn(self):
+        pass
+
+
+class FakeMinio:
+    def __init__(self, access_key="minioadmin", secret_key="minioadmin"):
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.buckets = {}
+        self.users = {}
+        self.policies = {}
+        self._lock = threading.Lock()
+        self._server = None
+        self.reset_stats()
+
+    # State
+
+    def add_buckets(self, names):
+        created = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+        for name in names:
+            self.buckets[name] = created
+
+    def add_users(self, names, policy=None):
+        for name in names:
+            self.users[name] = {"status": "enabled"}
+            if policy:
+                self.users[name]["policyName"] = policy
+
+    def add_policies(self, documents):
+        self.policies.update(documents)
+
+    # Statistics
+
+    def reset_stats(self):
+        self.requests = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.calls = collections.Counter()
+
+    def stats(self):
+        return dict(
+            requests=self.requests,
+            bytes_in=self.bytes_in,
+            bytes_out=self.bytes_out,
+            calls=dict(self.calls),
+        )
+
+    def record(self, api, bytes_in, bytes_out):
+        with self._lock:
+            self.requests += 1
+            self.bytes_in += bytes_in
+            self.bytes_out += bytes_out
+            self.calls[api] += 1
+
+    # Server
+
+    @property
+    def url(self):
+        return "http://127.0.0.1:%d" % self._server.server_address[1]
+
+    def start(self):
+        fake = self
+
+        class Handler(MinioHandler):
+            minio = fake
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class MinioHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    minio = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.dispatch("GET")
+
+    def do_HEAD(self):
+        self.dispatch("HEAD")
+
+    def do_PUT(self):
+        self.dispatch("PUT")
+
+    def do_POST(self):
+        self.dispatch("POST")
+
+    def do_DELETE(self):
+        self.dispatch("DELETE")
+
+    def dispatch(self, method):
+        url = urlsplit(self.path)
+        query = dict((k, v[0]) for k, v in parse_qs(url.query, True).items())
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+
+        if url.path.startswith(ADMIN_PREFIX):
+            api = url.path[len(ADMIN_PREFIX) :]
+            status, payload = self.admin(method, api, query, body)
+        else:
+            bucket = unquote(url.path.strip("/"))
+            api = "%s %s" % (method, "bucket" if bucket else "service")
+            status, payload = self.s3(method, bucket, query)
+
+        self.minio.record(api, len(body), len(payload))
+
+        self.send_response(status)
+        if payload.startswith(b"<"):
+            self.send_header("Content-Type", "application/xml")
+        else:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        if method != "HEAD":
+            self.wfile.write(payload)
+
+    # Admin API
+
+    def admin_error(self, code):
+        return 404, json.dumps({"Code": code, "Message": code}).encode()
+
+    def decrypt(self, body):
+        with DecryptReader(_Body(body), self.minio.secret_key.encode()) as reader:
+            return json.loads(b"".join(reader.stream()))
+
+    def admin(self, method, api, query, body):
+        minio = self.minio
+
+        if api == "list-users":
+            users = json.dumps(minio.users).encode()
+            return 200, encrypt(users, minio.secret_key)
+        if api == "user-info":
+            user = minio.users.get(query.get("accessKey"))
+            if user is None:
+                return self.admin_error("XMinioAdminNoSuchUser")
+            return 200, json.dumps(user).encode()
+        if api == "add-user":
+            user = minio.users.setdefault(query["accessKey"], {})
+            user["status"] = "enabled"
+            return 200, b""
+        if api == "remove-user":
+            minio.users.pop(query["accessKey"], None)
+            return 200, b""
+        if api == "set-user-status":
+            user = minio.users.get(query["accessKey"])
+            if user is None:
+                return self.admin_error("XMinioAdminNoSuchUser")
+            user["status"] = query["status"]
+            return 200, b""
+        if api == "set-user-or-group-policy":
+            user = minio.users.get(query["userOrGroup"])
+            if user is None:
+                return self.admin_error("XMinioAdminNoSuchUser")
+            user["policyName"] = query["policyName"]
+            return 200, b""
+        if api in ("idp/builtin/policy/attach", "idp/builtin/policy/detach"):
+            request = self.decrypt(body)
+            user = minio.users.get(request.get("user"))
+            if user is None:
+                return self.admin_error("XMinioAdminNoSuchUser")
+            policies = set(filter(None, user.get("policyName", "").split(",")))
+            if api.endswith("attach"):
+                policies.update(request["policies"])
+            else:
+                policies.difference_update(request["policies"])
+            user["policyName"] = ",".join(sorted(policies))
+            if not policies:
+                del user["policyName"]
+            return 204, b""
+        if api == "list-canned-policies":
+            return 200, json.dumps(minio.policies).encode()
+        if api == "info-canned-policy":
+            name = query.get("name")
+            if name not in minio.policies:
+                return self.admin_error("XMinioAdminNoSuchPolicy")
+            return (
+                200,
+                json.dumps(
+                    {"PolicyName": name, "Policy": minio.policies[name]}
+                ).encode(),
+            )
+        if api == "add-canned-policy":
+            minio.policies[query["name"]] = json.loads(body)
+            return 200, b""
+        if api == "remove-canned-policy":
+            minio.policies.pop(query["name"], None)
+            return 200, b""
+
+        return 400, json.dumps({"Code": "NotImplemented", "Message": api}).encode()
+
+    # S3 API
+
+    def s3_error(self, status, code):
+        return (
+            status,
+            (
+                "<Error><Code>%s</Code><Message>%s</Message>"
+                "<Resource>/</Resource><RequestId>1</RequestId></Error>" % (code, code)
+            ).encode(),
+        )
+
+    def s3(self, method, bucket, query):
+        buckets = self.minio.buckets
+
+        if not bucket:
+            entries = "".join(
+                "<Bucket><Name>%s</Name><CreationDate>%s</CreationDate></Bucket>"
+                % (escape(name), created)
+                for name, created in sorted(buckets.items())
+            )
+            return (
+                200,
+                (
+                    '<ListAllMyBucketsResult xmlns="%s"><Owner><ID>minio</ID></Owner>'
+                    "<Buckets>%s</Buckets></ListAllMyBucketsResult>" % (S3_NS, entries)
+                ).encode(),
+            )
+
+        if method == "PUT":
+            if bucket in buckets:
+                return self.s3_error(409, "BucketAlreadyOwnedByYou")
+            self.minio.add_buckets([bucket])
+            return 200, b""
+
+        if bucket not in buckets:
+            if method == "HEAD":
+                return 404, b""
+            return self.s3_error(404, "NoSuchBucket")
+
+        if method == "HEAD":
+            return 200, b""
+        if method == "DELETE":
+            del buckets[bucket]
+            return 204, b""
+        if "location" in query:
+            return (
+                200,
+                (
+                    '<LocationConstraint xmlns="%s">us-east-1</LocationConstraint>'
+                    % S3_NS
+                ).encode(),
+            )
+        if query.get("list-type") == "2" or "versions" in query:
+            tag = "ListVersionsResult" if "versions" in query else "ListBucketResult"
+            return (
+                200,
+                (
+                    '<%s xmlns="%s"><Name>%s</Name><IsTruncated>false</IsTruncated></%s>'
+                    % (tag, S3_NS, escape(bucket), tag)
+                ).encode(),
+            )
+
+        return self.s3_error(501, "NotImplemented")
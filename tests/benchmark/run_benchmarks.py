@@ -0,0 +1,291 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: Josh Williams <jdubz@dubzland.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Measures how module invocations scale with the size of the server.
+
+Each scenario seeds an in-process FakeMinio with N buckets, users or
+policies, runs one module invocation that leaves everything unchanged, and
+records its wall time, request count and body bytes transferred.  Modules
+run inside this process through run_on_controller(), with a cold client
+cache, so no AnsiballZ overhead is included.
+
+Results are appended to a JSON lines history file, and compared with the
+previous run recorded there (or with --baseline).  Any increase in the
+number of requests, more than 10% growth in bytes transferred, or a wall
+time above --max-slowdown times the baseline is reported as a regression,
+and the script exits non-zero.
+
+Run from the collection root, with the collection on the Python path:
+
+    python -m ansible_collections.dubzland.minio.tests.benchmark.run_benchmarks \\
+        --scales 10,1000,100000
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import minio
+
+from ansible_collections.dubzland.minio.plugins.modules import (
+    minio_bucket,
+    minio_policy,
+    minio_user,
+)
+from ansible_collections.dubzland.minio.plugins.plugin_utils.minio import (
+    CLIENT_CACHE,
+    run_on_controller,
+)
+from ansible_collections.dubzland.minio.tests.benchmark.fake_minio import FakeMinio
+
+DEFAULT_HISTORY = os.path.join(os.path.dirname(__file__), "history.jsonl")
+
+STATEMENT = {
+    "effect": "Allow",
+    "action": ["s3:GetObject"],
+    "resource": ["arn:aws:s3:::bucket/*"],
+}
+DOCUMENT = {
+    "Version": "2012-10-17",
+    "Statement": [
+        {
+            "Effect": "Allow",
+            "Action": ["s3:GetObject"],
+            "Resource": ["arn:aws:s3:::bucket/*"],
+        }
+    ],
+}
+
+
+def names(kind, scale):
+    return ["%s-%06d" % (kind, n) for n in range(scale)]
+
+
+def bucket_single(fake, scale):
+    fake.add_buckets(names("bucket", scale))
+    return minio_bucket, {"name": "bucket-000000"}
+
+
+def bucket_bulk(fake, scale):
+    fake.add_buckets(names("bucket", scale))
+    return minio_bucket, {"buckets": [{"name": n} for n in names("bucket", scale)]}
+
+
+def user_single(fake, scale):
+    fake.add_users(names("user", scale), policy="readwrite")
+    return minio_user, {
+        "access_key": "user-000000",
+        "secret_key": "supersekret",
+        "policy": "readwrite",
+    }
+
+
+def user_bulk(fake, scale):
+    fake.add_users(names("user", scale), policy="readwrite")
+    return minio_user, {
+        "users": [
+            {"access_key": n, "secret_key": "supersekret", "policy": "readwrite"}
+            for n in names("user", scale)
+        ]
+    }
+
+
+def policy_single(fake, scale):
+    fake.add_policies(dict((n, DOCUMENT) for n in names("policy", scale)))
+    return minio_policy, {"name": "policy-000000", "statements": [STATEMENT]}
+
+
+def policy_bulk(fake, scale):
+    fake.add_policies(dict((n, DOCUMENT) for n in names("policy", scale)))
+    return minio_policy, {
+        "policies": [
+            {"name": n, "statements": [STATEMENT]} for n in names("policy", scale)
+        ]
+    }
+
+
+SCENARIOS = [
+    bucket_single,
+    bucket_bulk,
+    user_single,
+    user_bulk,
+    policy_single,
+    policy_bulk,
+]
+
+
+def run_scenario(scenario, scale):
+    with FakeMinio() as fake:
+        module, args = scenario(fake, scale)
+        args["auth"] = {
+            "url": fake.url,
+            "access_key": fake.access_key,
+            "secret_key": fake.secret_key,
+            "region": "us-east-1",
+        }
+
+        CLIENT_CACHE.clear()
+        fake.reset_stats()
+        start = time.perf_counter()
+        result = run_on_controller(module, args)
+        wall = time.perf_counter() - start
+        CLIENT_CACHE.clear()
+
+    if result.get("failed") or result.get("changed"):
+        raise RuntimeError(
+            "%s at %d did not leave the server unchanged: %s"
+            % (scenario.__name__, scale, result.get("msg", result))
+        )
+
+    return dict(
+        scenario=scenario.__name__,
+        scale=scale,
+        wall_ms=round(wall * 1000, 3),
+        **fake.stats()
+    )
+
+
+def git_revision():
+    try:
+        return (
+            subprocess.check_output(
+                ["git", "rev-parse", "--short", "HEAD"],
+                cwd=os.path.dirname(__file__),
+                stderr=subprocess.DEVNULL,
+            )
+            .decode()
+            .strip()
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_last(path):
+    try:
+        with open(path) as f:
+            lines = [line for line in f if line.strip()]
+    except IOError:
+        return None
+    return json.loads(lines[-1]) if lines else None
+
+
+def regressions(current, baseline, max_slowdown):
+    previous = dict(
+        ((r["scenario"], r["scale"]), r) for r in (baseline or {}).get("results", [])
+    )
+
+    found = []
+    for result in current["results"]:
+        before = previous.get((result["scenario"], result["scale"]))
+        if before is None:
+            continue
+
+        label = "%s@%d" % (result["scenario"], result["scale"])
+        if result["requests"] > before["requests"]:
+            found.append(
+                "%s: %d requests, was %d"
+                % (label, result["requests"], before["requests"])
+            )
+        for key in ("bytes_in", "bytes_out"):
+            if result[key] > before[key] * 1.1 + 1024:
+                found.append(
+                    "%s: %s %d, was %d" % (label, key, result[key], before[key])
+                )
+        if result["wall_ms"] > before["wall_ms"] * max_slowdown + 5:
+            found.append(
+                "%s: %.1f ms, was %.1f ms"
+                % (label, result["wall_ms"], before["wall_ms"])
+            )
+
+    return found
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--scales",
+        default="10,1000",
+        help="comma separated entity counts (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=[s.__name__ for s in SCENARIOS],
+        help="run only the given scenario (may be repeated)",
+    )
+    parser.add_argument("--history", default=DEFAULT_HISTORY)
+    parser.add_argument(
+        "--baseline",
+        help="results to compare against (default: last run in --history)",
+    )
+    parser.add_argument("--max-slowdown", type=float, default=2.0)
+    parser.add_argument(
+        "--no-record",
+        action="store_true",
+        help="do not append this run to --history",
+    )
+    args = parser.parse_args(argv)
+
+    scales = [int(scale) for scale in args.scales.split(",")]
+    scenarios = [
+        s for s in SCENARIOS if not args.scenario or s.__name__ in args.scenario
+    ]
+
+    current = dict(
+        timestamp=datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        revision=git_revision(),
+        python=platform.python_version(),
+        minio=minio.__version__,
+        results=[],
+    )
+
+    print(
+        "%-14s %8s %10s %9s %12s %12s"
+        % ("scenario", "scale", "wall ms", "requests", "bytes in", "bytes out")
+    )
+    for scenario in scenarios:
+        for scale in scales:
+            result = run_scenario(scenario, scale)
+            current["results"].append(result)
+            print(
+                "%-14s %8d %10.1f %9d %12d %12d"
+                % (
+                    result["scenario"],
+                    result["scale"],
+                    result["wall_ms"],
+                    result["requests"],
+                    result["bytes_in"],
+                    result["bytes_out"],
+                )
+            )
+
+    baseline = load_last(args.baseline or args.history)
+    found = regressions(current, baseline, args.max_slowdown)
+
+    if not args.no_record:
+        with open(args.history, "a") as f:
+            f.write(json.dumps(current, sort_keys=True) + "\n")
+
+    if found:
+        print("\nRegressions against %s:" % (baseline.get("revision") or "baseline"))
+        for regression in found:
+            print("  " + regression)
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: Josh Williams <jdubz@dubzland.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+
+import pytest
+
+from ansible_collections.dubzland.minio.tests.unit.compat.mock import MagicMock
+
+from ansible_collections.dubzland.minio.plugins.callback import minio_timings
+
+
+def timings(api, latencies, errors=0):
+    return dict(
+        elapsed_ms=sum(latencies) + 10,
+        request_ms=sum(latencies),
+        apis={
+            api: dict(
+                calls=len(latencies),
+                requests=len(latencies),
+                errors=errors,
+                retries=0,
+                bytes=100 * len(latencies),
+                call_ms=sum(latencies),
+                total_ms=sum(latencies),
+            )
+        },
+        requests=[
+            dict(api=api, method="GET", latency_ms=ms, status=200, retries=0, size=100)
+            for ms in latencies
+        ],
+        dropped=0,
+    )
+
+
+def task_result(host, action, result, uuid="task-1"):
+    task_result = MagicMock()
+    task_result._host.get_name.return_value = host
+    task_result._task._uuid = uuid
+    task_result._task.action = action
+    task_result._result = result
+    return task_result
+
+
+@pytest.fixture()
+def callback(mocker, tmp_path):
+    callback = minio_timings.CallbackModule()
+    options = {"top": 20, "output_file": str(tmp_path / "timings.json")}
+    mocker.patch.object(callback, "get_option", side_effect=lambda key: options[key])
+    callback._display = MagicMock()
+    return callback
+
+
+def test_aggregates_timings_per_host_module_and_api(callback, tmp_path):
+    host = MagicMock()
+    host.get_name.return_value = "minio1"
+    task = MagicMock(_uuid="task-1")
+    callback.v2_runner_on_start(host, task)
+
+    callback.v2_runner_on_ok(
+        task_result(
+            "minio1",
+            "dubzland.minio.minio_user",
+            dict(
+                changed=False,
+                results=[
+                    dict(timings=timings("user_info", [10.0, 30.0])),
+                    dict(timings=timings("user_info", [20.0])),
+                ],
+            ),
+        )
+    )
+    callback.v2_runner_on_failed(
+        task_result(
+            "minio1",
+            "minio_bucket",
+            dict(failed=True, timings=timings("list_buckets", [5.0], errors=1)),
+            uuid="task-2",
+        )
+    )
+    callback.v2_runner_on_ok(task_result("minio1", "ansible.builtin.debug", {}))
+
+    report = callback.report()
+
+    assert [(m["module"], m["tasks"]) for m in report["modules"]] == [
+        ("minio_bucket", 1),
+        ("minio_user", 1),
+    ]
+    user = report["modules"][1]
+    assert user["request_ms"] == 60.0
+    assert user["module_ms"] == 80.0
+    assert user["wall_ms"] > 0
+
+    assert [api["api"] for api in report["apis"]] == ["user_info", "list_buckets"]
+    user_info = report["apis"][0]
+    assert user_info["calls"] == 3
+    assert user_info["bytes"] == 300
+    assert user_info["latency_ms"]["p50"] == 20.0
+    assert user_info["latency_ms"]["max"] == 30.0
+    assert report["apis"][1]["errors"] == 1
+
+    callback.v2_playbook_on_stats(MagicMock())
+
+    callback._display.banner.assert_called_once_with("MINIO TIMINGS")
+    with open(str(tmp_path / "timings.json")) as f:
+        assert json.load(f) == report
+
+
+def test_reports_nothing_without_timings(callback):
+    callback.v2_runner_on_ok(
+        task_result("minio1", "dubzland.minio.minio_bucket", dict(changed=False))
+    )
+
+    callback.v2_playbook_on_stats(MagicMock())
+
+    assert not callback._display.banner.called
+
+
+@pytest.mark.parametrize(
+    "handler", ["v2_runner_on_skipped", "v2_runner_on_unreachable"]
+)
+def test_forgets_tasks_which_did_not_run(callback, handler):
+    host = MagicMock()
+    host.get_name.return_value = "minio1"
+    callback.v2_runner_on_start(host, MagicMock(_uuid="task-1"))
+
+    getattr(callback, handler)(
+        task_result("minio1", "dubzland.minio.minio_bucket", dict(skipped=True))
+    )
+
+    assert callback._started == {}
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: Josh Williams <jdubz@dubzland.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import pytest
+
+from ansible.errors import AnsibleFilterError
+
+from ansible_collections.dubzland.minio.plugins.filter.minio_pools import (
+    minio_expand,
+    minio_pools,
+)
+
+
+def test_expand_ranges():
+    assert minio_expand("/mnt/drive{1...3}/minio") == [
+        "/mnt/drive1/minio",
+        "/mnt/drive2/minio",
+        "/mnt/drive3/minio",
+    ]
+
+
+def test_expand_zero_padded_ranges():
+    assert minio_expand("minio{08...10}")[:3] == ["minio08", "minio09", "minio10"]
+
+
+def test_expand_multiple_ranges():
+    assert minio_expand("rack{1...2}-node{1...2}") == [
+        "rack1-node1",
+        "rack1-node2",
+        "rack2-node1",
+        "rack2-node2",
+    ]
+
+
+def test_expand_without_ranges():
+    assert minio_expand("/srv/minio") == ["/srv/minio"]
+
+
+def test_expand_rejects_reversed_ranges():
+    with pytest.raises(AnsibleFilterError, match="greater than the end"):
+        minio_expand("minio{4...1}")
+
+
+def test_distributed_pool():
+    layout = minio_pools(
+        [dict(hosts="minio{1...16}.example.net", drives="/mnt/drive{1...12}/minio")]
+    )
+
+    assert layout == [
+        dict(
+            hosts=["minio%d.example.net" % n for n in range(1, 17)],
+            drives=["/mnt/drive%d/minio" % n for n in range(1, 13)],
+            volumes="http://minio{1...16}.example.net:9000/mnt/drive{1...12}/minio",
+            drive_count=192,
+            set_size=16,
+            set_count=12,
+            parity=4,
+            write_quorum=12,
+            max_unavailable_hosts=4,
+        )
+    ]
+
+
+def test_lists_are_written_in_expansion_notation():
+    layout = minio_pools(
+        [
+            dict(
+                hosts=["minio01", "minio02", "minio03", "minio04"],
+                drives=["/data1", "/data2"],
+            )
+        ],
+        scheme="https",
+        port=9443,
+    )
+
+    assert layout[0]["volumes"] == "https://minio{01...04}:9443/data{1...2}"
+    # Each 8 drive set has 2 drives on every host
+    assert layout[0]["set_size"] == 8
+    # Half of each set is parity, so writes need 5 of its drives
+    assert layout[0]["write_quorum"] == 5
+    assert layout[0]["max_unavailable_hosts"] == 1
+
+
+def test_multiple_pools():
+    layout = minio_pools(
+        [
+            dict(hosts="minio{1...4}", drives="/data{1...4}"),
+            dict(hosts="minio{5...12}", drives="/data{1...8}"),
+        ]
+    )
+
+    assert [pool["volumes"] for pool in layout] == [
+        "http://minio{1...4}:9000/data{1...4}",
+        "http://minio{5...12}:9000/data{1...8}",
+    ]
+    assert [pool["set_size"] for pool in layout] == [16, 16]
+
+
+def test_single_node_drives():
+    layout = minio_pools([dict(drives="/mnt/drive{1...4}")])
+
+    assert layout[0]["volumes"] == "/mnt/drive{1...4}"
+    assert layout[0]["parity"] == 2
+    assert layout[0]["max_unavailable_hosts"] == 0
+
+
+def test_single_drive():
+    layout = minio_pools([dict(drives="/srv/minio")])
+
+    assert layout[0]["volumes"] == "/srv/minio"
+    assert layout[0]["set_size"] == 1
+    assert layout[0]["parity"] == 0
+
+
+def test_explicit_parity():
+    layout = minio_pools([dict(hosts="minio{1...4}", drives="/data{1...4}")], parity=2)
+
+    assert layout[0]["parity"] == 2
+    assert layout[0]["write_quorum"] == 14
+    assert layout[0]["max_unavailable_hosts"] == 0
+
+
+def test_parity_is_checked_against_every_pool():
+    with pytest.raises(AnsibleFilterError, match="EC:4 parity is invalid for pool 2"):
+        minio_pools(
+            [
+                dict(hosts="minio{1...4}", drives="/data{1...4}"),
+                dict(hosts="minio{5...6}", drives="/data{1...3}"),
+            ]
+        )
+
+
+@pytest.mark.parametrize(
+    "pool",
+    [
+        dict(hosts="minio{1...17}", drives="/data"),
+        dict(drives="/data{1...17}"),
+    ],
+)
+def test_unbalanced_pools_are_rejected(pool):
+    with pytest.raises(AnsibleFilterError, match="cannot be split into erasure sets"):
+        minio_pools([pool])
+
+
+def test_hosts_must_be_consecutive():
+    with pytest.raises(AnsibleFilterError, match="expansion notation"):
+        minio_pools([dict(hosts=["minio1", "minio3"], drives="/data{1...4}")])
+
+
+def test_drives_must_be_absolute():
+    with pytest.raises(AnsibleFilterError, match="not an absolute path"):
+        minio_pools([dict(hosts="minio{1...4}", drives="data{1...4}")])
+
+
+def test_drives_cannot_be_shared_by_pools():
+    with pytest.raises(AnsibleFilterError, match="already used by another pool"):
+        minio_pools(
+            [
+                dict(hosts="minio{1...4}", drives="/data{1...4}"),
+                dict(hosts="minio{4...7}", drives="/data{1...4}"),
+            ]
+        )
+
+
+def test_pools_cannot_mix_hosts_and_local_drives():
+    with pytest.raises(AnsibleFilterError, match="all pools or none"):
+        minio_pools(
+            [
+                dict(hosts="minio{1...4}", drives="/data{1...4}"),
+                dict(drives="/data{5...8}"),
+            ]
+        )
+
+
+def test_pools_must_list_drives():
+    with pytest.raises(AnsibleFilterError, match="does not list its drives"):
+        minio_pools([dict(hosts="minio{1...4}")])
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: Josh Williams <jdubz@dubzland.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import os
+
+import pytest
+
+from ansible.errors import AnsibleError
+from minio.error import InvalidResponseError, S3Error, ServerError
+
+from ansible_collections.dubzland.minio.tests.unit.compat.mock import MagicMock
+
+from ansible_collections.dubzland.minio.plugins.lookup import minio_object
+
+
+def response(data, etag):
+    result = MagicMock()
+    result.headers = {"etag": '"%s"' % etag}
+    result.stream.return_value = iter([data[:3], data[3:]])
+    return result
+
+
+def not_modified():
+    return ServerError("server failed with HTTP status code 304", 304)
+
+
+@pytest.fixture()
+def client(mocker):
+    client = MagicMock()
+    mocker.patch.object(minio_object, "minio_client", return_value=client)
+    return client
+
+
+@pytest.fixture()
+def lookup(mocker, tmp_path):
+    lookup = minio_object.LookupModule()
+    options = {
+        "bucket": "configs",
+        "ttl": 0,
+        "cache_dir": str(tmp_path / "cache"),
+        "cache_size": 1024,
+        "encoding": "utf-8",
+        "auth": {
+            "access_key": "minioadmin",
+            "secret_key": "minioadmin",
+            "url": "http://minio-server:9000",
+        },
+    }
+    mocker.patch.object(lookup, "set_options")
+    mocker.patch.object(lookup, "get_option", side_effect=lambda key: options[key])
+    lookup.options = options
+    return lookup
+
+
+def test_lookup_fetches_and_caches(lookup, client):
+    client.get_object.return_value = response("héllo".encode("utf-8"), "abc")
+
+    assert lookup.run(["app.json"]) == ["héllo"]
+    client.get_object.assert_called_once_with(
+        "configs", "app.json", request_headers=None
+    )
+
+
+def test_lookup_revalidates_with_etag(lookup, client):
+    client.get_object.return_value = response(b"hello", "abc")
+    lookup.run(["app.json"])
+    client.get_object.reset_mock()
+    client.get_object.side_effect = not_modified()
+
+    assert lookup.run(["app.json"]) == ["hello"]
+    client.get_object.assert_called_once_with(
+        "configs", "app.json", request_headers={"If-None-Match": '"abc"'}
+    )
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        InvalidResponseError(304, "text/html", "<html></html>"),
+        S3Error(
+            response=MagicMock(status=304),
+            code="NotModified",
+            message=None,
+            resource=None,
+            request_id=None,
+            host_id=None,
+        ),
+    ],
+)
+def test_lookup_revalidates_with_a_response_body(lookup, client, error):
+    client.get_object.return_value = response(b"hello", "abc")
+    lookup.run(["app.json"])
+    client.get_object.reset_mock()
+    client.get_object.side_effect = error
+
+    assert lookup.run(["app.json"]) == ["hello"]
+    client.get_object.assert_called_once()
+
+
+def test_lookup_replaces_changed_object(lookup, client):
+    client.get_object.return_value = response(b"hello", "abc")
+    lookup.run(["app.json"])
+    client.get_object.return_value = response(b"world", "def")
+
+    assert lookup.run(["app.json"]) == ["world"]
+
+
+def test_lookup_skips_request_within_ttl(lookup, client):
+    lookup.options["ttl"] = 300
+    client.get_object.return_value = response(b"hello", "abc")
+    lookup.run(["app.json"])
+    client.get_object.reset_mock()
+
+    assert lookup.run(["app.json"]) == ["hello"]
+    client.get_object.assert_not_called()
+
+
+def test_lookup_raises_on_missing_object(lookup, client):
+    client.get_object.side_effect = Exception("Object does not exist")
+
+    with pytest.raises(AnsibleError, match="configs/missing"):
+        lookup.run(["missing"])
+
+
+def test_lookup_validates_auth(lookup, client):
+    del lookup.options["auth"]["url"]
+
+    with pytest.raises(AnsibleError, match="url"):
+        lookup.run(["app.json"])
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = minio_object.MinioObjectCache(str(tmp_path), 10)
+    auth = {"url": "url", "access_key": "key"}
+    first = cache.path(auth, "bucket", "first")
+    second = cache.path(auth, "bucket", "second")
+
+    cache.store(first, "a", [b"x" * 6])
+    os.utime(first, (0, 0))
+    cache.store(second, "b", [b"y" * 6])
+
+    assert cache.get(first) is None
+    assert not os.path.exists(first + ".checked")
+    assert cache.get(second)[0] == "b"
+
+
+def test_cache_is_separate_per_access_key(lookup, client):
+    client.get_object.return_value = response(b"secret", "a")
+    assert lookup.run(["app.json"]) == ["secret"]
+
+    lookup.options["ttl"] = 3600
+    lookup.options["auth"]["access_key"] = "readonly"
+    client.get_object.side_effect = Exception("Access Denied")
+
+    with pytest.raises(AnsibleError, match="Access Denied"):
+        lookup.run(["app.json"])
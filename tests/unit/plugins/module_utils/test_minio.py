@@ -0,0 +1,309 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: Josh Williams <jdubz@dubzland.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import pytest
+import urllib3
+
+from urllib3.exceptions import MaxRetryError, NewConnectionError, ReadTimeoutError
+
+from ansible_collections.dubzland.minio.tests.unit.compat.mock import MagicMock
+
+from ansible_collections.dubzland.minio.plugins.module_utils import minio as minio_utils
+
+
+@pytest.fixture()
+def mock_auth():
+    return {
+        "access_key": "minioadmin",
+        "secret_key": "minioadmin",
+        "url": "https://minio-server:9000",
+        "region": None,
+        "validate_certs": True,
+        "ca_cert": None,
+        "connect_timeout": 10,
+        "read_timeout": 300,
+        "max_pool_size": 10,
+        "keepalive": True,
+        "timings": False,
+        "retries": 5,
+        "retry_backoff": 0.2,
+        "retry_max_backoff": 20,
+        "circuit_breaker_threshold": 10,
+        "circuit_breaker_cooldown": 10,
+    }
+
+
+@pytest.fixture()
+def mock_module(mock_auth):
+    module = MagicMock()
+    module.params = {"auth": mock_auth}
+    module.client_cache = None
+    return module
+
+
+def test_http_client_uses_auth_options(mock_module, mock_auth):
+    mock_auth["connect_timeout"] = 2.5
+    mock_auth["read_timeout"] = 30
+    mock_auth["max_pool_size"] = 32
+    mock_auth["ca_cert"] = "/etc/ssl/minio-ca.pem"
+
+    pool = minio_utils.minio_http_client(mock_module)
+
+    assert pool.connection_pool_kw["maxsize"] == 32
+    assert pool.connection_pool_kw["timeout"].connect_timeout == 2.5
+    assert pool.connection_pool_kw["timeout"].read_timeout == 30
+    assert pool.connection_pool_kw["cert_reqs"] == "CERT_REQUIRED"
+    assert pool.connection_pool_kw["ca_certs"] == "/etc/ssl/minio-ca.pem"
+    assert "socket_options" in pool.connection_pool_kw
+
+
+def test_http_client_without_validation(mock_module, mock_auth):
+    mock_auth["validate_certs"] = False
+    mock_auth["keepalive"] = False
+
+    pool = minio_utils.minio_http_client(mock_module)
+
+    assert pool.connection_pool_kw["cert_reqs"] == "CERT_NONE"
+    assert "socket_options" not in pool.connection_pool_kw
+
+
+def test_minio_client_pins_region(mocker, mock_module, mock_auth):
+    mock_minio = mocker.patch.object(minio_utils.minio, "Minio")
+    mock_auth["region"] = "us-west-2"
+
+    minio_utils.minio_client(mock_module)
+
+    kwargs = mock_minio.call_args[1]
+    assert kwargs["region"] == "us-west-2"
+    assert kwargs["secure"] is True
+
+
+def test_clients_accept_http_client(mocker, mock_module):
+    mock_minio = mocker.patch.object(minio_utils.minio, "Minio")
+    mock_admin = mocker.patch.object(minio_utils.minio, "MinioAdmin")
+    http_client = MagicMock()
+
+    minio_utils.minio_client(mock_module, http_client=http_client)
+    minio_utils.minio_admin_client(mock_module, http_client=http_client)
+
+    assert mock_minio.call_args[1]["http_client"] is http_client
+    assert mock_admin.call_args[1]["http_client"] is http_client
+
+
+def test_lookup_treats_not_found_as_absent():
+    info = MagicMock(
+        side_effect=minio_utils.minio.error.MinioAdminException(
+            "404", '{"Code":"XMinioAdminNoSuchPolicy"}'
+        )
+    )
+    listing = MagicMock()
+
+    lookup = minio_utils.MinioLookup(info, listing)
+
+    assert lookup.get("missing") is None
+    listing.assert_not_called()
+
+
+def test_lookup_lists_once_above_threshold():
+    info = MagicMock()
+    listing = MagicMock(return_value='{"one": {"status": "enabled"}}')
+
+    lookup = minio_utils.MinioLookup(info, listing, list_threshold=1)
+
+    assert lookup.get_many(["one", "two"]) == {
+        "one": {"status": "enabled"},
+        "two": None,
+    }
+    listing.assert_called_once_with()
+    info.assert_not_called()
+
+
+def test_walk_objects_skips_directory_markers():
+    client = MagicMock()
+    marker = MagicMock(object_name="logs/", is_dir=False)
+    obj = MagicMock(object_name="logs/app.log", is_dir=False)
+    client.list_objects.return_value = iter([marker, obj])
+
+    assert list(minio_utils.minio_walk_objects(client, "bucket", "logs/")) == [obj]
+    client.list_objects.assert_called_once_with(
+        "bucket", prefix="logs/", recursive=True
+    )
+
+
+def test_remove_objects_batches_deletes():
+    client = MagicMock()
+    client.remove_objects.return_value = []
+    objects = [
+        MagicMock(object_name="obj-%d" % i, version_id=None)
+        for i in range(minio_utils.DELETE_BATCH_SIZE + 1)
+    ]
+
+    assert minio_utils.minio_remove_objects(client, "bucket", objects) == len(objects)
+    assert client.remove_objects.call_count == 2
+
+
+def http_response(status, headers=None):
+    response = MagicMock()
+    response.status = status
+    response.headers = headers or {}
+    response.data = b""
+    return response
+
+
+@pytest.fixture()
+def urlopen(mocker):
+    return mocker.patch.object(urllib3.PoolManager, "urlopen")
+
+
+@pytest.fixture()
+def sleep(mocker):
+    return mocker.patch.object(minio_utils.time, "sleep")
+
+
+def retrying_pool(total=3, threshold=0, cooldown=10.0, observer=None):
+    return minio_utils.MinioPoolManager(
+        minio_utils.RetryPolicy(total=total, backoff=0.1, max_backoff=5.0),
+        minio_utils.CircuitBreaker(threshold=threshold, cooldown=cooldown),
+        observer=observer,
+    )
+
+
+def test_throttled_requests_are_retried(urlopen, sleep):
+    observer = MagicMock()
+    urlopen.side_effect = [http_response(503), http_response(503), http_response(200)]
+
+    response = retrying_pool(observer=observer).urlopen("POST", "/", body=b"{}")
+
+    assert response.status == 200
+    assert urlopen.call_count == 3
+    assert sleep.call_count == 2
+    assert all(0 <= call[0][0] <= 0.2 for call in sleep.call_args_list)
+    assert observer.call_args[0][2:4] == (200, 2)
+
+
+def test_server_errors_are_only_retried_for_idempotent_methods(urlopen, sleep):
+    urlopen.return_value = http_response(500)
+
+    assert retrying_pool().urlopen("POST", "/").status == 500
+    assert urlopen.call_count == 1
+
+    assert retrying_pool().urlopen("GET", "/").status == 500
+    assert urlopen.call_count == 5
+
+
+def test_backoff_uses_full_jitter(mocker):
+    uniform = mocker.patch.object(minio_utils.random, "uniform", return_value=1.5)
+    policy = minio_utils.RetryPolicy(total=10, backoff=0.2, max_backoff=5.0)
+
+    assert policy.delay(2) == 1.5
+    uniform.assert_called_with(0, 0.8)
+    policy.delay(8)
+    uniform.assert_called_with(0, 5.0)
+
+
+def test_retry_after_is_honoured(urlopen, sleep):
+    urlopen.side_effect = [
+        http_response(503, {"Retry-After": "2"}),
+        http_response(429, {"Retry-After": "120"}),
+        http_response(200),
+    ]
+
+    retrying_pool().urlopen("GET", "/")
+
+    assert [call[0][0] for call in sleep.call_args_list] == [2.0, 5.0]
+
+
+def test_connection_errors_are_retried(urlopen, sleep):
+    pool = retrying_pool()
+    refused = MaxRetryError(
+        pool, "/", reason=NewConnectionError(None, "connection refused")
+    )
+    urlopen.side_effect = [refused, http_response(200)]
+
+    assert pool.urlopen("POST", "/").status == 200
+
+    urlopen.side_effect = [ReadTimeoutError(pool, "/", "read timed out")]
+    with pytest.raises(ReadTimeoutError):
+        pool.urlopen("POST", "/")
+
+
+def test_retries_are_bounded(urlopen, sleep):
+    observer = MagicMock()
+    urlopen.return_value = http_response(503)
+
+    assert retrying_pool(total=2, observer=observer).urlopen("GET", "/").status == 503
+    assert urlopen.call_count == 3
+    assert observer.call_args[0][2:4] == (503, 2)
+
+
+def test_circuit_breaker_opens_after_consecutive_failures(mocker):
+    monotonic = mocker.patch.object(minio_utils.time, "monotonic", return_value=100.0)
+    breaker = minio_utils.CircuitBreaker(threshold=2, cooldown=10)
+
+    breaker.failure()
+    assert not breaker.is_open
+    breaker.failure()
+    assert breaker.is_open
+    assert breaker.allow() is False
+
+    # After the cooldown a single probe is let through
+    monotonic.return_value = 110.0
+    assert breaker.allow() is True
+    assert breaker.allow() is False
+
+    breaker.success()
+    assert not breaker.is_open
+    assert breaker.allow() is True
+
+
+def test_failed_probe_reopens_circuit_breaker(mocker):
+    monotonic = mocker.patch.object(minio_utils.time, "monotonic", return_value=100.0)
+    breaker = minio_utils.CircuitBreaker(threshold=5, cooldown=10)
+    for n in range(5):
+        breaker.failure()
+
+    monotonic.return_value = 110.0
+    assert breaker.allow() is True
+    breaker.failure()
+
+    assert breaker.is_open
+    assert breaker.allow() is False
+
+
+def test_open_circuit_breaker_fails_fast(urlopen, sleep):
+    pool = retrying_pool(total=5, threshold=2, cooldown=60)
+    urlopen.return_value = http_response(503)
+
+    # The second failed attempt opens the breaker, stopping the retries
+    assert pool.urlopen("GET", "/").status == 503
+    assert urlopen.call_count == 2
+
+    with pytest.raises(minio_utils.CircuitOpenError):
+        pool.urlopen("GET", "/")
+    assert urlopen.call_count == 2
+    assert sleep.call_count == 1
+
+
+def test_disabled_circuit_breaker_never_opens():
+    breaker = minio_utils.CircuitBreaker(threshold=0, cooldown=10)
+    for n in range(100):
+        breaker.failure()
+
+    assert not breaker.is_open
+    assert breaker.allow() is True
+
+
+def test_circuit_breakers_are_shared_per_endpoint():
+    one = minio_utils.minio_circuit_breaker("https://minio-a:9000", 10, 10)
+    two = minio_utils.minio_circuit_breaker("https://minio-a:9000", 5, 30)
+
+    assert one is two
+    assert (two.threshold, two.cooldown) == (5, 30)
+    assert minio_utils.minio_circuit_breaker("https://minio-b:9000", 5, 30) is not one
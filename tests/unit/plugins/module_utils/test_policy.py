@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: Josh Williams <jdubz@dubzland.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ansible_collections.dubzland.minio.plugins.module_utils.policy import (
+    normalize_policy,
+    policies_equal,
+)
+
+
+def test_normalize_policy_defaults_version():
+    assert normalize_policy({"Statement": []}) == {
+        "Version": "2012-10-17",
+        "Statement": [],
+    }
+
+
+def test_policies_equal_ignores_string_vs_list():
+    desired = {
+        "Version": "2012-10-17",
+        "Statement": [
+            {
+                "Effect": "Allow",
+                "Action": ["s3:GetObject", "s3:PutObject"],
+                "Resource": ["arn:aws:s3:::bucket/*"],
+            }
+        ],
+    }
+    current = {
+        "Version": "2012-10-17",
+        "Statement": {
+            "Effect": "Allow",
+            "Action": ["s3:PutObject", "s3:GetObject", "s3:PutObject"],
+            "Resource": "arn:aws:s3:::bucket/*",
+        },
+    }
+
+    assert policies_equal(desired, current)
+
+
+def test_policies_equal_ignores_statement_order():
+    first = {"Effect": "Allow", "Action": "s3:GetObject", "Resource": "*"}
+    second = {"Effect": "Deny", "Action": "s3:DeleteObject", "Resource": "*"}
+
+    assert policies_equal(
+        {"Statement": [first, second]}, {"Statement": [second, first, second]}
+    )
+
+
+def test_policies_equal_normalizes_principal_and_condition():
+    desired = {
+        "Statement": [
+            {
+                "Sid": "",
+                "Effect": "Allow",
+                "Principal": "*",
+                "Action": "s3:GetObject",
+                "Resource": "arn:aws:s3:::bucket/*",
+                "Condition": {"IpAddress": {"aws:SourceIp": "10.0.0.0/8"}},
+            }
+        ]
+    }
+    current = {
+        "Version": "2012-10-17",
+        "Statement": [
+            {
+                "Effect": "Allow",
+                "Principal": {"AWS": ["*"]},
+                "Action": ["s3:GetObject"],
+                "Resource": ["arn:aws:s3:::bucket/*"],
+                "Condition": {"IpAddress": {"aws:SourceIp": ["10.0.0.0/8"]}},
+            }
+        ],
+    }
+
+    assert policies_equal(desired, current)
+
+
+def test_policies_differ_on_access():
+    allow = {"Statement": [{"Effect": "Allow", "Action": "s3:*", "Resource": "*"}]}
+    deny = {"Statement": [{"Effect": "Deny", "Action": "s3:*", "Resource": "*"}]}
+    narrower = {
+        "Statement": [{"Effect": "Allow", "Action": "s3:GetObject", "Resource": "*"}]
+    }
+
+    assert not policies_equal(allow, deny)
+    assert not policies_equal(allow, narrower)
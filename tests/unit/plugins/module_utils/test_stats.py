@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: Josh Williams <jdubz@dubzland.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ansible_collections.dubzland.minio.plugins.module_utils.stats import (
+    latency_summary,
+    percentile,
+)
+
+
+def test_percentile_nearest_rank():
+    samples = list(range(1, 1001))
+
+    assert percentile(samples, 50) == 500
+    assert percentile(samples, 99) == 990
+    assert percentile(samples, 99.9) == 999
+    assert percentile(samples, 0) == 1
+    assert percentile([], 50) is None
+
+
+def test_latency_summary_reports_milliseconds():
+    summary = latency_summary([0.003, 0.001, 0.002])
+
+    assert summary == {
+        "min": 1.0,
+        "max": 3.0,
+        "mean": 2.0,
+        "p50": 2.0,
+        "p90": 3.0,
+        "p99": 3.0,
+        "p999": 3.0,
+    }
+    assert latency_summary([]) == {}
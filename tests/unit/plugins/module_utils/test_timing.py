@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: Josh Williams <jdubz@dubzland.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import threading
+
+from ansible_collections.dubzland.minio.tests.unit.compat.mock import MagicMock
+
+from ansible_collections.dubzland.minio.plugins.module_utils import minio as minio_utils
+from ansible_collections.dubzland.minio.plugins.module_utils import timing
+
+
+def mock_module(timings):
+    module = MagicMock(spec=["params", "exit_json", "fail_json"])
+    module.params = {
+        "auth": {
+            "access_key": "minioadmin",
+            "secret_key": "minioadmin",
+            "url": "http://minio-server:9000",
+            "region": None,
+            "validate_certs": True,
+            "ca_cert": None,
+            "connect_timeout": 10,
+            "read_timeout": 300,
+            "max_pool_size": 10,
+            "keepalive": True,
+            "timings": timings,
+            "retries": 5,
+            "retry_backoff": 0.2,
+            "retry_max_backoff": 20,
+            "circuit_breaker_threshold": 10,
+            "circuit_breaker_cooldown": 10,
+        }
+    }
+    return module
+
+
+class FakeClient:
+    """Reports requests as MinioPoolManager does."""
+
+    def list_buckets(self, status=200, retries=0, error=None):
+        timing.record_request("GET", 0.02, status, retries, 25, error=error)
+
+    def get_object(self, name):
+        timing.record_request("GET", 0.01, 200, 0, 1024)
+
+    def list_objects(self, pages):
+        for page in range(pages):
+            timing.record_request("GET", 0.01, 200, 0, 100)
+            yield page
+
+
+def test_requests_are_named_after_the_client_method():
+    timings = timing.CallTimings()
+    client = timing.TimedClient(FakeClient(), timings)
+
+    client.list_buckets(retries=2)
+    client.get_object("key")
+    summary = timings.summary()
+
+    assert summary["requests"] == [
+        dict(
+            api="list_buckets",
+            method="GET",
+            latency_ms=20.0,
+            status=200,
+            retries=2,
+            size=25,
+        ),
+        dict(
+            api="get_object",
+            method="GET",
+            latency_ms=10.0,
+            status=200,
+            retries=0,
+            size=1024,
+        ),
+    ]
+    assert summary["apis"]["list_buckets"]["calls"] == 1
+    assert summary["apis"]["list_buckets"]["retries"] == 2
+    assert summary["apis"]["get_object"]["bytes"] == 1024
+    assert summary["apis"]["get_object"]["latency_ms"]["p99"] == 10.0
+    assert summary["request_ms"] == 30.0
+
+
+def test_lazy_listings_are_attributed_while_iterating():
+    timings = timing.CallTimings()
+    client = timing.TimedClient(FakeClient(), timings)
+
+    pages = client.list_objects(3)
+    assert timings.summary()["apis"]["list_objects"]["requests"] == 0
+
+    assert list(pages) == [0, 1, 2]
+    api = timings.summary()["apis"]["list_objects"]
+    assert api["calls"] == 1
+    assert api["requests"] == 3
+
+
+def test_failed_requests_are_recorded():
+    timings = timing.CallTimings()
+    client = timing.TimedClient(FakeClient(), timings)
+
+    client.list_buckets(status=404)
+    client.list_buckets(status=None, retries=5, error=Exception("connection refused"))
+
+    summary = timings.summary()
+    assert summary["apis"]["list_buckets"]["errors"] == 2
+    assert summary["apis"]["list_buckets"]["retries"] == 5
+    assert summary["requests"][1]["status"] is None
+    assert summary["requests"][1]["error"] == "connection refused"
+
+
+def test_requests_outside_api_calls_are_not_recorded():
+    timings = timing.CallTimings()
+
+    FakeClient().list_buckets()
+
+    assert timings.summary()["apis"] == {}
+
+
+def test_individual_requests_are_capped(mocker):
+    mocker.patch.object(timing, "MAX_REQUESTS", 2)
+    timings = timing.CallTimings()
+    client = timing.TimedClient(FakeClient(), timings)
+
+    for n in range(5):
+        client.list_buckets()
+
+    summary = timings.summary()
+    assert len(summary["requests"]) == 2
+    assert summary["dropped"] == 3
+    assert summary["apis"]["list_buckets"]["requests"] == 5
+
+
+def test_timings_are_returned_in_module_results(mocker):
+    mock_minio = mocker.patch.object(minio_utils.minio, "Minio")
+    exit_json = MagicMock()
+    module = mock_module(timings=True)
+    module.exit_json = exit_json
+
+    client = minio_utils.minio_client(module)
+    client.bucket_exists("bucket")
+    module.exit_json(changed=False)
+
+    assert mock_minio.call_args[1]["http_client"].observer is timing.record_request
+    assert mock_minio.return_value.bucket_exists.called
+    timings = exit_json.call_args[1]["timings"]
+    assert timings["apis"]["bucket_exists"]["calls"] == 1
+
+
+def test_clients_are_not_wrapped_when_disabled(mocker):
+    mock_minio = mocker.patch.object(minio_utils.minio, "Minio")
+    module = mock_module(timings=False)
+
+    assert minio_utils.minio_client(module) is mock_minio.return_value
+    assert mock_minio.call_args[1]["http_client"].observer is None
+
+
+def test_requests_of_other_threads_are_not_misattributed():
+    timings = timing.CallTimings()
+    started = threading.Event()
+    finish = threading.Event()
+
+    def slow_call():
+        started.set()
+        finish.wait(5)
+
+    # Another thread is in the middle of an API call
+    thread = threading.Thread(target=timings.call, args=("get_object", slow_call))
+    thread.start()
+    started.wait(5)
+    try:
+        FakeClient().list_buckets()
+    finally:
+        finish.set()
+        thread.join()
+
+    assert "list_buckets" not in timings.summary()["apis"]
+    assert timings.summary()["apis"]["get_object"]["requests"] == 0
+
+
+def test_parallel_workers_inherit_the_current_api_call():
+    timings = timing.CallTimings()
+
+    def list_buckets():
+        return minio_utils.minio_parallel(
+            lambda n: FakeClient().get_object(n), range(4), 2
+        )
+
+    timings.call("list_buckets", list_buckets)
+
+    api = timings.summary()["apis"]["list_buckets"]
+    assert api["calls"] == 1
+    assert api["requests"] == 4
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: Josh Williams <jdubz@dubzland.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import hashlib
+
+import pytest
+
+from ansible_collections.dubzland.minio.tests.unit.compat.mock import MagicMock
+
+from ansible_collections.dubzland.minio.plugins.module_utils import transfer
+
+MIB = 1024 * 1024
+
+
+def test_part_ranges():
+    assert list(transfer.part_ranges(0, 5 * MIB)) == [(0, 0)]
+    assert list(transfer.part_ranges(5 * MIB, 5 * MIB)) == [(0, 5 * MIB)]
+    assert list(transfer.part_ranges(11 * MIB, 5 * MIB)) == [
+        (0, 5 * MIB),
+        (5 * MIB, 5 * MIB),
+        (10 * MIB, MIB),
+    ]
+
+
+def test_validate_part_size():
+    assert transfer.validate_part_size(MIB, 5 * MIB) is None
+    assert "between" in transfer.validate_part_size(MIB, MIB)
+    assert "more than" in transfer.validate_part_size(60000 * MIB, 5 * MIB)
+
+
+def test_single_part_etag_is_md5():
+    assert transfer.bytes_etag(b"hello", 5 * MIB) == hashlib.md5(b"hello").hexdigest()
+
+
+def test_multipart_etag():
+    data = b"a" * (5 * MIB) + b"b"
+    parts = [hashlib.md5(b"a" * (5 * MIB)).digest(), hashlib.md5(b"b").digest()]
+    expected = "%s-2" % hashlib.md5(b"".join(parts)).hexdigest()
+
+    assert transfer.bytes_etag(data, 5 * MIB) == expected
+
+
+def test_file_etag_matches_bytes_etag(tmp_path):
+    data = b"0123456789" * (MIB + 1)
+    path = tmp_path / "artifact"
+    path.write_bytes(data)
+
+    etag = transfer.file_etag(str(path), 5 * MIB, 4)
+
+    assert etag == transfer.bytes_etag(data, 5 * MIB)
+    assert etag.endswith("-3")
+
+
+def test_object_stat_missing():
+    client = MagicMock()
+    error = Exception("missing")
+    error.code = "NoSuchKey"
+    client.stat_object.side_effect = error
+
+    assert transfer.object_stat(client, "bucket", "key") is None
+
+
+def test_object_stat_raises_other_errors():
+    client = MagicMock()
+    error = Exception("denied")
+    error.code = "AccessDenied"
+    client.stat_object.side_effect = error
+
+    with pytest.raises(Exception, match="denied"):
+        transfer.object_stat(client, "bucket", "key")
+
+
+def test_etag_part_count():
+    assert transfer.etag_part_count("d41d8cd98f00b204e9800998ecf8427e") == 1
+    assert transfer.etag_part_count("d41d8cd98f00b204e9800998ecf8427e-12") == 12
+
+
+def test_object_part_size_reads_first_part():
+    client = MagicMock()
+    client.stat_object.return_value.size = 5 * MIB
+    stat = MagicMock(etag="abc-3", size=12 * MIB, version_id="v1")
+
+    assert transfer.object_part_size(client, "bucket", "key", stat) == 5 * MIB
+    client.stat_object.assert_called_once_with(
+        "bucket", "key", version_id="v1", extra_query_params={"partNumber": "1"}
+    )
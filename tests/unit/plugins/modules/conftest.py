@@ -15,4 +15,5 @@ import pytest
 def mock_module(mocker):
     module = mocker.Mock()
     module.get_bin_path.return_value = "/mock/bin/testing"
+    module.params = {}
     return module
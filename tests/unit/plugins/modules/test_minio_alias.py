@@ -9,8 +9,10 @@ from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
 import json
+import os
 import pytest
 
+from ansible.module_utils import basic
 from ansible_collections.dubzland.minio.tests.unit.compat.mock import patch, ANY
 from ansible_collections.dubzland.minio.plugins.modules import minio_alias
 from ansible_collections.dubzland.minio.tests.unit.plugins.modules.utils import (
@@ -139,7 +141,7 @@ class TestMinioAlias(ModuleTestCase):
         self.alias_create_or_update_mock.stop()
 
     def test_module_fail_when_args_missing(self):
-        with self.assertRaises(AnsibleFailJson) as r:
+        with self.assertRaises(AnsibleFailJson):
             set_module_args({})
             minio_alias.main()
 
@@ -255,3 +257,179 @@ class TestMinioAlias(ModuleTestCase):
         assert result["changed"] is True
 
         self.alias_delete_mock.assert_called_with(ANY, record["name"])
+
+    def test_module_check_mode_makes_no_changes(self):
+        set_module_args(
+            {
+                "name": "testing",
+                "url": "http://localhost:9000",
+                "access_key": "test",
+                "secret_key": "supersekret",
+                "_ansible_check_mode": True,
+            }
+        )
+
+        self.alias_find_mock.return_value = None
+
+        with self.assertRaises(AnsibleExitJson) as r:
+            minio_alias.main()
+
+        assert r.exception.args[0]["changed"] is True
+        self.alias_create_or_update_mock.assert_not_called()
+
+
+def test_alias_list_returns_all_aliases(mock_module, mock_alias_record):
+    other = dict(mock_alias_record, alias="other")
+    stdout = "\n".join([json.dumps(mock_alias_record), json.dumps(other)])
+
+    with mock_run_command(mock_module, stdout, "", 0) as run_command:
+        res = minio_alias.alias_list(mock_module)
+
+    assert run_command.call_count == 1
+    assert sorted(res.keys()) == ["other", "testing"]
+
+
+class TestMinioAliasNative(ModuleTestCase):
+    @pytest.fixture(autouse=True)
+    def _tmp_path(self, tmp_path):
+        self.config_dir = str(tmp_path)
+        self.config_path = os.path.join(self.config_dir, "config.json")
+
+    def write_config(self, aliases):
+        with open(self.config_path, "w") as f:
+            json.dump({"version": "10", "aliases": aliases}, f)
+
+    def read_config(self):
+        with open(self.config_path) as f:
+            return json.load(f)
+
+    def test_module_creates_config(self):
+        set_module_args(
+            {
+                "name": "testing",
+                "url": "http://localhost:9000",
+                "access_key": "test",
+                "secret_key": "supersekret",
+                "backend": "native",
+                "config_dir": self.config_dir,
+            }
+        )
+
+        with patch.object(basic.AnsibleModule, "run_command") as run_command:
+            with self.assertRaises(AnsibleExitJson) as r:
+                minio_alias.main()
+
+        run_command.assert_not_called()
+        result = r.exception.args[0]
+        assert result["changed"] is True
+        assert self.read_config()["aliases"]["testing"] == {
+            "url": "http://localhost:9000",
+            "accessKey": "test",
+            "secretKey": "supersekret",
+            "api": "s3v4",
+            "path": "auto",
+        }
+        assert os.stat(self.config_path).st_mode & 0o777 == 0o600
+
+    def test_module_unchanged_does_not_rewrite(self):
+        self.write_config(
+            {
+                "testing": {
+                    "url": "http://localhost:9000",
+                    "accessKey": "test",
+                    "secretKey": "supersekret",
+                    "api": "s3v4",
+                    "path": "auto",
+                }
+            }
+        )
+        mtime = os.stat(self.config_path).st_mtime_ns
+        set_module_args(
+            {
+                "name": "testing",
+                "url": "http://localhost:9000",
+                "access_key": "test",
+                "secret_key": "supersekret",
+                "backend": "native",
+                "config_dir": self.config_dir,
+            }
+        )
+
+        with self.assertRaises(AnsibleExitJson) as r:
+            minio_alias.main()
+
+        result = r.exception.args[0]
+        assert result["changed"] is False
+        assert os.stat(self.config_path).st_mtime_ns == mtime
+
+    def test_module_bulk_applies_all_aliases(self):
+        self.write_config(
+            {
+                "unchanged": {
+                    "url": "http://a:9000",
+                    "accessKey": "test",
+                    "secretKey": "supersekret",
+                    "api": "S3v2",
+                    "path": "on",
+                },
+                "updated": {"url": "http://b:9000", "accessKey": "a", "secretKey": "b"},
+                "removed": {"url": "http://c:9000", "accessKey": "a", "secretKey": "b"},
+            }
+        )
+        set_module_args(
+            {
+                "aliases": [
+                    {
+                        "name": "unchanged",
+                        "url": "http://a:9000",
+                        "access_key": "test",
+                        "secret_key": "supersekret",
+                    },
+                    {
+                        "name": "updated",
+                        "url": "http://b:9000",
+                        "access_key": "a",
+                        "secret_key": "new",
+                    },
+                    {
+                        "name": "added",
+                        "url": "http://d:9000",
+                        "access_key": "a",
+                        "secret_key": "b",
+                    },
+                    {"name": "removed", "state": "absent"},
+                ],
+                "backend": "native",
+                "config_dir": self.config_dir,
+            }
+        )
+
+        with self.assertRaises(AnsibleExitJson) as r:
+            minio_alias.main()
+
+        result = r.exception.args[0]
+        assert result["changed"] is True
+        assert result["summary"] == {
+            "added": 1,
+            "updated": 1,
+            "removed": 1,
+            "unchanged": 1,
+        }
+        aliases = self.read_config()["aliases"]
+        assert sorted(aliases.keys()) == ["added", "unchanged", "updated"]
+        assert aliases["updated"]["secretKey"] == "new"
+        assert aliases["unchanged"]["api"] == "S3v2"
+
+    def test_module_bulk_requires_url(self):
+        set_module_args(
+            {
+                "aliases": [{"name": "testing"}],
+                "backend": "native",
+                "config_dir": self.config_dir,
+            }
+        )
+
+        with self.assertRaises(AnsibleFailJson):
+            minio_alias.main()
+
+        assert not os.path.exists(self.config_path)
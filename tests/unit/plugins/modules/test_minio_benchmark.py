@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: Josh Williams <jdubz@dubzland.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import threading
+
+from ansible_collections.dubzland.minio.tests.unit.compat.mock import MagicMock
+
+from ansible_collections.dubzland.minio.tests.unit.plugins.modules.utils import (
+    AnsibleExitJson,
+    AnsibleFailJson,
+    ModuleTestCase,
+    set_module_args,
+    with_mock_client,
+)
+
+from ansible_collections.dubzland.minio.plugins.modules import minio_benchmark
+
+
+def fake_bucket(client, versions=None):
+    """Back the mocked client with an in-memory bucket, safe for concurrent use.
+
+    When a versions list is given the bucket is versioned, and every write and
+    delete is recorded in it as a (key, version id) pair.
+    """
+    objects = {}
+    lock = threading.Lock()
+
+    def record(key):
+        if versions is not None:
+            versions.append((key, "v%d" % len(versions)))
+
+    def put_object(bucket, key, data, length):
+        with lock:
+            objects[key] = data.read()
+            record(key)
+
+    def get_object(bucket, key):
+        with lock:
+            data = objects.get(key)
+        if data is None:
+            # Removed by a concurrent delete, reported as the real client does
+            error = Exception("Object does not exist")
+            error.code = "NoSuchKey"
+            raise error
+        response = MagicMock()
+        response.stream.return_value = iter([data])
+        return response
+
+    def list_objects(bucket, prefix="", recursive=False, include_version=False):
+        with lock:
+            if include_version and versions is not None:
+                listed = list(versions)
+            else:
+                listed = [(key, None) for key in sorted(objects)]
+        return [
+            MagicMock(object_name=key, is_dir=False, version_id=version_id)
+            for key, version_id in listed
+            if key.startswith(prefix)
+        ]
+
+    def remove_object(bucket, key):
+        with lock:
+            objects.pop(key)
+            # A delete marker in a versioned bucket
+            record(key)
+
+    def remove_objects(bucket, batch):
+        with lock:
+            for obj in batch:
+                if obj.version_id is None:
+                    objects.pop(obj.name)
+                else:
+                    versions.remove((obj.name, obj.version_id))
+                    objects.pop(obj.name, None)
+        return []
+
+    client.put_object.side_effect = put_object
+    client.get_object.side_effect = get_object
+    client.list_objects.side_effect = list_objects
+    client.remove_object.side_effect = remove_object
+    client.remove_objects.side_effect = remove_objects
+    return objects
+
+
+class TestMinioBenchmark(ModuleTestCase):
+    def run_module(self, args, exception=AnsibleExitJson):
+        args = dict(
+            args,
+            bucket="benchmark",
+            auth={
+                "secret_key": "supersekret",
+                "access_key": "testing",
+                "url": "http://localhost:9000",
+            },
+        )
+        set_module_args(args)
+        with self.assertRaises(exception) as r:
+            minio_benchmark.main()
+
+        return r.exception.args[0]
+
+    @with_mock_client("minio_benchmark")
+    def test_module_reports_every_operation(self, mock_client):
+        objects = fake_bucket(mock_client)
+
+        result = self.run_module(
+            {
+                "duration": 0.2,
+                "concurrency": 4,
+                "preload": 10,
+                "object_sizes": [{"size": 1024}, {"size": 10, "weight": 2}],
+            }
+        )
+
+        assert result["changed"] is False
+        assert result["prefix"].startswith("minio-benchmark/")
+        for op in ("put", "get", "list", "delete"):
+            summary = result["operations"][op]
+            assert summary["ops"] > 0
+            assert summary["errors"] == 0
+            assert set(summary["latency_ms"]) >= set(["p50", "p90", "p99", "p999"])
+        assert result["operations"]["get"]["mb_per_sec"] > 0
+        assert result["removed"] > 0
+        assert objects == {}
+
+    @with_mock_client("minio_benchmark")
+    def test_module_removes_every_version(self, mock_client):
+        versions = []
+        objects = fake_bucket(mock_client, versions)
+
+        result = self.run_module(
+            {"duration": 0.1, "concurrency": 2, "preload": 5, "fanout": 2}
+        )
+
+        assert result["operations"]["delete"]["ops"] > 0
+        assert result["removed"] > 5
+        assert objects == {}
+        assert versions == []
+
+    @with_mock_client("minio_benchmark")
+    def test_module_honours_operation_mix(self, mock_client):
+        fake_bucket(mock_client)
+
+        result = self.run_module(
+            {
+                "duration": 0.1,
+                "concurrency": 1,
+                "preload": 1,
+                "operations": {"put": 0, "list": 0, "delete": 0},
+            }
+        )
+
+        assert result["operations"]["get"]["ops"] > 0
+        assert result["operations"]["put"]["ops"] == 0
+        mock_client.remove_object.assert_not_called()
+
+    @with_mock_client("minio_benchmark")
+    def test_module_counts_errors(self, mock_client):
+        fake_bucket(mock_client)
+        mock_client.list_objects.side_effect = None
+        mock_client.list_objects.return_value = []
+        mock_client.get_object.side_effect = Exception("slow down")
+
+        result = self.run_module(
+            {"duration": 0.1, "concurrency": 2, "preload": 1, "cleanup": False}
+        )
+
+        assert result["changed"] is True
+        assert result["operations"]["get"]["errors"] > 0
+        assert result["operations"]["get"]["error"] == "slow down"
+
+    @with_mock_client("minio_benchmark")
+    def test_module_fails_without_operations(self, mock_client):
+        result = self.run_module(
+            {"operations": {"put": 0, "get": 0, "list": 0, "delete": 0}},
+            exception=AnsibleFailJson,
+        )
+
+        assert "operations" in result["msg"]
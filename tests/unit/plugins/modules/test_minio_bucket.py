@@ -124,6 +124,249 @@ class TestMinioBucket(ModuleTestCase):
             minio_bucket.main()
 
         mock_client.bucket_exists.assert_called_once()
+        mock_client.make_bucket.assert_not_called()
+        mock_client.remove_bucket.assert_called_once_with("testing")
+        mock_client.list_objects.assert_not_called()
+        result = r.exception.args[0]
+        assert result["changed"] is True
+
+    @with_mock_client("minio_bucket")
+    def test_module_fails_when_not_empty_and_state_absent(self, mock_client):
+        mock_client.bucket_exists.return_value = True
+        mock_client.remove_bucket.side_effect = Exception("BucketNotEmpty")
+
+        with self.assertRaises(AnsibleFailJson) as r:
+            set_module_args(
+                {
+                    "name": "testing",
+                    "auth": {
+                        "secret_key": "supersekret",
+                        "access_key": "testing",
+                        "url": "http://localhost:9000",
+                    },
+                    "state": "absent",
+                }
+            )
+            minio_bucket.main()
+
+        result = r.exception.args[0]
+        assert "BucketNotEmpty" in result["msg"]
+
+    @with_mock_client("minio_bucket")
+    def test_module_purges_when_forced_and_state_absent(self, mock_client):
+        def make_object(name, version_id=None):
+            obj = MagicMock()
+            obj.object_name = name
+            obj.version_id = version_id
+            obj.is_dir = False
+            return obj
+
+        objects = [make_object("a/%d" % i, "v1") for i in range(1500)]
+        objects += [make_object("b/1", "v1"), make_object("b/1", "v2")]
+        objects += [make_object("root"), make_object("_hidden")]
+        removed = set()
+        listed = []
+
+        def list_objects(bucket, prefix=None, recursive=False, include_version=False):
+            assert include_version is True
+            assert recursive is True
+            listed.append(prefix)
+            return (
+                obj
+                for obj in objects
+                if obj.object_name.startswith(prefix)
+                and (obj.object_name, obj.version_id) not in removed
+            )
+
+        def remove_objects(bucket, batch):
+            removed.update((obj.name, obj.version_id) for obj in batch)
+            return iter([])
+
+        mock_client.bucket_exists.return_value = True
+        mock_client.list_objects.side_effect = list_objects
+        mock_client.remove_objects.side_effect = remove_objects
+
+        with self.assertRaises(AnsibleExitJson) as r:
+            set_module_args(
+                {
+                    "name": "testing",
+                    "force": True,
+                    "workers": 2,
+                    "auth": {
+                        "secret_key": "supersekret",
+                        "access_key": "testing",
+                        "url": "http://localhost:9000",
+                    },
+                    "state": "absent",
+                }
+            )
+            minio_bucket.main()
+
+        assert len(listed) == len(minio_bucket.PURGE_PREFIXES) + 1
+        assert listed[-1] == ""
+        batch_sizes = sorted(
+            len(call[0][1]) for call in mock_client.remove_objects.call_args_list
+        )
+        assert batch_sizes == [1, 1, 2, 500, 1000]
+        mock_client.remove_bucket.assert_called_once_with("testing")
+        result = r.exception.args[0]
+        assert result["changed"] is True
+        assert result["purged"] == 1504
+
+    @with_mock_client("minio_bucket")
+    def test_module_purges_configured_prefixes(self, mock_client):
+        mock_client.bucket_exists.return_value = True
+        mock_client.list_objects.return_value = iter([])
+
+        with self.assertRaises(AnsibleExitJson):
+            set_module_args(
+                {
+                    "name": "testing",
+                    "force": True,
+                    "purge_prefixes": ["logs/", "data/", "logs/2024/", "data/"],
+                    "auth": {
+                        "secret_key": "supersekret",
+                        "access_key": "testing",
+                        "url": "http://localhost:9000",
+                    },
+                    "state": "absent",
+                }
+            )
+            minio_bucket.main()
+
+        prefixes = sorted(
+            call.kwargs["prefix"] for call in mock_client.list_objects.call_args_list
+        )
+        assert prefixes == ["", "data/", "logs/"]
+
+    @with_mock_client("minio_bucket")
+    def test_module_bulk_splits_workers_between_purges(self, mock_client):
+        existing = []
+        for name in ("one", "two", "three"):
+            bucket = MagicMock()
+            bucket.name = name
+            existing.append(bucket)
+        mock_client.list_buckets.return_value = existing
+        mock_client.list_objects.side_effect = lambda *a, **kw: iter([])
+
+        pools = []
+        parallel = minio_bucket.minio_parallel
+
+        def minio_parallel(func, items, workers):
+            pools.append(workers)
+            return parallel(func, items, workers)
+
+        self.mocker.patch.object(minio_bucket, "minio_parallel", minio_parallel)
+
+        with self.assertRaises(AnsibleExitJson):
+            set_module_args(
+                {
+                    "buckets": [
+                        {"name": "one"},
+                        {"name": "two", "state": "absent"},
+                        {"name": "three", "state": "absent"},
+                    ],
+                    "force": True,
+                    "workers": 9,
+                    "auth": {
+                        "secret_key": "supersekret",
+                        "access_key": "testing",
+                        "url": "http://localhost:9000",
+                    },
+                }
+            )
+            minio_bucket.main()
+
+        assert pools == [9, 4, 4]
+
+    @with_mock_client("minio_bucket")
+    def test_module_bulk_lists_buckets_once(self, mock_client):
+        existing = MagicMock()
+        existing.name = "existing"
+        extra = MagicMock()
+        extra.name = "extra"
+        mock_client.list_buckets.return_value = [existing, extra]
+
+        with self.assertRaises(AnsibleExitJson) as r:
+            set_module_args(
+                {
+                    "buckets": [
+                        {"name": "existing"},
+                        {"name": "missing"},
+                        {"name": "extra", "state": "absent"},
+                        {"name": "gone", "state": "absent"},
+                    ],
+                    "auth": {
+                        "secret_key": "supersekret",
+                        "access_key": "testing",
+                        "url": "http://localhost:9000",
+                    },
+                }
+            )
+            minio_bucket.main()
+
+        mock_client.list_buckets.assert_called_once()
+        mock_client.bucket_exists.assert_not_called()
+        mock_client.make_bucket.assert_called_once_with("missing")
+        mock_client.remove_bucket.assert_called_once_with("extra")
+        result = r.exception.args[0]
+        assert result["changed"] is True
+        assert result["summary"] == {
+            "created": 1,
+            "removed": 1,
+            "unchanged": 2,
+            "failed": 0,
+        }
+        assert [b["action"] for b in result["buckets"]] == [
+            None,
+            "create",
+            "remove",
+            None,
+        ]
+
+    @with_mock_client("minio_bucket")
+    def test_module_bulk_unchanged_when_all_exist(self, mock_client):
+        existing = MagicMock()
+        existing.name = "existing"
+        mock_client.list_buckets.return_value = [existing]
+
+        with self.assertRaises(AnsibleExitJson) as r:
+            set_module_args(
+                {
+                    "buckets": [{"name": "existing"}],
+                    "auth": {
+                        "secret_key": "supersekret",
+                        "access_key": "testing",
+                        "url": "http://localhost:9000",
+                    },
+                }
+            )
+            minio_bucket.main()
+
         mock_client.make_bucket.assert_not_called()
         result = r.exception.args[0]
         assert result["changed"] is False
+
+    @with_mock_client("minio_bucket")
+    def test_module_bulk_fails_with_results(self, mock_client):
+        mock_client.list_buckets.return_value = []
+        mock_client.make_bucket.side_effect = [None, Exception("SlowDown")]
+
+        with self.assertRaises(AnsibleFailJson) as r:
+            set_module_args(
+                {
+                    "buckets": [{"name": "one"}, {"name": "two"}],
+                    "workers": 1,
+                    "auth": {
+                        "secret_key": "supersekret",
+                        "access_key": "testing",
+                        "url": "http://localhost:9000",
+                    },
+                }
+            )
+            minio_bucket.main()
+
+        result = r.exception.args[0]
+        assert result["changed"] is True
+        assert result["summary"]["created"] == 1
+        assert result["summary"]["failed"] == 1
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: Josh Williams <jdubz@dubzland.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+
+import pytest
+
+from ansible_collections.dubzland.minio.tests.unit.compat.mock import MagicMock
+
+from ansible_collections.dubzland.minio.tests.unit.plugins.modules.utils import (
+    AnsibleExitJson,
+    AnsibleFailJson,
+    ModuleTestCase,
+    set_module_args,
+    with_mock_client,
+)
+
+from ansible_collections.dubzland.minio.plugins.module_utils.transfer import (
+    bytes_etag,
+)
+from ansible_collections.dubzland.minio.plugins.modules import minio_fetch
+
+MIB = 1024 * 1024
+
+# Uploaded in two 5 MiB parts, and fetched in 4 MiB ranges
+DATA = b"".join(bytes([i]) * MIB for i in range(7))
+ETAG = bytes_etag(DATA, 5 * MIB)
+
+
+def serve(client, data=DATA, etag=ETAG):
+    def stat_object(bucket, name, version_id=None, extra_query_params=None):
+        stat = MagicMock(etag=etag, version_id=None)
+        stat.size = 5 * MIB if extra_query_params else len(data)
+        return stat
+
+    def get_object(bucket, name, offset=0, length=0, **kwargs):
+        response = MagicMock()
+        response.stream.return_value = iter(
+            [
+                data[offset : offset + length // 2],
+                data[offset + length // 2 : offset + length],
+            ]
+        )
+        return response
+
+    client.stat_object.side_effect = stat_object
+    client.get_object.side_effect = get_object
+
+
+class TestMinioFetch(ModuleTestCase):
+    @pytest.fixture(autouse=True)
+    def _tmp_path(self, tmp_path):
+        self.dest = tmp_path / "artifact"
+
+    def run_module(self, args=None, exception=AnsibleExitJson):
+        args = dict(
+            args or {},
+            bucket="releases",
+            object="artifact",
+            dest=str(self.dest),
+            part_size=4 * MIB,
+            auth={
+                "secret_key": "supersekret",
+                "access_key": "testing",
+                "url": "http://localhost:9000",
+            },
+        )
+        set_module_args(args)
+        with self.assertRaises(exception) as r:
+            minio_fetch.main()
+
+        return r.exception.args[0]
+
+    @with_mock_client("minio_fetch")
+    def test_module_downloads_ranges(self, mock_client):
+        serve(mock_client)
+
+        result = self.run_module()
+
+        assert result["changed"] is True
+        assert result["resumed"] == 0
+        assert self.dest.read_bytes() == DATA
+        assert mock_client.get_object.call_count == 2
+        assert mock_client.get_object.call_args_list[1][1]["offset"] == 4 * MIB
+        assert mock_client.get_object.call_args_list[1][1]["request_headers"] == {
+            "If-Match": '"%s"' % ETAG
+        }
+        assert not (self.dest.parent / "artifact.part").exists()
+        assert not (self.dest.parent / "artifact.part.json").exists()
+
+    @with_mock_client("minio_fetch")
+    def test_module_skips_matching_file(self, mock_client):
+        serve(mock_client)
+        self.dest.write_bytes(DATA)
+
+        result = self.run_module()
+
+        assert result["changed"] is False
+        mock_client.get_object.assert_not_called()
+
+    @with_mock_client("minio_fetch")
+    def test_module_replaces_different_file(self, mock_client):
+        serve(mock_client)
+        self.dest.write_bytes(b"x" * len(DATA))
+
+        result = self.run_module()
+
+        assert result["changed"] is True
+        assert self.dest.read_bytes() == DATA
+
+    @with_mock_client("minio_fetch")
+    def test_module_resumes_partial_download(self, mock_client):
+        serve(mock_client)
+        part = self.dest.parent / "artifact.part"
+        part.write_bytes(DATA[: 4 * MIB] + b"\0" * (len(DATA) - 4 * MIB))
+        (self.dest.parent / "artifact.part.json").write_text(
+            json.dumps(
+                {"etag": ETAG, "size": len(DATA), "part_size": 4 * MIB, "done": [0]}
+            )
+        )
+
+        result = self.run_module()
+
+        assert result["resumed"] == 4 * MIB
+        assert mock_client.get_object.call_count == 1
+        assert self.dest.read_bytes() == DATA
+
+    @with_mock_client("minio_fetch")
+    def test_module_restarts_stale_partial_download(self, mock_client):
+        serve(mock_client)
+        part = self.dest.parent / "artifact.part"
+        part.write_bytes(b"\0" * len(DATA))
+        (self.dest.parent / "artifact.part.json").write_text(
+            json.dumps(
+                {"etag": "old", "size": len(DATA), "part_size": 4 * MIB, "done": [0]}
+            )
+        )
+
+        result = self.run_module()
+
+        assert result["resumed"] == 0
+        assert mock_client.get_object.call_count == 2
+        assert self.dest.read_bytes() == DATA
+
+    @with_mock_client("minio_fetch")
+    def test_module_fails_verification(self, mock_client):
+        serve(mock_client, etag="0123456789abcdef0123456789abcdef-2")
+
+        result = self.run_module(exception=AnsibleFailJson)
+
+        assert "does not match" in result["msg"]
+        assert not self.dest.exists()
+        assert not (self.dest.parent / "artifact.part").exists()
+
+    @with_mock_client("minio_fetch")
+    def test_module_check_mode(self, mock_client):
+        serve(mock_client)
+
+        result = self.run_module({"_ansible_check_mode": True})
+
+        assert result["changed"] is True
+        mock_client.get_object.assert_not_called()
+        assert not self.dest.exists()
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: Josh Williams <jdubz@dubzland.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ansible.module_utils.six.moves.urllib.error import HTTPError, URLError
+
+from ansible_collections.dubzland.minio.tests.unit.compat.mock import MagicMock, patch
+
+from ansible_collections.dubzland.minio.tests.unit.plugins.modules.utils import (
+    AnsibleExitJson,
+    AnsibleFailJson,
+    ModuleTestCase,
+    set_module_args,
+)
+
+from ansible_collections.dubzland.minio.plugins.modules import minio_health
+
+
+def healthy(headers=None):
+    response = MagicMock()
+    response.getcode.return_value = 200
+    response.headers = headers or {}
+    return response
+
+
+def unhealthy(status, headers=None):
+    return HTTPError("http://localhost:9000", status, "", headers or {}, None)
+
+
+class TestMinioHealth(ModuleTestCase):
+    def setUp(self):
+        super(TestMinioHealth, self).setUp()
+
+        self.responses = {}
+        self.requested = []
+        open_url = patch.object(minio_health, "open_url", side_effect=self.open_url)
+        open_url.start()
+        self.addCleanup(open_url.stop)
+
+        self.sleep = patch.object(minio_health.time, "sleep").start()
+        self.addCleanup(patch.stopall)
+
+    def open_url(self, url, **kwargs):
+        self.requested.append(url)
+        path = url.split(":9000", 1)[1]
+        response = self.responses[path].pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    def run_module(self, args, exception=AnsibleExitJson):
+        set_module_args(dict(args, url="http://localhost:9000"))
+        with self.assertRaises(exception) as r:
+            minio_health.main()
+
+        return r.exception.args[0]
+
+    def test_module_passes_when_ready(self):
+        self.responses["/minio/health/ready"] = [healthy()]
+
+        result = self.run_module({})
+
+        assert result["changed"] is False
+        assert result["attempts"] == 1
+        assert result["checks"] == {"ready": {"status": 200}}
+        self.sleep.assert_not_called()
+
+    def test_module_backs_off_until_ready(self):
+        self.responses["/minio/health/ready"] = [
+            URLError("connection refused"),
+            unhealthy(503),
+            unhealthy(503),
+            healthy(),
+        ]
+
+        result = self.run_module({"delay": 1, "max_delay": 3})
+
+        assert result["attempts"] == 4
+        assert [c.args[0] for c in self.sleep.call_args_list] == [1, 2, 3]
+
+    def test_module_fails_after_timeout(self):
+        self.responses["/minio/health/ready"] = [URLError("connection refused")] * 2
+
+        with patch.object(minio_health.time, "monotonic", side_effect=[0, 0, 2, 2, 11]):
+            result = self.run_module({"timeout": 10}, exception=AnsibleFailJson)
+
+        assert result["attempts"] == 2
+        assert "was not healthy after 10 seconds" in result["msg"]
+        assert "ready: connection refused" in result["msg"]
+        assert self.sleep.call_args.args[0] == 1
+
+    def test_module_checks_cluster_quorum(self):
+        self.responses["/minio/health/ready"] = [healthy(), healthy()]
+        self.responses["/minio/health/cluster"] = [
+            unhealthy(503),
+            healthy({"X-Minio-Write-Quorum": "12"}),
+        ]
+
+        result = self.run_module({"checks": ["ready", "cluster"]})
+
+        assert result["attempts"] == 2
+        assert result["checks"]["cluster"] == {"status": 200, "write_quorum": 12}
+
+    def test_module_waits_for_heal(self):
+        self.responses["/minio/health/cluster?maintenance=true"] = [
+            healthy({"X-Minio-Write-Quorum": "12", "X-Minio-Healing-Drives": "2"}),
+            unhealthy(412),
+            healthy({"X-Minio-Write-Quorum": "12"}),
+        ]
+
+        result = self.run_module(
+            {"checks": ["cluster"], "maintenance": True, "wait_for_heal": True}
+        )
+
+        assert result["attempts"] == 3
+        assert self.requested[0].endswith("/minio/health/cluster?maintenance=true")
+
+    def test_module_ignores_heal_by_default(self):
+        self.responses["/minio/health/cluster"] = [
+            healthy({"X-Minio-Healing-Drives": "2"}),
+        ]
+
+        result = self.run_module({"checks": ["cluster"]})
+
+        assert result["checks"]["cluster"]["healing_drives"] == 2
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: Josh Williams <jdubz@dubzland.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+
+from datetime import datetime, timezone
+
+from ansible_collections.dubzland.minio.tests.unit.compat.mock import MagicMock, patch
+
+from ansible_collections.dubzland.minio.tests.unit.plugins.modules.utils import (
+    AnsibleExitJson,
+    AnsibleFailJson,
+    ModuleTestCase,
+    set_module_args,
+)
+
+from ansible_collections.dubzland.minio.plugins.modules import minio_info
+
+
+class TestMinioInfo(ModuleTestCase):
+    def setUp(self):
+        super(TestMinioInfo, self).setUp()
+        client_patcher = patch(
+            "ansible_collections.dubzland.minio.plugins.modules.minio_info.minio_client"
+        )
+        admin_patcher = patch(
+            "ansible_collections.dubzland.minio.plugins.modules.minio_info.minio_admin_client"
+        )
+        self.mock_client = client_patcher.start().return_value
+        self.mock_admin_client = admin_patcher.start().return_value
+        self.addCleanup(client_patcher.stop)
+        self.addCleanup(admin_patcher.stop)
+
+        bucket = MagicMock()
+        bucket.name = "testbucket"
+        bucket.creation_date = datetime(2024, 4, 27, tzinfo=timezone.utc)
+        self.mock_client.list_buckets.return_value = [bucket]
+
+        self.mock_admin_client.user_list.return_value = json.dumps(
+            {
+                "testuser": {
+                    "policyName": "readwrite,diagnostics",
+                    "status": "enabled",
+                },
+                "nopolicy": {"status": "enabled"},
+            }
+        )
+        self.mock_admin_client.group_list.return_value = json.dumps(["developers"])
+        self.mock_admin_client.group_info.return_value = json.dumps(
+            {"members": ["testuser"], "policy": "readwrite", "status": "enabled"}
+        )
+        self.mock_admin_client.policy_list.return_value = json.dumps(
+            {"readwrite": {"Version": "2012-10-17", "Statement": []}}
+        )
+        self.mock_admin_client.info.return_value = json.dumps({"mode": "online"})
+
+    def run_module(self, args):
+        args = dict(
+            args,
+            auth={
+                "secret_key": "supersekret",
+                "access_key": "testing",
+                "url": "http://localhost:9000",
+            },
+        )
+        set_module_args(args)
+        with self.assertRaises(AnsibleExitJson) as r:
+            minio_info.main()
+
+        return r.exception.args[0]
+
+    def test_module_gathers_everything(self):
+        result = self.run_module({})
+
+        assert result["changed"] is False
+        assert result["buckets"] == {
+            "testbucket": {"creation_date": "2024-04-27T00:00:00+00:00"}
+        }
+        assert sorted(result["users"].keys()) == ["nopolicy", "testuser"]
+        assert result["groups"]["developers"]["members"] == ["testuser"]
+        assert "readwrite" in result["policies"]
+        assert result["policy_mappings"] == {
+            "readwrite": {"users": ["testuser"], "groups": ["developers"]},
+            "diagnostics": {"users": ["testuser"], "groups": []},
+        }
+        assert result["server"] == {"mode": "online"}
+
+    def test_module_gathers_subset(self):
+        result = self.run_module({"gather_subset": ["buckets"]})
+
+        assert set(result.keys()) == set(["changed", "buckets"])
+        self.mock_admin_client.user_list.assert_not_called()
+        self.mock_admin_client.policy_list.assert_not_called()
+        self.mock_admin_client.info.assert_not_called()
+
+    def test_module_mappings_gather_users_and_groups(self):
+        result = self.run_module({"gather_subset": ["policy_mappings"]})
+
+        assert "users" not in result
+        assert "groups" not in result
+        assert "readwrite" in result["policy_mappings"]
+        self.mock_client.list_buckets.assert_not_called()
+        self.mock_admin_client.policy_list.assert_not_called()
+
+    def test_module_fails_when_gathering_fails(self):
+        self.mock_admin_client.info.side_effect = Exception("access denied")
+        set_module_args(
+            {
+                "gather_subset": ["server"],
+                "auth": {
+                    "secret_key": "supersekret",
+                    "access_key": "testing",
+                    "url": "http://localhost:9000",
+                },
+            }
+        )
+
+        with self.assertRaises(AnsibleFailJson) as r:
+            minio_info.main()
+
+        assert "access denied" in r.exception.args[0]["msg"]
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: Josh Williams <jdubz@dubzland.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import hashlib
+
+import pytest
+
+from ansible_collections.dubzland.minio.tests.unit.compat.mock import MagicMock
+
+from ansible_collections.dubzland.minio.tests.unit.plugins.modules.utils import (
+    AnsibleExitJson,
+    AnsibleFailJson,
+    ModuleTestCase,
+    set_module_args,
+    with_mock_client,
+)
+
+from ansible_collections.dubzland.minio.plugins.modules import minio_object
+
+MIB = 1024 * 1024
+
+
+def not_found():
+    error = Exception("Object does not exist")
+    error.code = "NoSuchKey"
+    return error
+
+
+def stat(size, etag):
+    result = MagicMock()
+    result.size = size
+    result.etag = etag
+    return result
+
+
+class TestMinioObject(ModuleTestCase):
+    @pytest.fixture(autouse=True)
+    def _tmp_path(self, tmp_path):
+        self.tmp_path = tmp_path
+
+    def run_module(self, args, exception=AnsibleExitJson):
+        args = dict(
+            args,
+            bucket="releases",
+            object="artifact",
+            auth={
+                "secret_key": "supersekret",
+                "access_key": "testing",
+                "url": "http://localhost:9000",
+            },
+        )
+        set_module_args(args)
+        with self.assertRaises(exception) as r:
+            minio_object.main()
+
+        return r.exception.args[0]
+
+    def artifact(self, data):
+        path = self.tmp_path / "artifact"
+        path.write_bytes(data)
+        return str(path)
+
+    def test_module_fail_when_source_missing(self):
+        result = self.run_module({}, exception=AnsibleFailJson)
+
+        assert "src" in result["msg"]
+
+    @with_mock_client("minio_object")
+    def test_module_uploads_missing_file(self, mock_client):
+        mock_client.stat_object.side_effect = not_found()
+        mock_client.fput_object.return_value = MagicMock(etag="abc-2", version_id=None)
+        src = self.artifact(b"x" * (6 * MIB))
+
+        result = self.run_module({"src": src, "part_size": 5 * MIB, "workers": 2})
+
+        assert result["changed"] is True
+        assert result["size"] == 6 * MIB
+        mock_client.fput_object.assert_called_once_with(
+            "releases",
+            "artifact",
+            src,
+            content_type="application/octet-stream",
+            metadata=None,
+            part_size=5 * MIB,
+            num_parallel_uploads=2,
+        )
+
+    @with_mock_client("minio_object")
+    def test_module_skips_identical_file(self, mock_client):
+        data = b"x" * (6 * MIB)
+        parts = [
+            hashlib.md5(data[: 5 * MIB]).digest(),
+            hashlib.md5(b"x" * MIB).digest(),
+        ]
+        etag = "%s-2" % hashlib.md5(b"".join(parts)).hexdigest()
+
+        def stat_object(bucket, name, version_id=None, extra_query_params=None):
+            if extra_query_params == {"partNumber": "1"}:
+                return stat(5 * MIB, etag)
+            return stat(len(data), etag)
+
+        mock_client.stat_object.side_effect = stat_object
+
+        # Uploaded with 5 MiB parts, compared using the default 16 MiB
+        result = self.run_module({"src": self.artifact(data)})
+
+        assert result["changed"] is False
+        assert result["etag"] == etag
+        mock_client.fput_object.assert_not_called()
+
+    @with_mock_client("minio_object")
+    def test_module_uploads_when_size_differs(self, mock_client):
+        mock_client.stat_object.return_value = stat(1, "unused")
+        mock_client.fput_object.return_value = MagicMock(etag="new", version_id="v2")
+
+        result = self.run_module({"src": self.artifact(b"changed")})
+
+        assert result["changed"] is True
+        assert result["version_id"] == "v2"
+        mock_client.fput_object.assert_called_once()
+
+    @with_mock_client("minio_object")
+    def test_module_uploads_content(self, mock_client):
+        mock_client.stat_object.return_value = stat(5, "stale")
+        mock_client.put_object.return_value = MagicMock(etag="new", version_id=None)
+
+        result = self.run_module({"content": "1.2.0", "content_type": "text/plain"})
+
+        assert result["changed"] is True
+        args, kwargs = mock_client.put_object.call_args
+        assert args[2].read() == b"1.2.0"
+        assert args[3] == 5
+        assert kwargs["content_type"] == "text/plain"
+
+    @with_mock_client("minio_object")
+    def test_module_skips_identical_content(self, mock_client):
+        mock_client.stat_object.return_value = stat(
+            5, hashlib.md5(b"1.2.0").hexdigest()
+        )
+
+        result = self.run_module({"content": "1.2.0"})
+
+        assert result["changed"] is False
+        mock_client.put_object.assert_not_called()
+
+    @with_mock_client("minio_object")
+    def test_module_never_overwrites(self, mock_client):
+        mock_client.stat_object.return_value = stat(1, "other")
+
+        result = self.run_module({"content": "1.2.0", "overwrite": "never"})
+
+        assert result["changed"] is False
+        assert result["etag"] == "other"
+        mock_client.put_object.assert_not_called()
+
+    @with_mock_client("minio_object")
+    def test_module_check_mode(self, mock_client):
+        mock_client.stat_object.side_effect = not_found()
+
+        result = self.run_module({"content": "1.2.0", "_ansible_check_mode": True})
+
+        assert result["changed"] is True
+        mock_client.put_object.assert_not_called()
+
+    @with_mock_client("minio_object")
+    def test_module_fails_on_small_part_size(self, mock_client):
+        mock_client.stat_object.side_effect = not_found()
+
+        result = self.run_module(
+            {"content": "1.2.0", "part_size": MIB}, exception=AnsibleFailJson
+        )
+
+        assert "part_size" in result["msg"]
+
+    @with_mock_client("minio_object")
+    def test_module_removes_object(self, mock_client):
+        mock_client.stat_object.return_value = stat(5, "etag")
+
+        result = self.run_module({"state": "absent"})
+
+        assert result["changed"] is True
+        mock_client.remove_object.assert_called_once_with("releases", "artifact")
+
+    @with_mock_client("minio_object")
+    def test_module_absent_when_missing(self, mock_client):
+        mock_client.stat_object.side_effect = not_found()
+
+        result = self.run_module({"state": "absent"})
+
+        assert result["changed"] is False
+        mock_client.remove_object.assert_not_called()
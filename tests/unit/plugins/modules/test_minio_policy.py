@@ -8,20 +8,29 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
+import json
 import pytest
 
+from minio import MinioAdmin
+
 from ansible_collections.dubzland.minio.tests.unit.compat.mock import (
     ANY,
+    create_autospec,
     patch,
 )
 from ansible_collections.dubzland.minio.tests.unit.plugins.modules.utils import (
     AnsibleExitJson,
     AnsibleFailJson,
     MinioAdminClientTestCase,
+    admin_not_found,
     set_module_args,
 )
 
 from ansible_collections.dubzland.minio.plugins.modules import minio_policy
+from ansible_collections.dubzland.minio.plugins.module_utils.timing import (
+    CallTimings,
+    TimedClient,
+)
 
 
 class TestMinioPolicy(MinioAdminClientTestCase):
@@ -31,6 +40,7 @@ class TestMinioPolicy(MinioAdminClientTestCase):
             "ansible_collections.dubzland.minio.plugins.modules.minio_policy.minio_admin_client"
         )
         self.MockClient = patcher.start()
+        self.MockClient.return_value = create_autospec(MinioAdmin, instance=True)
         self.addCleanup(patcher.stop)
 
     @pytest.fixture(autouse=True)
@@ -44,7 +54,7 @@ class TestMinioPolicy(MinioAdminClientTestCase):
 
     def test_module_unchanged_when_exists(self):
         mock_client = self.MockClient.return_value
-        mock_client.policy_list.return_value = '{"%s": {}}' % "testing"
+        mock_client.policy_info.return_value = "{}"
         set_module_args(
             {
                 "name": "testing",
@@ -57,12 +67,55 @@ class TestMinioPolicy(MinioAdminClientTestCase):
             }
         )
 
-        with self.assertRaises(AnsibleExitJson):
+        with self.assertRaises(AnsibleExitJson) as r:
+            minio_policy.main()
+
+        mock_client.policy_add.assert_not_called()
+        result = r.exception.args[0]
+        assert result["changed"] is False
+
+    def test_module_unchanged_when_server_splits_statements(self):
+        mock_client = self.MockClient.return_value
+        mock_client.policy_info.return_value = json.dumps(
+            {
+                "Version": "2012-10-17",
+                "Statement": [
+                    {
+                        "Effect": "Allow",
+                        "Action": ["s3:PutObject", "s3:GetObject"],
+                        "Resource": ["arn:aws:s3:::testing/*", "arn:aws:s3:::testing"],
+                    }
+                ],
+            }
+        )
+        set_module_args(
+            {
+                "name": "testing",
+                "statements": [
+                    {
+                        "effect": "Allow",
+                        "action": ["s3:GetObject", "s3:PutObject"],
+                        "resource": ["arn:aws:s3:::testing", "arn:aws:s3:::testing/*"],
+                    }
+                ],
+                "auth": {
+                    "secret_key": "supersekret",
+                    "access_key": "testing",
+                    "url": "http://localhost:9000",
+                },
+            }
+        )
+
+        with self.assertRaises(AnsibleExitJson) as r:
             minio_policy.main()
 
+        mock_client.policy_add.assert_not_called()
+        result = r.exception.args[0]
+        assert result["changed"] is False
+
     def test_module_update_when_different(self):
         mock_client = self.MockClient.return_value
-        mock_client.policy_list.return_value = '{"%s": {"existing": "value"}}'
+        mock_client.policy_info.return_value = '{"existing": "value"}'
         set_module_args(
             {
                 "name": "testing",
@@ -80,7 +133,7 @@ class TestMinioPolicy(MinioAdminClientTestCase):
 
     def test_module_create_when_not_exist(self):
         mock_client = self.MockClient.return_value
-        mock_client.policy_list.return_value = "{}"
+        mock_client.policy_info.side_effect = admin_not_found("XMinioAdminNoSuchPolicy")
         mock_client.policy_add.return_value = ""
         set_module_args(
             {
@@ -97,14 +150,15 @@ class TestMinioPolicy(MinioAdminClientTestCase):
         with self.assertRaises(AnsibleExitJson) as r:
             minio_policy.main()
 
-        mock_client.policy_list.assert_called_once()
-        mock_client.policy_add.assert_called_with("testing", ANY)
+        mock_client.policy_info.assert_called_once_with("testing")
+        mock_client.policy_list.assert_not_called()
+        mock_client.policy_add.assert_called_with("testing", policy=ANY)
         result = r.exception.args[0]
         assert result["changed"] is True
 
     def test_module_unchanged_when_not_exist_and_state_absent(self):
         mock_client = self.MockClient.return_value
-        mock_client.policy_list.return_value = "{}"
+        mock_client.policy_info.side_effect = admin_not_found("XMinioAdminNoSuchPolicy")
         mock_client.policy_add.return_value = ""
         set_module_args(
             {
@@ -122,14 +176,15 @@ class TestMinioPolicy(MinioAdminClientTestCase):
         with self.assertRaises(AnsibleExitJson) as r:
             minio_policy.main()
 
-        mock_client.policy_list.assert_called_once()
+        mock_client.policy_info.assert_called_once_with("testing")
+        mock_client.policy_list.assert_not_called()
         mock_client.policy_add.assert_not_called()
         result = r.exception.args[0]
         assert result["changed"] is False
 
     def test_module_changed_when_exists_and_state_absent(self):
         mock_client = self.MockClient.return_value
-        mock_client.policy_list.return_value = '{"testing": {}}'
+        mock_client.policy_info.return_value = "{}"
         mock_client.policy_remove.return_value = ""
         set_module_args(
             {
@@ -147,7 +202,113 @@ class TestMinioPolicy(MinioAdminClientTestCase):
         with self.assertRaises(AnsibleExitJson) as r:
             minio_policy.main()
 
-        mock_client.policy_list.assert_called_once()
+        mock_client.policy_info.assert_called_once_with("testing")
+        mock_client.policy_list.assert_not_called()
         mock_client.policy_remove.assert_called_once_with("testing")
         result = r.exception.args[0]
         assert result["changed"] is True
+
+    def test_module_bulk_lists_policies_once(self):
+        mock_client = self.MockClient.return_value
+        mock_client.policy_list.return_value = json.dumps(
+            {
+                "unchanged": {"Version": "2012-10-17", "Statement": []},
+                "updated": {"existing": "value"},
+                "removed": {},
+            }
+        )
+        set_module_args(
+            {
+                "policies": [
+                    {"name": "unchanged", "statements": []},
+                    {"name": "updated", "statements": []},
+                    {"name": "added", "statements": []},
+                    {"name": "removed", "state": "absent"},
+                    {"name": "missing", "state": "absent"},
+                ],
+                "auth": {
+                    "secret_key": "supersekret",
+                    "access_key": "testing",
+                    "url": "http://localhost:9000",
+                },
+            }
+        )
+
+        with self.assertRaises(AnsibleExitJson) as r:
+            minio_policy.main()
+
+        mock_client.policy_list.assert_called_once()
+        mock_client.policy_info.assert_not_called()
+        assert sorted(call[0][0] for call in mock_client.policy_add.call_args_list) == [
+            "added",
+            "updated",
+        ]
+        mock_client.policy_remove.assert_called_once_with("removed")
+        result = r.exception.args[0]
+        assert result["changed"] is True
+        assert result["summary"] == {
+            "added": 1,
+            "updated": 1,
+            "removed": 1,
+            "unchanged": 2,
+            "failed": 0,
+        }
+
+    def test_module_bulk_requires_statements(self):
+        set_module_args(
+            {
+                "policies": [{"name": "testing"}],
+                "auth": {
+                    "secret_key": "supersekret",
+                    "access_key": "testing",
+                    "url": "http://localhost:9000",
+                },
+            }
+        )
+
+        with self.assertRaises(AnsibleFailJson):
+            minio_policy.main()
+
+
+def test_policy_add_from_memory_is_detected():
+    client = create_autospec(MinioAdmin, instance=True)
+
+    assert minio_policy.policy_add_from_memory(client) is True
+
+
+def test_policy_add_from_memory_is_detected_through_timings():
+    class OldMinioAdmin:
+        def policy_add(self, policy_name, policy_file=None):
+            pass
+
+    timings = CallTimings()
+    client = TimedClient(create_autospec(MinioAdmin, instance=True), timings)
+    old_client = TimedClient(OldMinioAdmin(), timings)
+
+    assert minio_policy.policy_add_from_memory(client) is True
+    assert minio_policy.policy_add_from_memory(old_client) is False
+
+
+def test_policy_upload_from_memory(mocker):
+    client = mocker.Mock()
+    document = {"Version": "2012-10-17", "Statement": []}
+
+    minio_policy.policy_upload(client, "testing", document, True)
+
+    client.policy_add.assert_called_once_with("testing", policy=document)
+
+
+def test_policy_upload_falls_back_to_file(mocker):
+    uploaded = {}
+
+    def policy_add(name, policy_file):
+        with open(policy_file) as f:
+            uploaded[name] = json.load(f)
+
+    client = mocker.Mock()
+    client.policy_add.side_effect = policy_add
+    document = {"Version": "2012-10-17", "Statement": []}
+
+    minio_policy.policy_upload(client, "testing", document, False)
+
+    assert uploaded == {"testing": document}
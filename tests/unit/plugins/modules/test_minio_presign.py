@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: Josh Williams <jdubz@dubzland.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from datetime import timedelta
+
+from ansible_collections.dubzland.minio.tests.unit.compat.mock import MagicMock, patch
+
+from ansible_collections.dubzland.minio.tests.unit.plugins.modules.utils import (
+    AnsibleExitJson,
+    AnsibleFailJson,
+    ModuleTestCase,
+    set_module_args,
+    with_mock_client,
+)
+
+from ansible_collections.dubzland.minio.plugins.modules import minio_presign
+from ansible_collections.dubzland.minio.plugins.plugin_utils.minio import (
+    run_on_controller,
+)
+
+
+class TestMinioPresign(ModuleTestCase):
+    def run_module(self, args, exception=AnsibleExitJson):
+        args = dict(
+            args,
+            bucket="releases",
+            auth={
+                "secret_key": "supersekret",
+                "access_key": "testing",
+                "url": "http://localhost:9000",
+                "region": "us-east-1",
+            },
+        )
+        set_module_args(args)
+        with self.assertRaises(exception) as r:
+            minio_presign.main()
+
+        return r.exception.args[0]
+
+    def test_module_signs_locally(self):
+        with patch("urllib3.PoolManager.urlopen") as urlopen:
+            result = self.run_module({"objects": ["a.tar.gz", "b.tar.gz"]})
+
+        urlopen.assert_not_called()
+        assert result["changed"] is False
+        assert sorted(result["urls"]) == ["a.tar.gz", "b.tar.gz"]
+        url = result["urls"]["a.tar.gz"]
+        assert url.startswith("http://localhost:9000/releases/a.tar.gz?")
+        assert "X-Amz-Expires=604800" in url
+        assert "X-Amz-Signature=" in url
+
+    @with_mock_client("minio_presign")
+    def test_module_expands_prefix(self, mock_client):
+        objects = [MagicMock(object_name=name, is_dir=False) for name in ("p/a", "p/b")]
+        mock_client.list_objects.return_value = iter(objects)
+        mock_client.get_presigned_url.side_effect = lambda method, bucket, name, **kw: (
+            "%s:%s" % (method, name)
+        )
+
+        result = self.run_module({"prefix": "p/", "method": "PUT", "expires": 60})
+
+        assert result["urls"] == {"p/a": "PUT:p/a", "p/b": "PUT:p/b"}
+        mock_client.list_objects.assert_called_once_with(
+            "releases", prefix="p/", recursive=True
+        )
+        assert mock_client.get_presigned_url.call_args[1] == {
+            "expires": timedelta(seconds=60)
+        }
+
+    def test_module_fails_on_invalid_expiry(self):
+        result = self.run_module(
+            {"objects": ["a"], "expires": 604801}, exception=AnsibleFailJson
+        )
+
+        assert "expires" in result["msg"]
+
+    def test_module_requires_objects_or_prefix(self):
+        result = self.run_module({}, exception=AnsibleFailJson)
+
+        assert "objects" in result["msg"]
+
+
+def test_signed_urls_keep_the_access_key():
+    result = run_on_controller(
+        minio_presign,
+        {
+            "bucket": "releases",
+            "objects": ["a.tar.gz"],
+            "auth": {
+                "secret_key": "supersekret",
+                "access_key": "testing",
+                "url": "http://localhost:9000",
+                "region": "us-east-1",
+            },
+        },
+    )
+
+    url = result["urls"]["a.tar.gz"]
+    assert "X-Amz-Credential=testing%2F" in url
+    assert "supersekret" not in url
+    assert "********" not in url
@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: Josh Williams <jdubz@dubzland.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import hashlib
+import json
+
+import pytest
+
+from ansible_collections.dubzland.minio.tests.unit.compat.mock import MagicMock
+
+from ansible_collections.dubzland.minio.tests.unit.plugins.modules.utils import (
+    AnsibleExitJson,
+    AnsibleFailJson,
+    ModuleTestCase,
+    set_module_args,
+    with_mock_client,
+)
+
+from ansible_collections.dubzland.minio.plugins.modules import minio_sync
+
+
+def remote_object(name, data=None, size=None, etag=None):
+    obj = MagicMock()
+    obj.object_name = name
+    obj.is_dir = False
+    obj.size = len(data) if data is not None else size
+    obj.etag = hashlib.md5(data).hexdigest() if data is not None else etag
+    obj.version_id = None
+    return obj
+
+
+def test_plan_sync_merges_sorted_listings():
+    files = {"a": (1, 0), "b": (1, 0), "c/d": (2, 0), "e": (1, 0)}
+    remote = [
+        remote_object("p/b", size=1, etag="x"),
+        remote_object("p/c/d", size=3, etag="y"),
+        remote_object("p/c/z", size=1, etag="z"),
+    ]
+
+    upload, compare, extra = minio_sync.plan_sync(files, iter(remote), "p/", True)
+
+    assert upload == ["a", "c/d", "e"]
+    assert compare == [("b", "x")]
+    assert [obj.object_name for obj in extra] == ["p/c/z"]
+
+
+def test_plan_sync_keeps_extras_without_delete():
+    upload, compare, extra = minio_sync.plan_sync(
+        {}, iter([remote_object("p/z", size=1, etag="z")]), "p/", False
+    )
+
+    assert (upload, compare, extra) == ([], [], [])
+
+
+class TestMinioSync(ModuleTestCase):
+    @pytest.fixture(autouse=True)
+    def _tmp_path(self, tmp_path):
+        self.src = tmp_path / "src"
+        self.src.mkdir()
+        (self.src / "index.html").write_bytes(b"<html/>")
+        (self.src / "css").mkdir()
+        (self.src / "css" / "site.css").write_bytes(b"body {}")
+
+    def run_module(self, args=None, exception=AnsibleExitJson):
+        args = dict(
+            args or {},
+            src=str(self.src),
+            bucket="assets",
+            prefix="static",
+            auth={
+                "secret_key": "supersekret",
+                "access_key": "testing",
+                "url": "http://localhost:9000",
+            },
+        )
+        set_module_args(args)
+        with self.assertRaises(exception) as r:
+            minio_sync.main()
+
+        return r.exception.args[0]
+
+    def manifest(self):
+        with open(str(self.src / minio_sync.MANIFEST_NAME)) as f:
+            return json.load(f)
+
+    @with_mock_client("minio_sync")
+    def test_module_uploads_new_files(self, mock_client):
+        mock_client.list_objects.return_value = []
+        mock_client.fput_object.side_effect = lambda bucket, name, path, **kw: (
+            MagicMock(etag="etag-" + name)
+        )
+
+        result = self.run_module()
+
+        assert result["changed"] is True
+        assert result["uploaded"] == ["static/css/site.css", "static/index.html"]
+        assert result["summary"]["uploaded"] == 2
+        mock_client.list_objects.assert_called_once_with(
+            "assets", prefix="static/", recursive=True
+        )
+        kwargs = mock_client.fput_object.call_args_list[1][1]
+        assert kwargs["content_type"] == "text/html"
+        files = self.manifest()["files"]
+        assert files["index.html"]["etag"] == "etag-static/index.html"
+        assert minio_sync.MANIFEST_NAME not in files
+
+    @with_mock_client("minio_sync")
+    def test_module_skips_identical_files(self, mock_client):
+        mock_client.list_objects.return_value = [
+            remote_object("static/css/site.css", b"body {}"),
+            remote_object("static/index.html", b"<html/>"),
+        ]
+
+        result = self.run_module()
+
+        assert result["changed"] is False
+        assert result["summary"]["unchanged"] == 2
+        assert result["summary"]["hashed"] == 2
+        mock_client.fput_object.assert_not_called()
+
+    @with_mock_client("minio_sync")
+    def test_module_uses_manifest_instead_of_hashing(self, mock_client):
+        mock_client.list_objects.return_value = [
+            remote_object("static/css/site.css", b"body {}"),
+            remote_object("static/index.html", b"<html/>"),
+        ]
+        self.run_module()
+
+        result = self.run_module()
+
+        assert result["summary"]["unchanged"] == 2
+        assert result["summary"]["hashed"] == 0
+
+    @with_mock_client("minio_sync")
+    def test_module_uploads_changed_files(self, mock_client):
+        mock_client.list_objects.return_value = [
+            remote_object("static/css/site.css", b"body {}"),
+            remote_object("static/index.html", b"<html!>"),
+        ]
+        mock_client.fput_object.return_value = MagicMock(etag="new")
+
+        result = self.run_module()
+
+        assert result["uploaded"] == ["static/index.html"]
+        assert result["summary"]["unchanged"] == 1
+
+    @with_mock_client("minio_sync")
+    def test_module_deletes_extras(self, mock_client):
+        mock_client.list_objects.return_value = [
+            remote_object("static/css/old.css", size=1, etag="old"),
+            remote_object("static/css/site.css", b"body {}"),
+            remote_object("static/index.html", b"<html/>"),
+        ]
+        mock_client.remove_objects.return_value = []
+
+        result = self.run_module({"delete": True})
+
+        assert result["changed"] is True
+        assert result["deleted"] == ["static/css/old.css"]
+        mock_client.remove_objects.assert_called_once()
+
+    @with_mock_client("minio_sync")
+    def test_module_check_mode(self, mock_client):
+        mock_client.list_objects.return_value = [
+            remote_object("static/css/old.css", size=1, etag="old"),
+        ]
+
+        result = self.run_module({"delete": True, "_ansible_check_mode": True})
+
+        assert result["changed"] is True
+        assert len(result["uploaded"]) == 2
+        assert result["deleted"] == ["static/css/old.css"]
+        mock_client.fput_object.assert_not_called()
+        mock_client.remove_objects.assert_not_called()
+        assert not (self.src / minio_sync.MANIFEST_NAME).exists()
+
+    @with_mock_client("minio_sync")
+    def test_module_excludes_files(self, mock_client):
+        mock_client.list_objects.return_value = []
+        mock_client.fput_object.return_value = MagicMock(etag="new")
+
+        result = self.run_module({"exclude": ["*.css"]})
+
+        assert result["uploaded"] == ["static/index.html"]
+
+    @with_mock_client("minio_sync")
+    def test_module_fails_on_upload_error(self, mock_client):
+        mock_client.list_objects.return_value = []
+        mock_client.fput_object.side_effect = Exception("access denied")
+
+        result = self.run_module(exception=AnsibleFailJson)
+
+        assert result["summary"]["failed"] == 2
+        assert "access denied" in result["msg"]
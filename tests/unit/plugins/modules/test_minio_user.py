@@ -14,8 +14,10 @@ from datetime import datetime, timezone
 
 from ansible_collections.dubzland.minio.tests.unit.plugins.modules.utils import (
     MinioAdminClientTestCase,
+    admin_not_found,
 )
 
+from ansible_collections.dubzland.minio.plugins.modules import minio_user
 from ansible_collections.dubzland.minio.plugins.modules.minio_user import MinioUser
 
 
@@ -33,13 +35,35 @@ class TestMinioUser(MinioAdminClientTestCase):
             "updatedAt": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
         }
 
-        self.mock_client.user_list.return_value = json.dumps({"tester": user_obj})
+        def user_info(access_key):
+            if access_key != "tester":
+                raise admin_not_found("XMinioAdminNoSuchUser")
+            return json.dumps(user_obj)
+
+        self.mock_client.user_info.side_effect = user_info
 
         res = self.user_module.find_user("notester")
         self.assertEqual(res, None)
 
         res = self.user_module.find_user("tester")
         self.assertEqual(res, user_obj)
+        self.mock_client.user_list.assert_not_called()
+
+    def test_find_user_raises_other_errors(self):
+        self.mock_client.user_info.side_effect = Exception("connection refused")
+
+        with self.assertRaises(Exception):
+            self.user_module.find_user("tester")
+
+    def test_find_users(self):
+        user_obj = {"policyName": "test-policy", "status": "enabled"}
+        self.mock_client.user_list.return_value = json.dumps({"tester": user_obj})
+
+        res = self.user_module.find_users(["tester", "notester"])
+
+        self.assertEqual(res, {"tester": user_obj, "notester": None})
+        self.mock_client.user_list.assert_called_once()
+        self.mock_client.user_info.assert_not_called()
 
     def test_user_exists(self):
         user_obj = {
@@ -48,7 +72,10 @@ class TestMinioUser(MinioAdminClientTestCase):
             "updatedAt": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
         }
 
-        self.mock_client.user_list.return_value = json.dumps({"tester": user_obj})
+        self.mock_client.user_info.side_effect = [
+            admin_not_found("XMinioAdminNoSuchUser"),
+            json.dumps(user_obj),
+        ]
 
         res = self.user_module.user_exists("notester")
         self.assertEqual(res, False)
@@ -150,3 +177,163 @@ class TestMinioUser(MinioAdminClientTestCase):
         self.mock_client.user_remove.return_value = ""
         self.user_module.delete_user("tester")
         self.mock_client.user_remove.assert_called_once_with("tester")
+
+    def test_plan_user(self):
+        existing_user = {"policyName": "test-policy", "status": "enabled"}
+
+        self.user_module.user_object = None
+        res = self.user_module.plan_user(
+            "tester",
+            {"secret_key": "testing123", "policy": "test-policy", "state": "disabled"},
+        )
+        self.assertEqual(
+            res,
+            [
+                ("create", "testing123"),
+                ("policy_set", "test-policy"),
+                ("disable", None),
+            ],
+        )
+
+        self.user_module.user_object = existing_user
+        res = self.user_module.plan_user(
+            "tester",
+            {"secret_key": "testing123", "policy": "test-policy", "state": "present"},
+        )
+        self.assertEqual(res, [])
+
+        res = self.user_module.plan_user(
+            "tester",
+            {"secret_key": "testing123", "policy": None, "state": "present"},
+        )
+        self.assertEqual(res, [("policy_unset", "test-policy")])
+
+        self.user_module.user_object = dict(existing_user, status="disabled")
+        res = self.user_module.plan_user(
+            "tester",
+            {
+                "secret_key": "testing123",
+                "policy": "test-policy",
+                "state": "disabled",
+                "force": True,
+            },
+        )
+        self.assertEqual(res, [("update_secret", "testing123"), ("disable", None)])
+
+    def test_reconcile_users(self):
+        self.mock_client.user_list.return_value = json.dumps(
+            {
+                "unchanged": {"policyName": "test-policy", "status": "enabled"},
+                "updated": {"policyName": "test-policy", "status": "enabled"},
+                "removed": {"status": "enabled"},
+            }
+        )
+        users = [
+            {
+                "access_key": "unchanged",
+                "secret_key": "testing123",
+                "policy": "test-policy",
+                "force": False,
+                "state": None,
+            },
+            {
+                "access_key": "updated",
+                "secret_key": "testing123",
+                "policy": "new-policy",
+                "force": False,
+                "state": "disabled",
+            },
+            {
+                "access_key": "created",
+                "secret_key": "testing123",
+                "policy": None,
+                "force": False,
+                "state": None,
+            },
+            {
+                "access_key": "removed",
+                "secret_key": None,
+                "policy": None,
+                "force": False,
+                "state": "absent",
+            },
+        ]
+
+        results, summary = minio_user.reconcile_users(
+            self.mock_module, self.mock_client, users, "present", 4
+        )
+
+        self.mock_client.user_list.assert_called_once()
+        self.mock_client.user_info.assert_not_called()
+        self.mock_client.user_add.assert_called_once_with("created", "testing123")
+        self.mock_client.policy_set.assert_called_once_with(
+            "new-policy", user="updated"
+        )
+        self.mock_client.user_disable.assert_called_once_with("updated")
+        self.mock_client.user_remove.assert_called_once_with("removed")
+        self.assertEqual(
+            [result["actions"] for result in results],
+            [[], ["policy_set", "disable"], ["create"], ["remove"]],
+        )
+        self.assertEqual(
+            summary,
+            {"created": 1, "updated": 1, "removed": 1, "unchanged": 1, "failed": 0},
+        )
+
+    def test_create_or_update_user_admin_call_count(self):
+        existing_user = {"policyName": "test-policy", "status": "enabled"}
+        scenarios = [
+            # (current user, options, expected admin calls)
+            (None, {"secret_key": "testing123", "state": "present"}, 1),
+            (
+                None,
+                {
+                    "secret_key": "testing123",
+                    "policy": "test-policy",
+                    "state": "disabled",
+                },
+                3,
+            ),
+            (
+                existing_user,
+                {
+                    "secret_key": "testing123",
+                    "policy": "test-policy",
+                    "state": "present",
+                },
+                0,
+            ),
+            (
+                existing_user,
+                {
+                    "secret_key": "testing123",
+                    "policy": "new-test-policy",
+                    "state": "disabled",
+                },
+                2,
+            ),
+            (
+                existing_user,
+                {"secret_key": "testing123", "policy": None, "state": "present"},
+                1,
+            ),
+            (
+                dict(existing_user, status="disabled"),
+                {
+                    "secret_key": "testing123",
+                    "policy": "test-policy",
+                    "state": "enabled",
+                    "force": True,
+                },
+                1,
+            ),
+        ]
+
+        for current, options, expected in scenarios:
+            self.mock_client.reset_mock()
+            self.user_module.user_object = current
+            self.user_module.create_or_update_user("tester", options)
+
+            self.mock_client.user_info.assert_not_called()
+            self.mock_client.user_list.assert_not_called()
+            self.assertEqual(len(self.mock_client.method_calls), expected, options)
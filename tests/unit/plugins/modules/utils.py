@@ -17,6 +17,8 @@ from ansible.module_utils.common.text.converters import to_bytes
 from contextlib import contextmanager
 from functools import wraps
 
+from minio.error import MinioAdminException
+
 
 class AnsibleExitJson(Exception):
     """Exception class to be raised by module.exit_json and caught by the test case"""
@@ -65,6 +67,14 @@ def mock_run_command(module, stdout, stderr, rc):
         yield run_command
 
 
+def admin_not_found(code):
+    """Build the error raised by the admin API for a missing entity"""
+    return MinioAdminException(
+        "404",
+        json.dumps({"Code": code, "Message": "The specified entity does not exist."}),
+    )
+
+
 def with_mock_client(module_name):
     def decorator(func):
         @wraps(func)
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: Josh Williams <jdubz@dubzland.com>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import pytest
+
+from ansible_collections.dubzland.minio.tests.unit.compat.mock import MagicMock
+
+from ansible_collections.dubzland.minio.plugins.modules import minio_bucket
+from ansible_collections.dubzland.minio.plugins.plugin_utils import minio as controller
+
+
+@pytest.fixture()
+def auth():
+    return {
+        "access_key": "minioadmin",
+        "secret_key": "minioadmin",
+        "url": "http://minio-server:9000",
+    }
+
+
+def make_module(auth):
+    module = MagicMock()
+    module.params = {
+        "auth": dict(
+            auth,
+            region=None,
+            validate_certs=True,
+            ca_cert=None,
+            connect_timeout=10,
+            read_timeout=300,
+            max_pool_size=10,
+            keepalive=True,
+            timings=False,
+            retries=5,
+            retry_backoff=0.2,
+            retry_max_backoff=20,
+            circuit_breaker_threshold=10,
+            circuit_breaker_cooldown=10,
+        )
+    }
+    return module
+
+
+def test_cache_reuses_clients(auth):
+    cache = controller.MinioClientCache()
+    factory = MagicMock(side_effect=lambda pool: MagicMock(pool=pool))
+
+    s3 = cache.client("s3", make_module(auth), factory)
+    again = cache.client("s3", make_module(auth), factory)
+    admin = cache.client("admin", make_module(auth), factory)
+
+    assert s3 is again
+    assert admin is not s3
+    assert admin.pool is s3.pool
+    assert factory.call_count == 2
+
+
+def test_cache_rebuilds_when_options_change(auth):
+    cache = controller.MinioClientCache()
+    factory = MagicMock(side_effect=lambda pool: MagicMock(pool=pool))
+
+    first = cache.client("s3", make_module(auth), factory)
+    auth["secret_key"] = "rotated"
+    second = cache.client("s3", make_module(auth), factory)
+
+    assert first is not second
+
+
+def test_cache_evicts_idle_clients(auth, mocker):
+    cache = controller.MinioClientCache(idle_timeout=60)
+    factory = MagicMock(side_effect=lambda pool: MagicMock(pool=pool))
+    monotonic = mocker.patch.object(controller.time, "monotonic", return_value=0)
+
+    first = cache.client("s3", make_module(auth), factory)
+    monotonic.return_value = 30
+    assert cache.client("s3", make_module(auth), factory) is first
+    monotonic.return_value = 120
+    assert cache.client("s3", make_module(auth), factory) is not first
+
+
+def test_run_on_controller_uses_cache(auth, mocker):
+    client = MagicMock()
+    client.bucket_exists.return_value = False
+    cache = mocker.patch.object(controller.ControllerModule, "client_cache")
+    cache.client.return_value = client
+
+    result = controller.run_on_controller(
+        minio_bucket, {"name": "testing", "auth": auth}
+    )
+
+    assert result["changed"] is True
+    client.make_bucket.assert_called_once_with("testing")
+    assert cache.client.call_args[0][0] == "s3"
+
+
+def test_run_on_controller_check_mode(auth, mocker):
+    client = MagicMock()
+    client.bucket_exists.return_value = False
+    cache = mocker.patch.object(controller.ControllerModule, "client_cache")
+    cache.client.return_value = client
+
+    result = controller.run_on_controller(
+        minio_bucket, {"name": "testing", "auth": auth}, check_mode=True
+    )
+
+    assert result["changed"] is True
+    client.make_bucket.assert_not_called()
+
+
+def test_run_on_controller_validates_args(auth):
+    result = controller.run_on_controller(minio_bucket, {"auth": auth})
+
+    assert result["failed"] is True
+    assert "name" in result["msg"]
+
+
+def test_run_on_controller_masks_no_log_values(auth, mocker):
+    client = MagicMock()
+    client.bucket_exists.return_value = True
+    client.remove_bucket.side_effect = Exception("denied for minioadmin")
+    cache = mocker.patch.object(controller.ControllerModule, "client_cache")
+    cache.client.return_value = client
+
+    result = controller.run_on_controller(
+        minio_bucket, {"name": "testing", "state": "absent", "auth": auth}
+    )
+
+    assert result["failed"] is True
+    assert "minioadmin" not in result["msg"]
+
+
+def test_run_on_controller_masks_suboption_no_log_values():
+    spec = {
+        "auth": {
+            "type": "dict",
+            "options": {
+                "access_key": {"type": "str", "no_log": True},
+                "url": {"type": "str"},
+            },
+        },
+        "token": {"type": "str", "no_log": True},
+        "name": {"type": "str"},
+    }
+    params = {
+        "auth": {"access_key": "minioadmin", "url": "http://minio-server:9000"},
+        "token": "t0ken",
+        "name": "testing",
+    }
+
+    assert controller.no_log_values(spec, params) == {"minioadmin", "t0ken"}
+
+
+def action(transport="local"):
+    plugin = controller.MinioActionBase.__new__(controller.MinioActionBase)
+    plugin._connection = MagicMock(transport=transport)
+    return plugin
+
+
+@pytest.mark.parametrize(
+    "task_vars, transport, expected",
+    [
+        ({}, "local", False),
+        ({"minio_controller_execution": True}, "local", True),
+        ({"minio_controller_execution": "yes"}, "ansible.builtin.local", True),
+        ({"minio_controller_execution": True}, "ssh", False),
+    ],
+)
+def test_controller_execution_is_opt_in(task_vars, transport, expected):
+    assert action(transport)._run_on_controller(task_vars) is expected
+
+
+def test_controller_execution_needs_minio(mocker):
+    mocker.patch.object(controller, "python_minio_installed", False)
+
+    assert not action()._run_on_controller({"minio_controller_execution": True})